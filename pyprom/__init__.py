@@ -19,5 +19,7 @@ __title__ = '{0} version {1}'.format(__name__, __version__)
 
 # Common imports intended to make user imports a bit easier.
 from .lib.datamaps.datamap import DataMap
+from .lib.datamaps.windowed_datamap import WindowedDataMap
 from .lib.kmlwriter import KMLFileWriter
 from .lib.loaders.gdal_loader import GDALLoader
+from .lib.loaders.mosaic_loader import MosaicLoader
@@ -13,6 +13,7 @@ import time
 import logging
 import gzip
 import cbor
+from pathlib import Path
 
 
 from .feature_discovery import AnalyzeData
@@ -26,6 +27,9 @@ from .lib.containers.linker import Linker
 from .lib.containers.summit_domain import SummitDomain
 from .lib.logic.basin_saddle_finder import BasinSaddleFinder
 from .lib.logic.summit_domain_walk import Walk
+from .lib.logic.plateaus import PlateauLabels
+from .lib.discovery_cache import (DiscoveryCache, discovery_cache_key,
+                                  DISCOVERY, WALK)
 from .lib.constants import DOMAIN_EXTENSION
 from . import version_info
 
@@ -80,6 +84,8 @@ class DomainMap:
         self.runoffs = runoffs
         self.linkers = linkers
         self.summit_domains = summit_domains
+        # Plateaus labeled up front, see run()
+        self.plateaus = None
         self.extent = 'LL: {}\n LR: {}\n UL: {}\n UR: {}\n'.format(
             self.datamap.lower_left,
             self.datamap.lower_right,
@@ -91,7 +97,11 @@ class DomainMap:
     def run(self, 
             sparse: bool = False, 
             superSparse: bool = False, 
-            rebuildSaddles: bool = False
+            rebuildSaddles: bool = False,
+            plateaus: bool = False,
+            workers: int | None = 1,
+            cache: DiscoveryCache | str | Path | None = None,
+            basins: bool = False
         ) -> None:
         """
         Performs discovery of :class:`pyprom.lib.locations.saddle.Saddle`,
@@ -103,15 +113,45 @@ class DomainMap:
         :param bool sparse: just do feature discovery, and walk()
         :param bool superSparse: just do feature discovery
         :param bool rebuildSaddles: command AnalyzeData to rebuild saddles
+        :param bool plateaus: label every plateau up front with
+         :class:`pyprom.lib.logic.plateaus.PlateauLabels`, and share those
+         between discovery and the walk rather than flood filling each
+         plateau every time it's encountered.
+        :param int workers: processes to discover features, and walk, with.
+         None for one per core. See
+         :meth:`pyprom.feature_discovery.AnalyzeData.analyze` and :meth:`walk`
+        :param cache: cache of discovery (and walk) results, or a
+         directory to keep one in. Stages already in the cache for this
+         datamap and these options are loaded rather than run.
+        :type cache: :class:`pyprom.lib.discovery_cache.DiscoveryCache`
+        :param bool basins: walk by assigning every point to its
+         SummitDomain up front, see :meth:`walk`
         """
         # Expunge any existing saddles, runoffs, summits, and linkers
         self.saddles = SaddlesContainer([])
         self.summits = SummitsContainer([])
         self.runoffs = RunoffsContainer([])
         self.linkers = list()
+        self.summit_domains = list()
+        self.plateaus = None
+        if cache is not None and not isinstance(cache, DiscoveryCache):
+            cache = DiscoveryCache(cache)
+        walkCached = cache is not None and cache.walks and not superSparse
+        walked = walkCached and self._load_stage(cache, WALK, rebuildSaddles,
+                                                 plateaus=plateaus,
+                                                 basins=basins)
         # Find Features
-        self.summits, self.saddles, self.runoffs =\
-            AnalyzeData(self.datamap).run(rebuildSaddles)
+        if not walked and not (cache is not None and
+                               self._load_stage(cache, DISCOVERY,
+                                                rebuildSaddles,
+                                                plateaus=plateaus)):
+            self._label_plateaus(plateaus)
+            self.summits, self.saddles, self.runoffs =\
+                AnalyzeData(self.datamap, plateaus=self.plateaus).run(
+                    rebuildSaddles, workers=workers)
+            if cache is not None:
+                self._store_stage(cache, DISCOVERY, rebuildSaddles,
+                                  plateaus=plateaus)
         self.logger.info("DomainMap contains {} Summits,"
                          " {} Saddles, {} Runoffs".format(
             len(self.summits),
@@ -122,7 +162,12 @@ class DomainMap:
             return
 
         # Perform Walk
-        self.walk()
+        if not walked:
+            self._label_plateaus(plateaus)
+            self.walk(basins=basins, workers=workers)
+            if walkCached:
+                self._store_stage(cache, WALK, rebuildSaddles,
+                                  plateaus=plateaus, basins=basins)
 
         # If we're in sparse mode, don't bother with the Basin Saddles.
         if sparse:
@@ -130,6 +175,54 @@ class DomainMap:
 
         self.detect_basin_saddles()
 
+    def _label_plateaus(self, plateaus: bool) -> None:
+        """
+        Label every plateau, if asked to and not done already. Only done
+        for stages which run, cached stages don't need them.
+
+        :param bool plateaus: label plateaus?
+        """
+        if plateaus and self.plateaus is None:
+            self.plateaus = PlateauLabels(self.datamap)
+
+    def _load_stage(self,
+            cache: DiscoveryCache,
+            stage: str,
+            rebuildSaddles: bool,
+            **options: bool
+        ) -> bool:
+        """
+        Load the features (and linkers and summit domains) of a cached
+        stage into this DomainMap.
+
+        :return: True if the stage was in the cache.
+        """
+        key = discovery_cache_key(self.datamap.md5, stage,
+                                  rebuildSaddles=rebuildSaddles, **options)
+        domainDict = cache.load(stage, key)
+        if domainDict is None:
+            return False
+        cached = self.from_dict(domainDict, self.datamap)
+        self.summits = cached.summits
+        self.saddles = cached.saddles
+        self.runoffs = cached.runoffs
+        self.linkers = cached.linkers
+        self.summit_domains = cached.summit_domains
+        return True
+
+    def _store_stage(self,
+            cache: DiscoveryCache,
+            stage: str,
+            rebuildSaddles: bool,
+            **options: bool
+        ) -> None:
+        """
+        Store this DomainMap as it is after stage in the cache.
+        """
+        key = discovery_cache_key(self.datamap.md5, stage,
+                                  rebuildSaddles=rebuildSaddles, **options)
+        cache.store(stage, key, self.to_dict())
+
     @classmethod
     def read(cls, 
             filename: str, 
@@ -318,21 +411,31 @@ class DomainMap:
         self.logger.info("Kept {} Saddles".format(len(toKeepSaddles)))
 
     def walk(self, 
-            saddles: List[Saddle] | List = []
+            saddles: List[Saddle] | List = [],
+            basins: bool = False,
+            workers: int | None = 1
         ):
         """
         Perform Walk from Saddles contained in this DomainMap
 
         If saddles are passed in, dont modify the DomainMap.
         Instead, return Saddles returned from the walk.
+
+        :param bool basins: assign every point to its SummitDomain up
+         front, see :meth:`pyprom.lib.logic.summit_domain_walk.Walk.assign_basins`,
+         rather than climbing from each Saddle. SummitDomains are then
+         complete, not just the paths climbed from Saddles.
+        :param int workers: processes to walk with. None for one per core.
+         Results are the same regardless, see
+         :meth:`pyprom.lib.logic.summit_domain_walk.Walk.climb_from_saddles`
         """
-        walk = Walk(self)
+        walk = Walk(self, basins=basins)
         if not saddles:
             self.saddles, self.runoffs, self.linkers, self.summit_domains =\
-                walk.climb_from_saddles()
+                walk.climb_from_saddles(workers=workers)
         else:
             outsaddles, outrunoffs, self.linkers, self.summit_domains =\
-                walk.climb_from_saddles(saddles)
+                walk.climb_from_saddles(saddles, workers=workers)
             return outsaddles, outrunoffs
 
     def __repr__(self) -> str:
@@ -12,6 +12,7 @@ import logging
 from tqdm import tqdm
 
 from collections import defaultdict
+from itertools import chain
 from timeit import default_timer
 from datetime import timedelta
 from math import floor
@@ -23,22 +24,34 @@ from .lib.locations.base_gridpoint import BaseGridPoint
 from .lib.containers.saddles import SaddlesContainer
 from .lib.containers.summits import SummitsContainer
 from .lib.containers.runoffs import RunoffsContainer
+from .lib.containers.feature_table import FeatureTable, FeatureTableBuilder
 from .lib.containers.perimeter import Perimeter
 from .lib.logic.equalheight import equalHeightBlob
 from .lib.logic.contiguous_neighbors import contiguous_neighbors, touching_neighborhoods
+from .lib.logic.high_ring import high_neighborhood_counts, ring_summits
 from .lib.logic.shortest_path_by_points import high_perimeter_neighborhood_shortest_path
-from .lib.logic.tuple_funcs import highest
+from .lib.parallel import can_fork, fork_map, resolve_workers, shared
 
-from typing import TYPE_CHECKING, Tuple, List
+from typing import TYPE_CHECKING, Generator, Tuple, List
 if TYPE_CHECKING:
+    from numpy import NDArray
     from pyprom import DataMap
     from pyprom.lib.containers.multipoint import MultiPoint
+    from pyprom.lib.logic.plateaus import PlateauLabels
     from pyprom._typing.type_hints import (
         Numpy_X, Numpy_Y,
         XY_Elevation,
         Elevation
     )
 
+# Tiles per worker process in a parallel analysis, so workers which
+# draw flat (featureless) tiles can pick up more.
+TILES_PER_WORKER = 4
+
+# MultiPoints (lakes and such) with at least this many members are packed
+# into arrays, see MultiPoint.pack()
+PACKED_MULTIPOINT_SIZE = 4096
+
 
 class AnalyzeData:
     """
@@ -48,20 +61,34 @@ class AnalyzeData:
     :class:`pyprom.lib.locations.runoff.Runoff`
     """
 
-    def __init__(self, datamap: DataMap):
+    def __init__(self,
+            datamap: DataMap,
+            plateaus: PlateauLabels | None = None
+        ):
         """
         :param datamap: datamap to discover features on.
         :type: :class:`pyprom.lib.datamap.DataMap` object.
+        :param plateaus: plateaus labeled up front on datamap. When given,
+         MultiPoints are built from these rather than flood filled.
+        :type plateaus: :class:`pyprom.lib.logic.plateaus.PlateauLabels`
         """
         self.logger = logging.getLogger('{}'.format(__name__))
         self.datamap = datamap
+        self.plateaus = plateaus
         self.data = self.datamap.numpy_array
         self.max_y = self.datamap.max_y
         self.max_x = self.datamap.max_x
-        self.visited = numpy.zeros_like(datamap.numpy_array, dtype=bool)
+        self.visited = numpy.zeros((self.max_x + 1, self.max_y + 1), dtype=bool)
+        # First row this instance is responsible for. Tiles of a parallel
+        # analysis leave plateaus starting above this to the tile above.
+        self.first_row = 0
+        # First row iter_features hasn't yielded all features of yet.
+        self.cursor = 0
 
     def run(self,
-            rebuildSaddles: bool = True
+            rebuildSaddles: bool = True,
+            workers: int | None = 1,
+            packed: bool = False
         ) -> Tuple[SummitsContainer, SaddlesContainer, RunoffsContainer]:
         """
         Shortcut for running analysis. This will find all features on
@@ -70,22 +97,35 @@ class AnalyzeData:
         format with accurate midpoints and only 2 high edges a piece.
 
         :param bool rebuildSaddles: run saddle rebuild logic
+        :param int workers: processes to discover features and rebuild
+         saddles with, see analyze()
+        :param bool packed: pack features into FeatureTables, see analyze()
         :return: Containers with features
         :rtype: :class:`pyprom.lib.containers.saddles.SaddlesContainer`
          :class:`pyprom.lib.containers.summits.SummitsContainer`
          :class:`pyprom.lib.containers.runoffs.RunoffsContainer`
         """
-        _, _, _ = self.analyze()
+        _, _, _ = self.analyze(workers=workers, packed=packed)
         # Corners also are runoffs.
-        self.runoffObjects.extend(make_corner_runoffs(self.datamap))
+        corners = make_corner_runoffs(self.datamap)
+        if packed:
+            self.runoffObjects = RunoffsContainer(FeatureTable.from_features(
+                chain(self.runoffObjects, corners)))
+        else:
+            self.runoffObjects.extend(corners)
 
         if rebuildSaddles:
             self.logger.info("Rebuilding Saddles")
-            self.saddleObjects = self.saddleObjects.rebuildSaddles(self.datamap)
+            self.saddleObjects = self.saddleObjects.rebuildSaddles(
+                self.datamap, workers=workers)
+            if packed:
+                self.saddleObjects.pack()
         return self.summitObjects, self.saddleObjects, self.runoffObjects
 
     def analyze(
-            self
+            self,
+            workers: int | None = 1,
+            packed: bool = False
         ) -> Tuple[SummitsContainer, SaddlesContainer, RunoffsContainer]:
         """
         Analyze Routine.
@@ -93,6 +133,12 @@ class AnalyzeData:
         :class:`pyprom.lib.locations.saddle.Saddle` and
         :class:`pyprom.lib.locations.runoff.Runoff` features
 
+        :param int workers: processes to discover features with.
+         None for one per core. Platforms which can't fork use one.
+         See _scan for how the work is split.
+        :param bool packed: pack features into
+         :class:`pyprom.lib.containers.feature_table.FeatureTable` as
+         they're found, rather than keeping them as objects.
         :return: Containers
         :rtype: :class:`pyprom.lib.containers.saddles.SaddlesContainer`,
          :class:`pyprom.lib.containers.summits.SummitsContainer`,
@@ -102,35 +148,223 @@ class AnalyzeData:
         self.summitObjects: SummitsContainer = SummitsContainer([])
         self.saddleObjects: SaddlesContainer = SaddlesContainer([])
         self.runoffObjects: RunoffsContainer = RunoffsContainer([])
-        iterator = numpy.nditer(self.data, flags=['multi_index'])
-        current_x = 0
-        # Iterate through numpy grid, and keep track of GridPoint coordinates.
         progress_bar = tqdm(total=self.data.size, desc="Saddle, Summit, Runoff Identification", mininterval=2, ncols=80, ascii=True)
-        while not iterator.finished:
-            progress_bar.update(1) 
-            x, y = iterator.multi_index
-            self.elevation = float(iterator[0])
-
-            # skip if this is a nodata point.
-            if self.elevation == self.datamap.nodata:
-                iterator.iternext()
-                continue
-            # Check for summit, saddle, or runoff
-            results = self.summit_and_saddle(x, y)
-            if results:
-                for result in results:
-                    if isinstance(result, Summit):
-                        self.summitObjects.append(result)
-                    if isinstance(result, Runoff):
-                        self.runoffObjects.append(result)
-                    elif isinstance(result, Saddle):
-                        self.saddleObjects.append(result)
-            # Reset variables, and go to next gridpoint.
-            iterator.iternext()
+        if packed:
+            sinks = (FeatureTableBuilder(), FeatureTableBuilder(),
+                     FeatureTableBuilder())
+        else:
+            sinks = (self.summitObjects, self.saddleObjects, self.runoffObjects)
+        for _, results in self._scan(0, workers, progress_bar):
+            self._collect(results, *sinks)
         progress_bar.close()
+        if packed:
+            self.summitObjects = SummitsContainer(sinks[0].build())
+            self.saddleObjects = SaddlesContainer(sinks[1].build())
+            self.runoffObjects = RunoffsContainer(sinks[2].build())
+        return self.summitObjects, self.saddleObjects, self.runoffObjects
+
+    def iter_features(self,
+            start_row: Numpy_X = 0,
+            workers: int | None = 1
+        ) -> Generator[Summit | Saddle | Runoff]:
+        """
+        Generator returns :class:`pyprom.lib.locations.summit.Summit`,
+        :class:`pyprom.lib.locations.saddle.Saddle` and
+        :class:`pyprom.lib.locations.runoff.Runoff` features in scan order
+        as they're discovered, rather than collecting them all into
+        containers first. Features can be written out or handed on as
+        they arrive.
+
+        `self.cursor` is the first row whose features haven't all been
+        yielded yet. Passing it as start_row to a new AnalyzeData picks
+        up where this one left off: plateaus reaching above start_row
+        are left to whoever scanned those rows.
+
+        Map corners aren't scanned, see make_corner_runoffs.
+
+        :param int start_row: row to start scanning at.
+        :param int workers: processes to discover features with, see analyze()
+        """
+        self.cursor = start_row
+        for x_stop, results in self._scan(start_row, workers):
+            yield from results
+            self.cursor = x_stop
+
+    def _scan(self,
+            start_row: Numpy_X,
+            workers: int | None,
+            progress_bar: tqdm | None = None
+        ) -> Generator[Tuple[Numpy_X, List[Summit | Saddle | Runoff]]]:
+        """
+        Generator which scans the map from start_row down, a band of rows
+        (or with more than one worker, a tile) at a time.
+
+        With more than one worker, the map is split into tiles of full rows
+        which are analyzed in forked processes. Each plateau belongs to
+        the tile holding its first member, which is where a single process
+        would have found it, so the results, and their order, are the same.
+
+        :return: (row the band stops at, features discovered in it)
+        """
+        self.first_row = start_row
+        # Start afresh, whatever was scanned (or summits found) before.
+        self.visited = numpy.zeros((self.max_x + 1, self.max_y + 1), dtype=bool)
+        workers = resolve_workers(workers)
+        try:
+            if workers > 1 and can_fork():
+                tiles = self.tiles(workers * TILES_PER_WORKER, start_row)
+                for (_, x_stop), (results, pixels) in zip(tiles, fork_map(
+                        _analyze_tile, tiles, self, workers,
+                        initializer=self.datamap.reopen)):
+                    if progress_bar is not None:
+                        progress_bar.update(pixels)
+                    yield x_stop, _attach(results, self.datamap)
+                return
+            # Iterate through numpy grid one band of rows at a time, and keep
+            # track of GridPoint coordinates. Windowed DataMaps only ever hold
+            # a band (plus whatever the block cache allows) in memory.
+            for x_offset, band in self.datamap.iter_row_bands(x_start=start_row):
+                results = self.analyze_band(x_offset, band, progress_bar)
+                yield x_offset + band.shape[0], results
+        finally:
+            # free some memory
+            del(self.visited)
+
+    def find_summits(self) -> SummitsContainer:
+        """
+        Summits only shortcut for analyze(). Finds the same
+        :class:`pyprom.lib.locations.summit.Summit` features, in the same
+        order, without discovering saddles and runoffs along the way.
+
+        Single pixel summits are found a band at a time with
+        :func:`pyprom.lib.logic.high_ring.ring_summits`. Only plateaus with
+        no higher neighbors are handed on to the multipoint logic.
+
+        :return: Summits
+        :rtype: :class:`pyprom.lib.containers.summits.SummitsContainer`
+        """
+        self.logger.info("Initiating Summit Identification")
+        self.visited = numpy.zeros((self.max_x + 1, self.max_y + 1), dtype=bool)
+        self.first_row = 0
+        summits = SummitsContainer([])
+        elevation_scale = self.datamap.elevation_scale
+        for x_offset, band in self.datamap.iter_row_bands():
+            single, plateau = ring_summits(self.datamap, x_offset, band)
+            band_xs, ys = numpy.nonzero(single | plateau)
+            for band_x, y in zip(band_xs.tolist(), ys.tolist()):
+                x = x_offset + band_x
+                self.elevation = float(band[band_x, y]) * elevation_scale
+                if single[band_x, y]:
+                    summits.append(self.single_pixel_summit(x, y))
+                    continue
+                if self.visited[x, y] or self._plateau_is_sloped(x, y):
+                    continue
+                summits.extend([feature for feature in self.summit_and_saddle(x, y)
+                                if isinstance(feature, Summit)])
         # free some memory
         del(self.visited)
-        return self.summitObjects, self.saddleObjects, self.runoffObjects
+        self.summitObjects = summits
+        return summits
+
+    def single_pixel_summit(self, x: Numpy_X, y: Numpy_Y) -> Summit:
+        """
+        Build the :class:`pyprom.lib.locations.summit.Summit` at a pixel
+        with no equal or higher neighbors, as summit_and_saddle would.
+
+        :param int x: x coordinate in raster data.
+        :param int y: y coordinate in raster data.
+        :return: Summit at self.elevation
+        """
+        edge = bool(self.datamap.is_map_edge(x, y))
+        edgePoints = [(x, y, self.elevation)] if edge else []
+        lat, long = self.datamap.xy_to_latlon(x, y)
+        return Summit(lat,
+                      long,
+                      self.elevation,
+                      multipoint=[],
+                      edge=edge,
+                      edgePoints=edgePoints)
+
+    def _plateau_is_sloped(self, x: Numpy_X, y: Numpy_Y) -> bool:
+        """
+        :return: True if x, y is on a labeled plateau with a high perimeter,
+         which can't be a summit. Without plateau labels, this isn't
+         known until the plateau is flood filled.
+        """
+        if self.plateaus is None:
+            return False
+        label = self.plateaus.label_of(x, y)
+        indptr = self.plateaus.perimeter_indptr
+        return bool(label) and indptr[label] > indptr[label - 1]
+
+    def analyze_band(self,
+            x_offset: Numpy_X,
+            band: NDArray,
+            progress_bar: tqdm | None = None
+        ) -> List[Summit | Saddle | Runoff]:
+        """
+        Discover features in a band of rows.
+
+        :param int x_offset: x coordinate of the first row of band.
+        :param band: rows x_offset:x_offset + len(band) of numpy_array.
+        :param progress_bar: progress bar to update, if any.
+        :return: discovered features, in the order they were found.
+        """
+        found = []
+        elevation_scale = self.datamap.elevation_scale
+        # skip nodata points, and ordinary slope points, that is points
+        # with a single high perimeter neighborhood which summit_and_saddle
+        # would find nothing at. Only summits, saddles and whatever
+        # can't be told from the ring around it go on to be analyzed.
+        counts = high_neighborhood_counts(self.datamap, x_offset, band)
+        band_xs, ys = numpy.nonzero((counts != 1) &
+                                    ~self.datamap.nodata_mask(band))
+        for band_x, y in zip(band_xs.tolist(), ys.tolist()):
+            if progress_bar is not None:
+                progress_bar.update(1)
+            x = x_offset + band_x
+            self.elevation = float(band[band_x, y]) * elevation_scale
+            # Check for summit, saddle, or runoff
+            results = self.summit_and_saddle(x, y)
+            if results:
+                found.extend(results)
+        if progress_bar is not None:
+            progress_bar.update(band.size - band_xs.size)
+        return found
+
+    def tiles(self,
+            count: int,
+            start_row: Numpy_X = 0
+        ) -> List[Tuple[Numpy_X, Numpy_X]]:
+        """
+        Split the map from start_row down into (up to) count tiles
+        of full rows.
+
+        :param int count: number of tiles.
+        :param int start_row: first row of the first tile.
+        :return: list of (first row, row to stop at) tuples.
+        """
+        rows = self.max_x + 1
+        tile_rows = max(1, -(-(rows - start_row) // count))
+        return [(x_start, min(x_start + tile_rows, rows))
+                for x_start in range(start_row, rows, tile_rows)]
+
+    def _collect(self,
+            results: List[Summit | Saddle | Runoff],
+            summits: SummitsContainer | FeatureTableBuilder,
+            saddles: SaddlesContainer | FeatureTableBuilder,
+            runoffs: RunoffsContainer | FeatureTableBuilder
+        ) -> None:
+        """
+        Sort discovered features into their containers (or builders).
+        """
+        for result in results:
+            if isinstance(result, Summit):
+                summits.append(result)
+            if isinstance(result, Runoff):
+                runoffs.append(result)
+            elif isinstance(result, Saddle):
+                saddles.append(result)
 
     def analyze_multipoint(self, 
             x: Numpy_X, y: Numpy_Y, 
@@ -148,10 +382,21 @@ class AnalyzeData:
         :rtype: :class:`pyprom.lib.locations.saddle.Saddle`,
          :class:`pyprom.lib.locations.summit.Summit`, or None.
         """
-        blob, edgePoints = equalHeightBlob(self.datamap, x, y, ptElevation)
+        if self.plateaus is not None:
+            label = self.plateaus.label_of(x, y)
+            start, stop = self.plateaus.member_indptr[label - 1:label + 1]
+            blob, edgePoints = self.plateaus.blob(
+                label, ptElevation, packed=stop - start >= PACKED_MULTIPOINT_SIZE)
+        else:
+            blob, edgePoints = equalHeightBlob(self.datamap, x, y, ptElevation)
+            if len(blob) >= PACKED_MULTIPOINT_SIZE:
+                blob.pack()
         edge = blob.perimeter.mapEdge
-        for exemptPoint in blob:
-            self.visited[exemptPoint[0]][exemptPoint[1]] = True
+        xs, ys = blob.xys()
+        self.visited[xs, ys] = True
+        # Plateaus reaching up into the tile above belong to that tile.
+        if self.first_row and xs.min() < self.first_row:
+            return []
         return self.consolidatedFeatureLogic(x, y, blob.perimeter,
                                              blob, edge, edgePoints)
 
@@ -316,15 +561,19 @@ class AnalyzeData:
             # No need to further process.
             return returnable_features
 
-        # All points which are technically perimeter points,
-        # which are on the edge of our map regardless of elevation
-        map_edge_perimeter_neighborhoods = contiguous_neighbors(perimeter.mapEdgePoints)
-
         # Find all neighborhoods comprising of only points lower than self.elevation
         lower_perimeter_map_edge_neighborhoods = []
-        for neighborhood in map_edge_perimeter_neighborhoods:
-            if highest(neighborhood)[0][2] < self.elevation:
-                lower_perimeter_map_edge_neighborhoods.append(neighborhood)
+        # Two lower neighborhoods need at least two lower points, so don't
+        # bother finding neighborhoods on the map edge band without them.
+        lower_points = sum(1 for pt in perimeter.mapEdgePoints
+                           if pt[2] < self.elevation)
+        if lower_points > 1:
+            # All points which are technically perimeter points,
+            # which are on the edge of our map regardless of elevation
+            map_edge_perimeter_neighborhoods = contiguous_neighbors(perimeter.mapEdgePoints)
+            for neighborhood in map_edge_perimeter_neighborhoods:
+                if max(pt[2] for pt in neighborhood) < self.elevation:
+                    lower_perimeter_map_edge_neighborhoods.append(neighborhood)
 
         # did we find one or fewer perimeter neighborhood lower than our elevation?
         if len(lower_perimeter_map_edge_neighborhoods) <= 1:
@@ -353,8 +602,8 @@ class AnalyzeData:
         if len(lower_perimeter_map_edge_neighborhoods) > 1 and highPerimeter:
             # okay, damn, lets analyze further!
 
-            # Keep track of edgepoints not converted into runoffs.
-            remaining_edgepoints = edgePoints.copy()
+            # Keep track of edgepoints converted into runoffs.
+            runoff_edgepoints = set()
 
             # Find all neighborhoods of edgepoints
             edge_point_neighborhoods = contiguous_neighbors(edgePoints)
@@ -399,8 +648,7 @@ class AnalyzeData:
                     returnable_features.append(runoff)
 
                     runoff_edge_neighborhoods.append(edge_point_neighborhoods[idx])
-                    for pt in edge_point_neighborhoods[idx]:
-                        remaining_edgepoints.remove(pt) #todo optimize
+                    runoff_edgepoints.update(edge_point_neighborhoods[idx])
 
             # If we meet the definition of a regular Saddle do the following:
             # - If all high edges were converted into runoffs,
@@ -424,6 +672,8 @@ class AnalyzeData:
                                     edgePoints = [])
                     returnable_features.append(saddle)
                 else:
+                    remaining_edgepoints = [pt for pt in edgePoints
+                                            if pt not in runoff_edgepoints]
                     saddle = Saddle(lat, long,
                                     self.elevation,
                                     multipoint = multipoint,
@@ -458,3 +708,41 @@ def make_corner_runoffs(
     rur.edgePoints.append((0, datamap.max_y, datamap.get(0, datamap.max_y)))
 
     return [rll, rlr, rul, rur]
+
+
+def _analyze_tile(
+        tile: Tuple[Numpy_X, Numpy_X]
+    ) -> Tuple[List[Summit | Saddle | Runoff], int]:
+    """
+    Discover features in a tile of full rows, in a forked worker.
+    The worker's copy of the parent's AnalyzeData does the work.
+
+    :param tile: (first row, row to stop at)
+    :return: (discovered features, pixels analyzed)
+    """
+    analyze = shared()
+    x_start, x_stop = tile
+    analyze.first_row = x_start
+    results = []
+    for x_offset, band in analyze.datamap.iter_row_bands(x_start=x_start, x_stop=x_stop):
+        results.extend(analyze.analyze_band(x_offset, band))
+    # The datamap stays behind, the parent reattaches its own.
+    for result in results:
+        if result.multipoint:
+            result.multipoint.datamap = None
+            result.multipoint.perimeter.datamap = None
+    return results, (x_stop - x_start) * (analyze.max_y + 1)
+
+
+def _attach(
+        results: List[Summit | Saddle | Runoff],
+        datamap: DataMap
+    ) -> List[Summit | Saddle | Runoff]:
+    """
+    Reattach datamap to features discovered by _analyze_tile.
+    """
+    for result in results:
+        if result.multipoint:
+            result.multipoint.datamap = datamap
+            result.multipoint.perimeter.datamap = datamap
+    return results
@@ -7,11 +7,17 @@ the LICENSE file that accompanies it.
 Base object for containers which are have member points of (x,y) tuples
 which are self iterable.
 """
+from __future__ import annotations
 
 from collections import defaultdict
-from typing import TYPE_CHECKING, List
+
+import numpy
+
+from typing import TYPE_CHECKING, List, Sequence, Tuple
 if TYPE_CHECKING:
+    from numpy import NDArray
     from pyprom._typing.type_hints import (
+        XY,
         XY_Elevation, 
         XY_Elevation_Generator,
         XY_Elevation_Fast_Dict
@@ -32,6 +38,118 @@ DIAGONAL_SHIFT_LIST = (
 )
 FULL_SHIFT_ORTHOGONAL_DIAGONAL_LIST = ORTHOGONAL_SHIFT_LIST + DIAGONAL_SHIFT_LIST
 
+
+def _shift_arrays(shifts: Sequence[XY]) -> Tuple[NDArray, NDArray]:
+    """
+    :return: (x shifts, y shifts) as arrays.
+    """
+    return (numpy.array([shift[0] for shift in shifts], dtype=numpy.int64),
+            numpy.array([shift[1] for shift in shifts], dtype=numpy.int64))
+
+
+FULL_SHIFTS = _shift_arrays(FULL_SHIFT_LIST)
+ORTHOGONAL_SHIFTS = _shift_arrays(ORTHOGONAL_SHIFT_LIST)
+
+
+class PackedPoints:
+    """
+    PackedPoints keeps (x, y) or (x, y, elevation) points as int32
+    coordinate arrays (and a float64 elevation array) rather than as
+    tuples, for containers with millions of members, such as the
+    :class:`pyprom.lib.containers.multipoint.MultiPoint` and
+    :class:`pyprom.lib.containers.perimeter.Perimeter` of a lake.
+
+    Points keep the order they were packed in. Membership is looked up
+    by binary search over the sorted (x, y) keys, built on first use.
+    """
+
+    __slots__ = ['xs', 'ys', 'elevations', '_keys', '_order']
+
+    def __init__(self,
+            xs: NDArray,
+            ys: NDArray,
+            elevations: NDArray | None = None
+        ):
+        """
+        :param xs: x coordinates.
+        :param ys: y coordinates.
+        :param elevations: elevations, or None for (x, y) points.
+        """
+        self.xs = numpy.asarray(xs, dtype=numpy.int32)
+        self.ys = numpy.asarray(ys, dtype=numpy.int32)
+        self.elevations = None if elevations is None else \
+            numpy.asarray(elevations, dtype=numpy.float64)
+        self._keys = None
+        self._order = None
+
+    @classmethod
+    def from_tuples(cls,
+            points: Sequence[XY | XY_Elevation],
+            elevations: bool | None = None
+        ) -> PackedPoints:
+        """
+        :param points: list of (x, y) or (x, y, elevation) tuples.
+        :param bool elevations: do points have elevations? Defaults to
+         whatever the first point has.
+        :return: new PackedPoints
+        """
+        if elevations is None:
+            elevations = bool(points) and len(points[0]) == 3
+        xs = [point[0] for point in points]
+        ys = [point[1] for point in points]
+        return cls(xs, ys,
+                   [point[2] for point in points] if elevations else None)
+
+    def tuples(self) -> List[XY | XY_Elevation]:
+        """
+        :return: points as a list of tuples.
+        """
+        if self.elevations is None:
+            return list(zip(self.xs.tolist(), self.ys.tolist()))
+        return list(zip(self.xs.tolist(), self.ys.tolist(),
+                        self.elevations.tolist()))
+
+    def point(self, idx: int) -> XY | XY_Elevation:
+        """
+        :param int idx: index of point.
+        :return: point as a tuple.
+        """
+        if self.elevations is None:
+            return (int(self.xs[idx]), int(self.ys[idx]))
+        return (int(self.xs[idx]), int(self.ys[idx]),
+                float(self.elevations[idx]))
+
+    def find(self, xs: NDArray, ys: NDArray) -> NDArray:
+        """
+        :param xs: x coordinates to look for.
+        :param ys: y coordinates to look for.
+        :return: index of each x, y in these points, or -1.
+        """
+        if self._keys is None:
+            keys = _keys(self.xs, self.ys)
+            self._order = numpy.argsort(keys, kind='stable')
+            self._keys = keys[self._order]
+        wanted = _keys(numpy.asarray(xs), numpy.asarray(ys))
+        if not self._keys.size:
+            return numpy.full(wanted.shape, -1, dtype=numpy.int64)
+        found = numpy.minimum(numpy.searchsorted(self._keys, wanted),
+                              self._keys.size - 1)
+        return numpy.where(self._keys[found] == wanted, self._order[found], -1)
+
+    def __len__(self) -> int:
+        """
+        :return: number of points.
+        """
+        return self.xs.size
+
+
+def _keys(xs: NDArray, ys: NDArray) -> NDArray:
+    """
+    :return: int64 keys which sort like (x, y) tuples.
+    """
+    return xs.astype(numpy.int64) * (1 << 32) + ys.astype(numpy.int64)
+
+
 class BaseSelfIterable:
     """
     :param pointList: tuple(x, y, elevation) which make up the BaseSelfIterable.
@@ -40,19 +158,27 @@ class BaseSelfIterable:
     :param pointIndex: Members as a dict().
     :type pointIndex:
     dict({X: { Y: tuple(x, y, elevation)}}
-    """
+    :param packedPoints: Members packed into arrays, instead of the above.
+    :type packedPoints: :class:`PackedPoints`
 
-    __slots__ = ['points', 'pointIndex']
+    Packed members are turned into tuples (or a pointIndex) only when
+    `points` (or `pointIndex`) is asked for. Iterating members and their
+    neighbors works on the arrays.
+    """
 
-    points: List[XY_Elevation]
-    pointIndex: XY_Elevation_Fast_Dict
+    __slots__ = ['_points', '_pointIndex', 'packed']
 
     def __init__(self,
             pointList:List[XY_Elevation] | None = None,
-            pointIndex: XY_Elevation_Fast_Dict | None = None
+            pointIndex: XY_Elevation_Fast_Dict | None = None,
+            packedPoints: PackedPoints | None = None
         ):
 
-        self.points = []
+        self.packed = packedPoints
+        self._points = []
+        self._pointIndex = None
+        if packedPoints is not None:
+            return
         if pointList and pointIndex:
             self.points = pointList
             self.pointIndex = pointIndex
@@ -67,6 +193,68 @@ class BaseSelfIterable:
             for point in self.points:
                 self.pointIndex[point[0]][point[1]] = point
 
+    @property
+    def points(self) -> List[XY_Elevation]:
+        """
+        :return: members as a list of tuple(x, y, elevation)
+        """
+        if self.packed is not None:
+            return self.packed.tuples()
+        return self._points
+
+    @points.setter
+    def points(self, points: List[XY_Elevation]) -> None:
+        self.packed = None
+        self._points = points
+
+    @property
+    def pointIndex(self) -> XY_Elevation_Fast_Dict:
+        """
+        :return: members as dict({X: { Y: tuple(x, y, elevation)}}
+        """
+        if self.packed is not None:
+            pointIndex = defaultdict(dict)
+            for point in self.packed.tuples():
+                pointIndex[point[0]][point[1]] = point
+            return pointIndex
+        return self._pointIndex
+
+    @pointIndex.setter
+    def pointIndex(self, pointIndex: XY_Elevation_Fast_Dict) -> None:
+        self._pointIndex = pointIndex
+
+    def pack(self) -> None:
+        """
+        Pack members into arrays, see :class:`PackedPoints`
+        """
+        if self.packed is None:
+            self.packed = PackedPoints.from_tuples(self._points, elevations=True)
+            self._points = []
+            self._pointIndex = None
+
+    def unpack(self) -> None:
+        """
+        Turn packed members back into tuples, which can be modified.
+        """
+        if self.packed is not None:
+            points = self.packed.tuples()
+            self.packed = None
+            self.points = points
+            self.pointIndex = defaultdict(dict)
+            for point in points:
+                self.pointIndex[point[0]][point[1]] = point
+
+    def _iterPackedNeighbors(self,
+            point: XY_Elevation,
+            shifts: Tuple[NDArray, NDArray]
+        ) -> XY_Elevation_Generator:
+        """
+        Iterate through packed members neighboring point by shifts.
+        """
+        found = self.packed.find(point[0] + shifts[0], point[1] + shifts[1])
+        for idx in found[found >= 0].tolist():
+            yield self.packed.point(idx)
+
     def iterNeighborFull(self, point: XY_Elevation) -> XY_Elevation_Generator:
         """
         Iterate through diagonally and orthogonally neighboring
@@ -78,6 +266,9 @@ class BaseSelfIterable:
 
         :return: tuple(x, y, ele)
         """
+        if self.packed is not None:
+            yield from self._iterPackedNeighbors(point, FULL_SHIFTS)
+            return
         for shift in FULL_SHIFT_LIST:
             x = point[0] + shift[0]
             y = point[1] + shift[1]
@@ -97,6 +288,9 @@ class BaseSelfIterable:
 
         :return: tuple(x, y, ele)
         """
+        if self.packed is not None:
+            yield from self._iterPackedNeighbors(point, ORTHOGONAL_SHIFTS)
+            return
         for shift in ORTHOGONAL_SHIFT_LIST:
             x = point[0] + shift[0]
             y = point[1] + shift[1]
@@ -116,6 +310,9 @@ class BaseSelfIterable:
 
         :return: tuple(x, y, ele)
         """
+        if self.packed is not None:
+            yield from self._iterPackedNeighbors(point, ORTHOGONAL_SHIFTS)
+            return
         for shift in ORTHOGONAL_SHIFT_LIST:
             x = point[0] + shift[0]
             y = point[1] + shift[1]
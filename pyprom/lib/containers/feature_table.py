@@ -0,0 +1,509 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This library contains a struct of arrays table for storing Summit, Saddle
+and Runoff type location objects compactly.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+import numpy
+
+from ..locations.summit import Summit
+from ..locations.saddle import Saddle
+from ..locations.runoff import Runoff
+
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, Set, Tuple
+if TYPE_CHECKING:
+    from numpy import NDArray
+    from pyprom.lib.containers.multipoint import MultiPoint
+    from pyprom._typing.type_hints import XY_Elevation
+
+# Feature types a FeatureTable can hold, indexed by the `kind` field.
+KINDS = (Summit, Saddle, Runoff)
+
+# One record per feature.
+FEATURE_DTYPE = numpy.dtype([
+    ('kind', numpy.int8),
+    ('latitude', numpy.float64),
+    ('longitude', numpy.float64),
+    ('elevation', numpy.float64),
+    ('edge', numpy.bool_),
+    # -1 for a Saddle which was never disqualified (None).
+    ('disqualified', numpy.int8),
+    ('singleSummit', numpy.bool_),
+    ('basinSaddle', numpy.bool_),
+])
+
+# edgePoints and highPerimeterNeighborhoods points.
+POINT_DTYPE = numpy.dtype([
+    ('x', numpy.int32),
+    ('y', numpy.int32),
+    ('elevation', numpy.float64),
+])
+
+# Features a FeatureTableBuilder holds as lists before packing them.
+CHUNK_ROWS = 65536
+
+
+class FeatureTable:
+    """
+    FeatureTable stores :class:`pyprom.lib.locations.summit.Summit`,
+    :class:`pyprom.lib.locations.saddle.Saddle` and
+    :class:`pyprom.lib.locations.runoff.Runoff` objects as arrays rather
+    than as Python objects, for maps with too many features to keep as
+    objects.
+
+    Scalar attributes are kept in `records`, a structured array of
+    :data:`FEATURE_DTYPE`. Ids are kept as bytes. edgePoints and
+    highPerimeterNeighborhoods are kept in CSR form: the edgePoints of
+    feature `i` are `edge_points[edge_indptr[i]:edge_indptr[i + 1]]`, its
+    highPerimeterNeighborhoods are neighborhoods
+    `neighborhood_indptr[i]:neighborhood_indptr[i + 1]`, and the points
+    of neighborhood `n` are
+    `neighborhood_points[point_indptr[n]:point_indptr[n + 1]]`.
+    MultiPoints are few and are kept as they are, by row.
+
+    Indexing or iterating a FeatureTable builds new feature objects.
+    They are copies: modifying them doesn't modify the table. Features
+    linked to other features (by :class:`pyprom.lib.containers.linker.Linker`
+    or as basin saddle alternatives) can't be packed. Saddle parents
+    are kept by id, and parent and children are built one level deep,
+    from the table this one was taken from if it was.
+    """
+
+    __slots__ = ['records', 'ids', 'parent_ids', 'edge_indptr',
+                 'edge_points', 'neighborhood_indptr', 'point_indptr',
+                 'neighborhood_points', 'multipoints', 'links',
+                 '_id_order', '_child_order']
+
+    def __init__(self,
+            records: NDArray,
+            ids: NDArray,
+            parent_ids: NDArray,
+            edge_indptr: NDArray,
+            edge_points: NDArray,
+            neighborhood_indptr: NDArray,
+            point_indptr: NDArray,
+            neighborhood_points: NDArray,
+            multipoints: Dict[int, MultiPoint] | None = None,
+            links: FeatureTable | None = None
+        ):
+        """
+        Use :func:`from_features` or :class:`FeatureTableBuilder` rather
+        than building these arrays by hand.
+
+        :param records: structured array of :data:`FEATURE_DTYPE`
+        :param ids: bytes ids, by row.
+        :param parent_ids: bytes ids of parents, empty for none, by row.
+        :param edge_indptr: CSR index pointer into edge_points.
+        :param edge_points: structured array of :data:`POINT_DTYPE`
+        :param neighborhood_indptr: CSR index pointer into point_indptr.
+        :param point_indptr: CSR index pointer into neighborhood_points.
+        :param neighborhood_points: structured array of :data:`POINT_DTYPE`
+        :param dict multipoints: MultiPoints by row.
+        :param links: table to find parents and children in, if not this one.
+        """
+        self.records = records
+        self.ids = ids
+        self.parent_ids = parent_ids
+        self.edge_indptr = edge_indptr
+        self.edge_points = edge_points
+        self.neighborhood_indptr = neighborhood_indptr
+        self.point_indptr = point_indptr
+        self.neighborhood_points = neighborhood_points
+        self.multipoints = multipoints or {}
+        self.links = self if links is None else links
+        self._id_order = None
+        self._child_order = None
+
+    @classmethod
+    def from_features(cls,
+            features: Iterable[Summit | Saddle | Runoff]
+        ) -> FeatureTable:
+        """
+        Pack features into a FeatureTable. features can be any iterable,
+        a generator such as
+        :func:`pyprom.feature_discovery.AnalyzeData.iter_features` for
+        instance, and is consumed a chunk at a time.
+
+        :param features: features to pack.
+        :return: a new FeatureTable
+        :raises: TypeError if a feature isn't one of :data:`KINDS`
+        :raises: ValueError if a feature is linked to other features.
+        """
+        builder = FeatureTableBuilder()
+        builder.extend(features)
+        return builder.build()
+
+    @property
+    def latitudes(self) -> NDArray:
+        """
+        :return: latitude of every feature.
+        """
+        return self.records['latitude']
+
+    @property
+    def longitudes(self) -> NDArray:
+        """
+        :return: longitude of every feature.
+        """
+        return self.records['longitude']
+
+    @property
+    def elevations(self) -> NDArray:
+        """
+        :return: elevation of every feature.
+        """
+        return self.records['elevation']
+
+    @property
+    def kinds(self) -> Set[type]:
+        """
+        :return: set of feature types in this table.
+        """
+        return {KINDS[kind] for kind in numpy.unique(self.records['kind'])}
+
+    @property
+    def lookup(self) -> FeatureTableLookup:
+        """
+        :return: Mapping of id to feature.
+        """
+        return FeatureTableLookup(self)
+
+    def row_of(self, id: str) -> int:
+        """
+        :param str id: feature id.
+        :return: row of the feature with that id.
+        :raises: KeyError if there's no such feature.
+        """
+        row = self._find_row(id.encode())
+        if row is None:
+            raise KeyError(id)
+        return row
+
+    def take(self, rows: NDArray) -> FeatureTable:
+        """
+        :param rows: row indexes, or a boolean mask.
+        :return: a new FeatureTable of just those rows.
+        """
+        rows = numpy.arange(len(self))[rows]
+        edge_indptr, edge_take = _take_csr(self.edge_indptr, rows)
+        neighborhood_indptr, neighborhoods = _take_csr(
+            self.neighborhood_indptr, rows)
+        point_indptr, point_take = _take_csr(self.point_indptr, neighborhoods)
+        new_row = {old: new for new, old in enumerate(rows.tolist())}
+        return FeatureTable(
+            self.records[rows],
+            self.ids[rows],
+            self.parent_ids[rows],
+            edge_indptr,
+            self.edge_points[edge_take],
+            neighborhood_indptr,
+            point_indptr,
+            self.neighborhood_points[point_take],
+            {new_row[row]: multipoint
+             for row, multipoint in self.multipoints.items()
+             if row in new_row},
+            self.links)
+
+    def __len__(self) -> int:
+        """
+        :return: number of features.
+        """
+        return self.records.size
+
+    def __getitem__(self, idx: int) -> Summit | Saddle | Runoff:
+        """
+        :param int idx: row.
+        :return: feature at idx, built from the table.
+        """
+        if idx < 0:
+            idx += len(self)
+        if not 0 <= idx < len(self):
+            raise IndexError("FeatureTable index out of range")
+        feature = self._build(idx)
+        # Link parent and children one level deep.
+        links = self.links
+        parent = links._find_row(self.parent_ids[idx])
+        if parent is not None:
+            feature.parent = links._build(parent)
+            feature.parent.children = [
+                feature if links.ids[row] == self.ids[idx] else links._build(row)
+                for row in links._child_rows(links.ids[parent])]
+        children = []
+        for row in links._child_rows(self.ids[idx]):
+            child = links._build(row)
+            child.parent = feature
+            children.append(child)
+        if children:
+            feature.children = children
+        return feature
+
+    def __iter__(self) -> Iterator[Summit | Saddle | Runoff]:
+        """
+        :return: features, built from the table one at a time.
+        """
+        for idx in range(len(self)):
+            yield self[idx]
+
+    def __repr__(self) -> str:
+        """
+        :return: String representation of this object
+        """
+        return "<FeatureTable> {} Features".format(len(self))
+
+    __str__ = __repr__
+
+    def _build(self, idx: int) -> Summit | Saddle | Runoff:
+        """
+        Build the feature at row idx, without parent or children.
+        """
+        record = self.records[idx]
+        kind = KINDS[record['kind']]
+        kwargs = {'edge': bool(record['edge']),
+                  'edgePoints': _points(self.edge_points[
+                      self.edge_indptr[idx]:self.edge_indptr[idx + 1]]),
+                  'id': self.ids[idx].decode()}
+        if idx in self.multipoints:
+            kwargs['multipoint'] = self.multipoints[idx]
+        if issubclass(kind, Saddle):
+            start, stop = self.neighborhood_indptr[idx:idx + 2]
+            kwargs['highPerimeterNeighborhoods'] = [
+                _points(self.neighborhood_points[
+                    self.point_indptr[n]:self.point_indptr[n + 1]])
+                for n in range(start, stop)]
+            kwargs['singleSummit'] = bool(record['singleSummit'])
+            kwargs['basinSaddle'] = bool(record['basinSaddle'])
+            if record['disqualified'] >= 0:
+                kwargs['disqualified'] = bool(record['disqualified'])
+        feature = kind(float(record['latitude']),
+                       float(record['longitude']),
+                       float(record['elevation']),
+                       **kwargs)
+        if kind is Summit:
+            feature.disqualified = bool(record['disqualified'] == 1)
+        return feature
+
+    def _find_row(self, id: bytes) -> int | None:
+        """
+        :return: row of the feature with bytes id, if it's in this table.
+        """
+        if not id:
+            return None
+        if self._id_order is None:
+            self._id_order = numpy.argsort(self.ids, kind='stable')
+        idx = numpy.searchsorted(self.ids, id, sorter=self._id_order)
+        if idx < self._id_order.size and self.ids[self._id_order[idx]] == id:
+            return int(self._id_order[idx])
+        return None
+
+    def _child_rows(self, id: bytes) -> List[int]:
+        """
+        :return: rows whose parent has bytes id, in row order.
+        """
+        if self._child_order is None:
+            self._child_order = numpy.argsort(self.parent_ids, kind='stable')
+        start = numpy.searchsorted(self.parent_ids, id, 'left',
+                                   sorter=self._child_order)
+        stop = numpy.searchsorted(self.parent_ids, id, 'right',
+                                  sorter=self._child_order)
+        return self._child_order[start:stop].tolist()
+
+
+class FeatureTableLookup(Mapping):
+    """
+    Read only Mapping of feature id to feature, for a
+    :class:`FeatureTable`. Features are built as they're looked up.
+    """
+
+    __slots__ = ['table']
+
+    def __init__(self, table: FeatureTable):
+        """
+        :param table: FeatureTable to look features up in.
+        """
+        self.table = table
+
+    def __getitem__(self, id: str) -> Summit | Saddle | Runoff:
+        """
+        :param str id: feature id.
+        :return: feature with that id.
+        :raises: KeyError if there's no such feature.
+        """
+        return self.table[self.table.row_of(id)]
+
+    def __iter__(self) -> Iterator[str]:
+        """
+        :return: feature ids.
+        """
+        return (id.decode() for id in self.table.ids)
+
+    def __len__(self) -> int:
+        """
+        :return: number of features.
+        """
+        return len(self.table)
+
+
+class FeatureTableBuilder:
+    """
+    Packs features into a :class:`FeatureTable` as they're appended, a
+    chunk of :data:`CHUNK_ROWS` features at a time, so features don't
+    need to be kept as objects until they're all found.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._multipoints = {}
+        self._rows = 0
+        self._reset()
+
+    def _reset(self) -> None:
+        """
+        Start a new chunk.
+        """
+        self._records = []
+        self._ids = []
+        self._parent_ids = []
+        self._edge_counts = []
+        self._edge_points = []
+        self._neighborhood_counts = []
+        self._point_counts = []
+        self._neighborhood_points = []
+
+    def append(self, feature: Summit | Saddle | Runoff) -> None:
+        """
+        Pack a feature.
+
+        :param feature: feature to pack.
+        :raises: TypeError if feature isn't one of :data:`KINDS`
+        :raises: ValueError if feature is linked to other features.
+        """
+        if type(feature) not in KINDS:
+            raise TypeError("FeatureTable can only hold Summit, Saddle"
+                            " or Runoff objects.")
+        if (getattr(feature, 'summits', None) or
+                getattr(feature, 'saddles', None) or
+                getattr(feature, 'basinSaddleAlternatives', None) or
+                getattr(feature, 'domain', None)):
+            raise ValueError("Features linked to other features can't be"
+                             " packed into a FeatureTable.")
+        if isinstance(feature, Saddle):
+            disqualified = feature._disqualified
+            disqualified = -1 if disqualified is None else int(bool(disqualified))
+            neighborhoods = feature.highPerimeterNeighborhoods
+        else:
+            disqualified = int(bool(feature.disqualified))
+            neighborhoods = []
+        self._records.append((
+            KINDS.index(type(feature)),
+            feature.latitude,
+            feature.longitude,
+            feature.elevation,
+            bool(feature.edgeEffect),
+            disqualified,
+            bool(getattr(feature, 'singleSummit', False)),
+            bool(getattr(feature, 'basinSaddle', False))))
+        self._ids.append(feature.id.encode())
+        parent = getattr(feature, 'parent', None)
+        self._parent_ids.append(parent.id.encode() if parent else b'')
+        self._edge_counts.append(len(feature.edgePoints))
+        self._edge_points.extend(feature.edgePoints)
+        self._neighborhood_counts.append(len(neighborhoods))
+        for neighborhood in neighborhoods:
+            self._point_counts.append(len(neighborhood))
+            self._neighborhood_points.extend(neighborhood)
+        if feature.multipoint:
+            self._multipoints[self._rows] = feature.multipoint
+        self._rows += 1
+        if len(self._records) >= CHUNK_ROWS:
+            self._flush()
+
+    def extend(self, features: Iterable[Summit | Saddle | Runoff]) -> None:
+        """
+        Pack features.
+
+        :param features: iterable of features to pack.
+        """
+        for feature in features:
+            self.append(feature)
+
+    def build(self) -> FeatureTable:
+        """
+        :return: FeatureTable of every feature packed so far.
+        """
+        self._flush()
+        chunks = list(zip(*self._chunks)) or [[]] * 8
+        (records, ids, parent_ids, edge_counts, edge_points,
+         neighborhood_counts, point_counts, neighborhood_points) = [
+            numpy.concatenate(arrays) if arrays else None for arrays in chunks]
+        if records is None:
+            records = numpy.empty(0, dtype=FEATURE_DTYPE)
+            ids = parent_ids = numpy.empty(0, dtype='S1')
+            edge_counts = neighborhood_counts = point_counts = \
+                numpy.empty(0, dtype=numpy.int64)
+            edge_points = neighborhood_points = numpy.empty(0, dtype=POINT_DTYPE)
+        return FeatureTable(records, ids, parent_ids,
+                            _indptr(edge_counts), edge_points,
+                            _indptr(neighborhood_counts),
+                            _indptr(point_counts), neighborhood_points,
+                            dict(self._multipoints))
+
+    def __len__(self) -> int:
+        """
+        :return: number of features packed so far.
+        """
+        return self._rows
+
+    def _flush(self) -> None:
+        """
+        Pack the current chunk into arrays.
+        """
+        if not self._records:
+            return
+        self._chunks.append((
+            numpy.array(self._records, dtype=FEATURE_DTYPE),
+            numpy.array(self._ids, dtype=bytes),
+            numpy.array(self._parent_ids, dtype=bytes),
+            numpy.array(self._edge_counts, dtype=numpy.int64),
+            numpy.array(self._edge_points, dtype=POINT_DTYPE),
+            numpy.array(self._neighborhood_counts, dtype=numpy.int64),
+            numpy.array(self._point_counts, dtype=numpy.int64),
+            numpy.array(self._neighborhood_points, dtype=POINT_DTYPE)))
+        self._reset()
+
+
+def _indptr(counts: NDArray) -> NDArray:
+    """
+    CSR index pointer from per row counts.
+    """
+    indptr = numpy.zeros(counts.size + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=indptr[1:])
+    return indptr
+
+
+def _take_csr(indptr: NDArray, rows: NDArray) -> Tuple[NDArray, NDArray]:
+    """
+    :return: (index pointer, value indexes) of rows of a CSR array.
+    """
+    starts = indptr[rows]
+    counts = indptr[rows + 1] - starts
+    new_indptr = _indptr(counts)
+    # Value indexes of each row run from its start, so offset a running
+    # count by where each row's values start relative to where they land.
+    take = (numpy.arange(new_indptr[-1], dtype=numpy.int64) +
+            numpy.repeat(starts - new_indptr[:-1], counts))
+    return new_indptr, take
+
+
+def _points(points: NDArray) -> List[XY_Elevation]:
+    """
+    Structured array of :data:`POINT_DTYPE` to a list of (x, y, ele) tuples.
+    """
+    return list(zip(points['x'].tolist(), points['y'].tolist(),
+                    points['elevation'].tolist()))
@@ -9,21 +9,24 @@ type location objects as well as a number of functions.
 """
 from __future__ import annotations
 
-from math import hypot
+import numpy
+
 from ..locations.base_coordinate import BaseCoordinate
 from ..locations.base_gridpoint import  BaseGridPoint
 from ..locations.gridpoint import GridPoint
+from .base_self_iterable import PackedPoints
 from .perimeter import Perimeter
 
-from typing import TYPE_CHECKING, Self, List, Generator
+from typing import TYPE_CHECKING, Self, List, Generator, Tuple
 if TYPE_CHECKING:
+    from numpy import NDArray
     from pyprom import DataMap
     from pyprom.lib.locations.spot_elevation import SpotElevation
     from pyprom._typing.type_hints import XY_Elevation, XY
 
 
 class MultiPoint:
-    __slots__ = ['points', 'elevation', 'datamap', 'perimeter']
+    __slots__ = ['_points', 'packed', 'elevation', 'datamap', 'perimeter']
     """
     | A MultiPoint Container. This is a special kind of feature which contains
     | multiple :class:`pyprom.lib.locations.base_gridpoint.BaseGridPoint`s.
@@ -50,10 +53,15 @@ class MultiPoint:
     | ``[2][3]   [6][3]``
     | ``[3]   [4][3]``
     | ``[6][7][6]``
+    |
+    | Members of huge MultiPoints (lakes, reservoirs) can be packed into
+    | int32 coordinate arrays, see :func:`pack`. `points` is then built
+    | on demand, while iteration, closestPoint and to_dict work from the
+    | arrays.
     """
 
     def __init__(self, 
-            points: BaseGridPoint, 
+            points: BaseGridPoint | PackedPoints, 
             elevation: float, 
             datamap: DataMap,
             perimeter: Perimeter = None
@@ -61,7 +69,9 @@ class MultiPoint:
         """
         :param points: list of
          :class:`pyprom.lib.locations.base_gridpoint.BaseGridPoint` objects.
-         These are the inside points that make up a Multipoint.
+         These are the inside points that make up a Multipoint. Or those
+         points already packed into
+         :class:`pyprom.lib.containers.base_self_iterable.PackedPoints`
         :type points:
          list(:class:`pyprom.lib.locations.base_gridpoint.BaseGridPoint`)
         :param elevation: elevation in meters
@@ -73,7 +83,11 @@ class MultiPoint:
          multipoint outside of the multipoint.
         :type perimeter: :class:`pyprom.lib.containers.perimeter.Perimeter`
         """
-        self.points = points  # BaseGridPoint Objects.
+        if isinstance(points, PackedPoints):
+            self.packed = points
+            self._points = []
+        else:
+            self.points = points  # BaseGridPoint Objects.
         self.elevation = elevation
         self.datamap = datamap  # data analysis object.
         self.perimeter = perimeter
@@ -108,6 +122,48 @@ class MultiPoint:
         elevation = multipointDict['elevation']
         return cls(points, elevation, datamap, perimeter=perimeter)
 
+    @property
+    def points(self) -> List[XY]:
+        """
+        :return: members as a list of tuple(x, y)
+        """
+        if self.packed is not None:
+            return self.packed.tuples()
+        return self._points
+
+    @points.setter
+    def points(self, points: List[XY]) -> None:
+        self.packed = None
+        self._points = points
+
+    def xys(self) -> Tuple[NDArray, NDArray]:
+        """
+        :return: (xs, ys) arrays of member coordinates.
+        """
+        if self.packed is not None:
+            return self.packed.xs, self.packed.ys
+        # Members can be (x, y) or (x, y, elevation), even mixed.
+        return (numpy.array([point[0] for point in self._points], dtype=numpy.int64),
+                numpy.array([point[1] for point in self._points], dtype=numpy.int64))
+
+    def pack(self) -> None:
+        """
+        Pack members, and Perimeter members, into arrays. See
+        :class:`pyprom.lib.containers.base_self_iterable.PackedPoints`
+        """
+        if self.packed is None:
+            self.packed = PackedPoints.from_tuples(self._points, elevations=False)
+            self._points = []
+        if self.perimeter is not None:
+            self.perimeter.pack()
+
+    def unpack(self) -> None:
+        """
+        Turn packed members back into tuples, which can be modified.
+        """
+        if self.packed is not None:
+            self.points = self.packed.tuples()
+
     @property
     def pointsLatLong(self) -> List[BaseCoordinate]:
         """
@@ -119,8 +175,11 @@ class MultiPoint:
         :rtype:
          list(:class:`pyprom.lib.locations.base_coordinate.BaseCoordinate`)
         """
-        return [BaseCoordinate(*self.datamap.xy_to_latlon(coord[0], coord[1]))
-                for coord in self.points]
+        if not len(self):
+            return []
+        lats, longs = self.datamap.xys_to_latlons(*self.xys())
+        return [BaseCoordinate(lat, long)
+                for lat, long in zip(lats.tolist(), longs.tolist())]
 
     def append(self, point: BaseGridPoint) -> None:
         """
@@ -133,6 +192,7 @@ class MultiPoint:
         :raises: Exception if tuple length != 2
         """
         incoming = self._check_and_return_incoming_point_type(point)
+        self.unpack()
         self.points.append(incoming)
 
 
@@ -151,21 +211,12 @@ class MultiPoint:
         :rtype :class:`pyprom.lib.locations.gridpoint.GridPoint`,
          :class:`pyprom.lib.locations.spot_elevation.SpotElevation`
         """
-        distanceCalc = lambda themX, themY, usX, usY: hypot((themX - usX),
-                                                        (themY - usY))
-        themX, themY = gridPoint.x, gridPoint.y
-        closestDistance = distanceCalc(themX, themY, *self.points[0])
-        closest = self.points[0]
-        for point in self.points[1:]:
-            distance = distanceCalc(themX, themY, point[0], point[1])
-            # well, can't get closer than that. mark it and bail.
-            if distance == 0:
-                closest = point
-                break
-            if distance < closestDistance:
-                closest = point
-                closestDistance = distance
-        gp = GridPoint(closest[0], closest[1], self.elevation)
+        xs, ys = self.xys()
+        # Squared distances order the same as distances. argmin picks
+        # the first of equally close points.
+        closest = int(numpy.argmin((xs - gridPoint.x) ** 2 +
+                                   (ys - gridPoint.y) ** 2))
+        gp = GridPoint(int(xs[closest]), int(ys[closest]), self.elevation)
         if asSpotElevation:
             return gp.toSpotElevation(self.datamap)
         return gp
@@ -183,6 +234,8 @@ class MultiPoint:
         :return: number of items in `self.points`
         :rtype: int
         """
+        if self.packed is not None:
+            return len(self.packed)
         return len(self.points)
 
     def __setitem__(self, idx: int, point: BaseGridPoint) -> None:
@@ -195,6 +248,7 @@ class MultiPoint:
         :type point: tuple()
         """
         incoming = self._check_and_return_incoming_point_type(point)
+        self.unpack()
         self.points[idx] = incoming
 
     def __getitem__(self, idx: int) -> BaseGridPoint:
@@ -205,6 +259,9 @@ class MultiPoint:
         :return: :class:`pyprom.lib.locations.base_gridpoint.BaseGridPoint`
          self.point at idx
         """
+        if self.packed is not None:
+            return BaseGridPoint.from_tuple(
+                self.packed.point(range(len(self.packed))[idx]))
         return BaseGridPoint.from_tuple(self.points[idx])
 
     def __eq__(self, other: Self) -> bool:
@@ -239,8 +296,7 @@ class MultiPoint:
         """
         :return: `self.points` as iterator
         """
-        for point in self.points:
-            yield point
+        yield from self.points
 
     def __repr__(self) -> str:
         """
@@ -248,7 +304,7 @@ class MultiPoint:
         """
         return "<Multipoint> elevation(m): {}, points {}". \
             format(self.elevation,
-                   len(self.points))
+                   len(self))
 
     def _check_and_return_incoming_point_type(self, point: BaseGridPoint) -> XY:
         """
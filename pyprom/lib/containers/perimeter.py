@@ -7,10 +7,15 @@ the LICENSE file that accompanies it.
 This library contains a Perimeter container class for storing GridPoints
 type location objects. and various transforms.
 """
+from __future__ import annotations
+
 from collections import defaultdict
-from .base_self_iterable import BaseSelfIterable
+from .base_self_iterable import BaseSelfIterable, PackedPoints
 from ..logic.contiguous_neighbors import contiguous_neighbors
 from ..locations.gridpoint import GridPoint
+
+import numpy
+
 from typing import TYPE_CHECKING, Dict, List, Self
 if TYPE_CHECKING:
     from pyprom import DataMap
@@ -36,7 +41,8 @@ class Perimeter(BaseSelfIterable):
         pointIndex:XY_Elevation_Fast_Dict | None = None,
         datamap: DataMap | None = None,
         mapEdge: bool = False,
-        mapEdgePoints: List[XY_Elevation] | None = None
+        mapEdgePoints: List[XY_Elevation] | None = None,
+        packedPoints: PackedPoints | None = None
     ):
         """
         :param pointList: tuple(x, y, elevation) which make up the Perimeter.
@@ -50,11 +56,16 @@ class Perimeter(BaseSelfIterable):
         :param bool mapEdge: is this a map edge?
         :param mapEdgePoints: list of Points (tuple) on the map edge.
         :type mapEdgePoints: list(tuple(x, y, ele))
+        :param packedPoints: Members packed into arrays, instead of
+         pointList and pointIndex.
+        :type packedPoints:
+         :class:`pyprom.lib.containers.base_self_iterable.PackedPoints`
         """
 
         super().__init__(
             pointList=pointList,
-            pointIndex=pointIndex
+            pointIndex=pointIndex,
+            packedPoints=packedPoints
         )
 
         self.datamap = datamap
@@ -125,6 +136,9 @@ class Perimeter(BaseSelfIterable):
         :return: List of points as tuples
         :rtype: list(tuple(x, y, elevation))
         """
+        if self.packed is not None:
+            high = numpy.nonzero(self.packed.elevations > elevation)[0]
+            return [self.packed.point(idx) for idx in high.tolist()]
         return [x for x in self.points if x[2] > elevation]
 
     def append(self, point: GridPoint) -> None:
@@ -137,6 +151,7 @@ class Perimeter(BaseSelfIterable):
         :type point: tuple(x, y, elevation)
         """
         incoming = self._check_and_return_incoming_point_type(point)
+        self.unpack()
         self.points.append(incoming)
 
     def __len__(self) -> int:
@@ -144,6 +159,8 @@ class Perimeter(BaseSelfIterable):
         :return: number of items in `self.points`
         :rtype: int
         """
+        if self.packed is not None:
+            return len(self.packed)
         return len(self.points)
 
     def __setitem__(self, idx: int, point) -> None:
@@ -156,6 +173,7 @@ class Perimeter(BaseSelfIterable):
         :type point: tuple(x, y, elevation)
         """
         incoming = self._check_and_return_incoming_point_type(point)
+        self.unpack()
         self.points[idx] = incoming
 
     def __getitem__(self, idx: int) -> XY_Elevation:
@@ -166,6 +184,8 @@ class Perimeter(BaseSelfIterable):
         :return: :class:`pyprom.lib.locations.gridpoint.GridPoint`
             self.point at idx
         """
+        if self.packed is not None:
+            return self.packed.point(range(len(self.packed))[idx])
         return self.points[idx]
 
     def __eq__(self, other: Perimeter) -> bool:
@@ -202,15 +222,14 @@ class Perimeter(BaseSelfIterable):
         """
         :return: `self.points` as iterator
         """
-        for point in self.points:
-            yield point
+        yield from self.points
 
     def __repr__(self) -> str:
         """
         :return: String representation of this object
         """
         return "<Perimeter>" \
-               " {} Objects".format(len(self.points))
+               " {} Objects".format(len(self))
 
     def _check_and_return_incoming_point_type(self, point: GridPoint | tuple) -> XY_Elevation:
         """
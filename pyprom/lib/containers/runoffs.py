@@ -10,11 +10,13 @@ type location objects.
 from __future__ import annotations
 
 from .saddles import SaddlesContainer
+from .spot_elevation import _holdsOnly
 from ..locations.runoff import Runoff
 
 from typing import TYPE_CHECKING, Self, List
 if TYPE_CHECKING:
     from pyprom import DataMap
+    from pyprom.lib.containers.feature_table import FeatureTable
 
 
 class RunoffsContainer(SaddlesContainer):
@@ -26,13 +28,14 @@ class RunoffsContainer(SaddlesContainer):
     __slots__ = []
 
     def __init__(self, 
-            runoffList: List[Runoff]
+            runoffList: List[Runoff] | FeatureTable
         ):
         """
-        :param runoffList: list of Runoff objects to reside in this container.
+        :param runoffList: list (or FeatureTable) of Runoff objects to
+         reside in this container.
         :type runoffList: list(:class:`pyprom.lib.locations.runoff.Runoff`)
         """
-        if len([x for x in runoffList if not isinstance(x, Runoff)]):
+        if not _holdsOnly(runoffList, Runoff):
             raise TypeError("runoffList passed to RunoffsContainer"
                             " can only contain Runoff objects.")
         super().__init__(runoffList)
@@ -9,16 +9,26 @@ type location objects.
 """
 from __future__ import annotations
 
-from .spot_elevation import SpotElevationContainer
+from itertools import chain
+
+from .spot_elevation import SpotElevationContainer, _holdsOnly
 from ..logic.internal_saddle_network import InternalSaddleNetwork
 from ..logic.tuple_funcs import highest
 from ..locations.saddle import Saddle, isSaddle
 from ..locations.gridpoint import GridPoint
 from ..logic.shortest_path_by_points import find_closest_points
+from ..parallel import can_fork, fork_map, resolve_workers, shared
 
-from typing import TYPE_CHECKING, List, Self
+from typing import TYPE_CHECKING, List, Self, Tuple
 if TYPE_CHECKING:
     from pyprom import DataMap
+    from pyprom.lib.containers.feature_table import FeatureTable
+
+# Most saddles handed to a worker at a time when rebuilding in parallel.
+REBUILD_CHUNK = 256
+# Chunks per worker at least, so workers which draw cheap saddles
+# can pick up more.
+CHUNKS_PER_WORKER = 4
 
 
 class SaddlesContainer(SpotElevationContainer):
@@ -28,18 +38,22 @@ class SaddlesContainer(SpotElevationContainer):
     """
 
     def __init__(self, 
-            saddleList: List[Saddle]
+            saddleList: List[Saddle] | FeatureTable
         ):
         """
-        :param saddleList: list of Saddle objects to reside in this container.
+        :param saddleList: list (or FeatureTable) of Saddle objects to
+         reside in this container.
         :type saddleList: list(:class:`pyprom.lib.locations.saddle.Saddle`)
         """
-        if len([x for x in saddleList if not isinstance(x, Saddle)]):
+        if not _holdsOnly(saddleList, Saddle):
             raise TypeError("saddleList passed to SaddlesContainer"
                             " can only contain Saddle objects.")
         super().__init__(saddleList)
 
-    def rebuildSaddles(self, datamap: DataMap) -> SaddlesContainer:
+    def rebuildSaddles(self,
+            datamap: DataMap,
+            workers: int | None = 1
+        ) -> SaddlesContainer:
         """
         Uses the saddles contained in this container and rebuilds any saddle
         which contains >= 2 high edges as (n-1) new saddles where n
@@ -48,67 +62,47 @@ class SaddlesContainer(SpotElevationContainer):
         Saddles with 2 high edges are added back in. This in effect deals
         with waterbodies and other similiar features.
 
+        Each saddle is rebuilt independently, so with more than one worker
+        chunks of saddles are rebuilt in forked processes sharing the
+        datamap. The new saddles, their order and their parent/child
+        links are the same regardless of how many workers there are.
+
         :param datamap: datamap to use while rebuilding.
         :type datamap: :class:`pyprom.lib.datamap.DataMap`
+        :param int workers: processes to rebuild saddles with. None for
+         one per core. Platforms which can't fork use one.
         :return: New SaddlesContainer
         :rtype: :class:`SaddlesContainer`
         """
+        # Packed containers build new objects every time they're iterated.
+        saddles = list(self.points)
+        workers = resolve_workers(workers)
+        if workers > 1 and can_fork() and saddles:
+            size = min(REBUILD_CHUNK,
+                       -(-len(saddles) // (workers * CHUNKS_PER_WORKER)))
+            chunks = [(start, min(start + size, len(saddles)))
+                      for start in range(0, len(saddles), size)]
+            rebuilt = chain.from_iterable(fork_map(
+                _rebuild_chunk, chunks, (saddles, datamap), workers,
+                initializer=datamap.reopen))
+        else:
+            rebuilt = (_rebuild_saddle(saddle, datamap) for saddle in saddles)
+
         new_saddles = list()
-        for saddle in self.points:
+        for saddle, children in zip(saddles, rebuilt):
             # insufficient highEdges. Re-add to the list an move on.
             if len(saddle.highPerimeterNeighborhoods) < 2:
                 new_saddles.append(saddle)
                 continue
-            # More than 2 high perimeter neighborhoods? build the network.
-            if len(saddle.highPerimeterNeighborhoods) > 2:
-                nw = InternalSaddleNetwork(saddle, datamap)
-                new_saddles += nw.generate_child_saddles()
-            # if we've just got 2 high perimeter neighborhoods, find all the highest points in
-            # the highPerimeterNeighborhoods, and find the midpoint between the first two if
-            # its a multipoint
-            if len(saddle.highPerimeterNeighborhoods) == 2:
-                highPerimeterNeighborhoods = []
-                for highPerimeterNeighborhood in saddle.highPerimeterNeighborhoods:
-                    highPerimeterNeighborhoods.append(highest(highPerimeterNeighborhood))
-
-                # if multipoint use first of each of the highest high perimeter neighborhoods
-                # and find the mid point for both. Then find the point within
-                # the multipoint that is closest to that midpoint. Disregard
-                # high perimeter neighborhoods.
-                if saddle.multipoint:
-                    hs0, hs1, distance =\
-                        find_closest_points(saddle.highPerimeterNeighborhoods[0], saddle.highPerimeterNeighborhoods[1], datamap)
-                    # find the middle GP for the 2 closest opposing high perimeter neighborhoods
-                    # points.
-                    # Note, in some cases this might be outside the multipoint
-                    middleGP = GridPoint(int((hs0[0] +
-                                             hs1[0]) / 2),
-                                         int((hs0[1] +
-                                             hs1[1]) / 2),
-                                         saddle.elevation)
-                    # reconcile any points which might be outside the
-                    # multipoint by finding the closest point inside the
-                    # multipoint.
-                    middleSpotElevation =\
-                        saddle.multipoint.closestPoint(middleGP,
-                                                       asSpotElevation=True)
-                    newSaddle = Saddle(middleSpotElevation.latitude,
-                                       middleSpotElevation.longitude,
-                                       middleSpotElevation.elevation)
-                # if not multipoint, just use that point.
-                else:
-                    newSaddle = Saddle(saddle.latitude,
-                                       saddle.longitude,
-                                       saddle.elevation)
-
-                newSaddle.highPerimeterNeighborhoods = [highPerimeterNeighborhoods[0], highPerimeterNeighborhoods[1]]
-                new_saddles.append(newSaddle)
-                if saddle.edgeEffect:
-                    newSaddle.parent = saddle
-                    saddle.children.append(newSaddle)
-            # If its an edgeEffect, we need to disqualify it and stash that
+            new_saddles += children
+            # If its an edgeEffect, its children need to know who their
+            # parent is, and we need to disqualify it and stash that
             # away for later.
             if saddle.edgeEffect:
+                for child in children:
+                    if child.parent is None:
+                        child.parent = saddle
+                        saddle.children.append(child)
                 saddle.disqualified = True
                 new_saddles.append(saddle)
 
@@ -134,8 +128,7 @@ class SaddlesContainer(SpotElevationContainer):
          :class:`pyprom.lib.locations.saddle.Saddle`
         """
         isSaddle(saddle)
-        self.points.append(saddle)
-        self.fast_lookup[saddle.id] = saddle
+        self._extend_points([saddle])
 
     def extend(self, saddles: List[Saddle]) -> None:
         """
@@ -150,9 +143,7 @@ class SaddlesContainer(SpotElevationContainer):
         """
         for sa in saddles:
             isSaddle(sa)
-        self.points.extend(saddles)
-        for sa in saddles:
-            self.fast_lookup[sa.id] = sa
+        self._extend_points(saddles)
 
     def to_dict(self) -> dict:
         """
@@ -180,21 +171,26 @@ class SaddlesContainer(SpotElevationContainer):
             saddles.append(saddleObj)
         sc = cls(saddles)
 
+        # Saddles split up by a walk keep their children, which aren't
+        # in the container anymore. Those links are dropped.
+        members = sc.fast_lookup
         for saddle in saddleContainerDict['saddles']:
             sid = saddle['id']
             children = saddle.get('children', None)
             if children:
                 for child in children:
-                    sc.by_id(sid).children.append(sc.by_id(child))
+                    if child in members:
+                        sc.by_id(sid).children.append(sc.by_id(child))
             parent = saddle.get('parent', None)
             if parent:
-                sc.by_id(sid).parent = sc.by_id(parent)
+                sc.by_id(sid).parent = members.get(parent)
             basinSaddleAlternatives =\
                 saddle.get('basinSaddleAlternatives', None)
             if basinSaddleAlternatives:
                 for bsa in basinSaddleAlternatives:
-                    sc.by_id(sid).basinSaddleAlternatives.append(
-                        sc.by_id(bsa))
+                    if bsa in members:
+                        sc.by_id(sid).basinSaddleAlternatives.append(
+                            sc.by_id(bsa))
         return sc
 
     @property
@@ -231,6 +227,86 @@ class SaddlesContainer(SpotElevationContainer):
         :type saddle: :class:`pyprom.lib.locations.saddle.Saddle`
         """
         isSaddle(saddle)
+        self.thaw()
         self.points[idx] = saddle
 
     __str__ = __repr__
+
+
+def _rebuild_saddle(saddle: Saddle, datamap: DataMap) -> List[Saddle]:
+    """
+    Rebuild a saddle with >= 2 high edges into (n-1) new saddles, see
+    SaddlesContainer.rebuildSaddles. New saddles of an edge effect saddle
+    are its children.
+
+    :param saddle: Saddle to rebuild.
+    :param datamap: datamap to use while rebuilding.
+    :return: list of new Saddles, empty if saddle has < 2 high edges.
+    """
+    # More than 2 high perimeter neighborhoods? build the network.
+    if len(saddle.highPerimeterNeighborhoods) > 2:
+        nw = InternalSaddleNetwork(saddle, datamap)
+        return nw.generate_child_saddles()
+    # if we've just got 2 high perimeter neighborhoods, find all the highest points in
+    # the highPerimeterNeighborhoods, and find the midpoint between the first two if
+    # its a multipoint
+    if len(saddle.highPerimeterNeighborhoods) < 2:
+        return []
+    highPerimeterNeighborhoods = []
+    for highPerimeterNeighborhood in saddle.highPerimeterNeighborhoods:
+        highPerimeterNeighborhoods.append(highest(highPerimeterNeighborhood))
+
+    # if multipoint use first of each of the highest high perimeter neighborhoods
+    # and find the mid point for both. Then find the point within
+    # the multipoint that is closest to that midpoint. Disregard
+    # high perimeter neighborhoods.
+    if saddle.multipoint:
+        hs0, hs1, distance =\
+            find_closest_points(saddle.highPerimeterNeighborhoods[0], saddle.highPerimeterNeighborhoods[1], datamap)
+        # find the middle GP for the 2 closest opposing high perimeter neighborhoods
+        # points.
+        # Note, in some cases this might be outside the multipoint
+        middleGP = GridPoint(int((hs0[0] +
+                                 hs1[0]) / 2),
+                             int((hs0[1] +
+                                 hs1[1]) / 2),
+                             saddle.elevation)
+        # reconcile any points which might be outside the
+        # multipoint by finding the closest point inside the
+        # multipoint.
+        middleSpotElevation =\
+            saddle.multipoint.closestPoint(middleGP,
+                                           asSpotElevation=True)
+        newSaddle = Saddle(middleSpotElevation.latitude,
+                           middleSpotElevation.longitude,
+                           middleSpotElevation.elevation)
+    # if not multipoint, just use that point.
+    else:
+        newSaddle = Saddle(saddle.latitude,
+                           saddle.longitude,
+                           saddle.elevation)
+
+    newSaddle.highPerimeterNeighborhoods = [highPerimeterNeighborhoods[0], highPerimeterNeighborhoods[1]]
+    if saddle.edgeEffect:
+        newSaddle.parent = saddle
+        saddle.children.append(newSaddle)
+    return [newSaddle]
+
+
+def _rebuild_chunk(chunk: Tuple[int, int]) -> List[List[Saddle]]:
+    """
+    Rebuild a chunk of saddles, in a forked worker. The worker's copy of
+    the parent's saddles and datamap do the work.
+
+    :param chunk: (first saddle, saddle to stop at)
+    :return: new saddles of each saddle in chunk.
+    """
+    saddles, datamap = shared()
+    rebuilt = []
+    for saddle in saddles[chunk[0]:chunk[1]]:
+        children = _rebuild_saddle(saddle, datamap)
+        # Parents stay behind, rebuildSaddles links the parent's own.
+        for child in children:
+            child.parent = None
+        rebuilt.append(children)
+    return rebuilt
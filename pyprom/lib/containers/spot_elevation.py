@@ -11,11 +11,14 @@ from __future__ import annotations
 
 from ..locations.summit import Summit
 from ..locations.spot_elevation import isSpotElevation
-from ..constants import METERS_PER_FOOT, FEET_PER_MILE
+from ..constants import METERS_PER_FOOT, FEET_PER_METER, FEET_PER_MILE
 from .base import _Base
+from .feature_table import FeatureTable
 from geopy.distance import geodesic
 
-from typing import TYPE_CHECKING, List, Self
+import numpy
+
+from typing import TYPE_CHECKING, Iterable, List, Mapping, Self
 if TYPE_CHECKING:
     from pyprom import DataMap
     from pyprom.lib.locations.spot_elevation import SpotElevation
@@ -30,21 +33,75 @@ class SpotElevationContainer(_Base):
     :class:`pyprom.lib.containers.saddles.SaddlesContainer`,
     :class:`pyprom.lib.containers.summits.SummitsContainer`,
     and :class:`pyprom.lib.containers.runoffs.RunOffsContainer`
+
+    Members can be kept packed in a
+    :class:`pyprom.lib.containers.feature_table.FeatureTable` rather than
+    a list, see :func:`pack`. Packed members are built as they're
+    accessed, and are copies. Modifying the container turns the table
+    back into a list, see :func:`thaw`.
     """
 
-    __slots__ = ['points', 'fast_lookup']
+    __slots__ = ['points', '_fast_lookup']
 
     def __init__(self, 
-            spotElevationList: List[SpotElevation]
+            spotElevationList: List[SpotElevation] | FeatureTable
         ):
         """
         :param spotElevationList: list of SpotElevation objects
-         which will reside in this container.
+         (or a FeatureTable of them) which will reside in this container.
         :type spotElevationList:
          :class:`pyprom.lib.locations.spot_elevation.SpotElevation`
         """
         self.points = spotElevationList
-        self.fast_lookup = {point.id: point for point in self.points}
+        self._fast_lookup = None
+
+    @property
+    def fast_lookup(self) -> Mapping[str, SpotElevation]:
+        """
+        :return: Mapping of id to member, built on first use.
+        """
+        if self._fast_lookup is None:
+            if self.packed:
+                self._fast_lookup = self.points.lookup
+            else:
+                self._fast_lookup = {point.id: point for point in self.points}
+        return self._fast_lookup
+
+    @property
+    def packed(self) -> bool:
+        """
+        :return: are members packed in a FeatureTable?
+        """
+        return isinstance(self.points, FeatureTable)
+
+    def pack(self) -> None:
+        """
+        Pack members into a
+        :class:`pyprom.lib.containers.feature_table.FeatureTable`, which
+        takes a fraction of the memory objects do.
+        """
+        if not self.packed:
+            self.points = FeatureTable.from_features(self.points)
+            self._fast_lookup = None
+
+    def thaw(self) -> None:
+        """
+        Turn packed members back into a list of objects, which can be
+        modified.
+        """
+        if self.packed:
+            self.points = list(self.points)
+            self._fast_lookup = None
+
+    def _extend_points(self, spotElevations: Iterable[SpotElevation]) -> None:
+        """
+        Add already type checked members.
+        """
+        self.thaw()
+        self.points.extend(spotElevations)
+        if self._fast_lookup is not None:
+            for se in spotElevations:
+                self._fast_lookup[se.id] = se
 
     @property
     def lowest(self) -> List[SpotElevation]:
@@ -55,6 +112,9 @@ class SpotElevationContainer(_Base):
         :rtype:
          list(:class:`pyprom.lib.locations.spot_elevation.SpotElevation`)
         """
+        if self.packed:
+            elevations = self.points.elevations
+            return list(self.points.take(elevations == elevations.min()))
         low = self.points[0].elevation
         lowest = list()
         for spot_elevation in self.points:
@@ -75,6 +135,9 @@ class SpotElevationContainer(_Base):
         :rtype:
          list(:class:`pyprom.lib.locations.spot_elevation.SpotElevation`)
         """
+        if self.packed:
+            elevations = self.points.elevations
+            return list(self.points.take(elevations == elevations.max()))
         high = self.points[0].elevation
         highest = list()
         for spot_elevation in self.points:
@@ -128,6 +191,14 @@ class SpotElevationContainer(_Base):
         else:
             raise ValueError('No unit value specified')
 
+        if self.packed:
+            # Measure from the packed coordinates, and build only what's
+            # within the distance.
+            rows = [row for row, point in enumerate(zip(
+                        self.points.latitudes.tolist(),
+                        self.points.longitudes.tolist()))
+                    if geodesic((lat, long), point).meters < convertedDist]
+            return self.__class__(self.points.take(numpy.array(rows, dtype=numpy.int64)))
         positive = list()
         # iterate through points and collect only points within the specified
         # distance using the geodesic algorithm.
@@ -164,6 +235,12 @@ class SpotElevationContainer(_Base):
         upperlong = max(long1, long2)
         lowerlat = min(lat1, lat2)
         lowerlong = min(long1, long2)
+        if self.packed:
+            latitudes = self.points.latitudes
+            longitudes = self.points.longitudes
+            return self.__class__(self.points.take(
+                (lowerlat < latitudes) & (latitudes < upperlat) &
+                (lowerlong < longitudes) & (longitudes < upperlong)))
         return self.__class__(
             [x for x in self.points if lowerlat < x.latitude < upperlat and
                 lowerlong < x.longitude < upperlong])
@@ -183,6 +260,9 @@ class SpotElevationContainer(_Base):
         :return: all points in range between lower and upper (exclusive)
         :rtype: :class:`SpotElevationContainer`
         """
+        if self.packed:
+            feet = self.points.elevations * FEET_PER_METER
+            return self.__class__(self.points.take((feet > lower) & (feet < upper)))
         return self.__class__([x for x in self.points if
                                x.feet > lower and x.feet < upper])
 
@@ -201,6 +281,10 @@ class SpotElevationContainer(_Base):
         :return: all points in range between lower and upper (exclusive)
         :rtype: :class:`SpotElevationContainer`
         """
+        if self.packed:
+            elevations = self.points.elevations
+            return self.__class__(self.points.take(
+                (upper > elevations) & (elevations > lower)))
         return self.__class__([x for x in self.points if
                               upper > x.elevation > lower])
 
@@ -247,8 +331,7 @@ class SpotElevationContainer(_Base):
          :class:`pyprom.lib.locations.spot_elevation.SpotElevation`
         """
         isSpotElevation(spotElevation)
-        self.points.append(spotElevation)
-        self.fast_lookup[spotElevation.id] = spotElevation
+        self._extend_points([spotElevation])
 
     def extend(self, spotElevations: Self) -> None:
         """
@@ -263,9 +346,7 @@ class SpotElevationContainer(_Base):
         """
         for se in spotElevations:
             isSpotElevation(se)
-        self.points.extend(spotElevations)
-        for se in spotElevations:
-            self.fast_lookup[se.id] = se
+        self._extend_points(spotElevations)
 
     def index(self, spotElevation: Self) -> int:
         """
@@ -280,6 +361,11 @@ class SpotElevationContainer(_Base):
         :return: index in points list where this spotElevation exists
         :rtype: int, None
         """
+        if self.packed:
+            try:
+                return self.points.row_of(spotElevation.id)
+            except KeyError:
+                return None
         try:
             return self.points.index(spotElevation)
         except:
@@ -310,6 +396,7 @@ class SpotElevationContainer(_Base):
          :class:`pyprom.lib.locations.spot_elevation.SpotElevation`
         """
         isSpotElevation(spotElevation)
+        self.thaw()
         self.points[idx] = spotElevation
 
     def __getitem__(self, idx: int) -> SpotElevation:
@@ -353,6 +440,20 @@ class SpotElevationContainer(_Base):
     __str__ = __repr__
 
 
+def _holdsOnly(
+        spotElevations: List[SpotElevation] | FeatureTable,
+        kind: type
+    ) -> bool:
+    """
+    :param spotElevations: list or FeatureTable of would be members.
+    :param kind: type every member must be.
+    :return: are all spotElevations of kind?
+    """
+    if isinstance(spotElevations, FeatureTable):
+        return all(issubclass(k, kind) for k in spotElevations.kinds)
+    return all(isinstance(x, kind) for x in spotElevations)
+
+
 def _isSpotElevationContainer(
         spotElevationContainer: SpotElevationContainer
     ) -> None:
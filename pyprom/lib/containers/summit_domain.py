@@ -15,12 +15,13 @@ from ..locations.gridpoint import GridPoint
 
 from typing import TYPE_CHECKING, List, Self, Dict, Generator
 if TYPE_CHECKING:
-    from pyprom._typing.type_hints import XY_Elevation
+    from pyprom._typing.type_hints import XY, XY_Elevation
     from pyprom import DataMap
     from pyprom.lib.locations.saddle import Saddle
     from pyprom.lib.locations.summit import Summit
     from pyprom.lib.containers.saddles import SaddlesContainer
     from pyprom.lib.containers.summits import SummitsContainer
+    from pyprom.lib.containers.summit_domain_labels import SummitDomainLabels
     from shapely.geometry.base import BaseGeometry
 
 class SummitDomain:
@@ -30,13 +31,14 @@ class SummitDomain:
     all points along all directly ascending paths to a summit.
     """
 
-    __slots__ = ['datamap', 'points', 'summit', 'saddles']
+    __slots__ = ['datamap', '_points', 'summit', 'saddles', 'labels', 'label']
 
     def __init__(self, 
             datamap: DataMap, 
             summit: Summit, 
             saddles: List[Saddle], 
-            points: List[XY_Elevation]
+            points: List[XY],
+            labels: SummitDomainLabels | None = None
         ):
         """
         :param datamap: Datamap associated with this :class:`SummitDomain`
@@ -45,17 +47,39 @@ class SummitDomain:
         :type summit: :class:`pyprom.lib.locations.summit.Summit`)
         :param saddles: list of Saddles
         :type saddles: :list(:class:`pyprom.lib.locations.saddle.Saddle`)
-        :param points: List of (x, y, elevation) tuples. A point
+        :param points: List of (x, y) tuples. A point
         is a non summit, non saddle member of this domain along
         a non descending path from a
         :class:`pyprom.lib.locations.saddle.Saddle` to the
         :class:`pyprom.lib.locations.summit.Summit`
-        :type points: list(tuple(x, y, elevation))
+        :type points: list(tuple(x, y))
+        :param labels: label raster to keep points in, rather than a list.
+        :type labels:
+         :class:`pyprom.lib.containers.summit_domain_labels.SummitDomainLabels`
         """
         self.datamap = datamap
-        self.points = points
         self.summit = summit
         self.saddles = saddles
+        self.labels = labels
+        if labels is None:
+            self.label = 0
+            self._points = points
+        else:
+            self.label = labels.add(self)
+            self._points = None
+            self.extend(points)
+
+    @property
+    def points(self) -> List[XY]:
+        """
+        Member points of this SummitDomain. If this SummitDomain is kept
+        in a label raster, these are read out of it in row major order.
+
+        :return: list of (x, y)
+        """
+        if self.labels is None:
+            return self._points
+        return self.labels.points(self.label)
 
     @property
     def members(self) -> List[BaseCoordinate]:
@@ -80,23 +104,30 @@ class SummitDomain:
         :param externalHash: defaultDict This is a fast lookup
          {x: {y : SummitDomain}} used by the caller.
         """
-        self.points.append(point)
-        if externalHash != None:
-            externalHash[point[0]][point[1]] = self
+        self.extend([point], externalHash)
 
     def extend(self, 
-            points: XY_Elevation, 
+            points: List[XY_Elevation], 
             externalHash: Dict[int, Dict[int, SummitDomain]] = None
         ) -> None:
         """
         Extends points to this container. Adds coordinates to
-         externalHash if supplied.
+         externalHash if supplied. Points of a SummitDomain kept in a
+         label raster are labeled in one go.
         :param points: [(x, y, elevation)] to extend.
         :param externalHash: defaultDict This is a fast lookup
          {x: {y : SummitDomain}} used by the caller.
         """
+        if self.labels is not None:
+            if points:
+                self.labels.assign(self.label,
+                                   [point[0] for point in points],
+                                   [point[1] for point in points])
+            return
         for point in points:
-            self.append(point, externalHash)
+            self._points.append(point)
+            if externalHash != None:
+                externalHash[point[0]][point[1]] = self
 
     def remove_saddle(self, saddle: Saddle):
         """
@@ -123,9 +154,14 @@ class SummitDomain:
         :return: SpotElevation along path.
         :rtype: :class:`pyprom.lib.locations.spot_elevation.SpotElevation`
         """
-        for point in self.points:
-            lat, long = self.datamap.xy_to_latlon(point[0], point[1])
-            elevation = self.datamap.get(point[0], point[1])
+        if not self.points:
+            return
+        xs = [point[0] for point in self.points]
+        ys = [point[1] for point in self.points]
+        lats, longs = self.datamap.xys_to_latlons(xs, ys)
+        elevations = self.datamap.get_many(xs, ys)
+        for lat, long, elevation in zip(lats.tolist(), longs.tolist(),
+                                        elevations.tolist()):
             yield SpotElevation(lat, long, elevation)
 
     def iterateBaseGridPoint(self) -> Generator[BaseGridPoint]:
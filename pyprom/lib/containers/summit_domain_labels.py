@@ -0,0 +1,185 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains a label raster recording which
+:class:`pyprom.lib.containers.summit_domain.SummitDomain`, if any,
+each pixel of a datamap is a member of.
+"""
+
+from __future__ import annotations
+
+from multiprocessing import shared_memory
+
+import numpy
+
+from typing import TYPE_CHECKING, List, Tuple
+if TYPE_CHECKING:
+    from numpy import NDArray
+    from pyprom._typing.type_hints import Numpy_X, Numpy_Y, XY
+    from pyprom.lib.containers.summit_domain import SummitDomain
+
+
+class SummitDomainLabels:
+    """
+    SummitDomainLabels keeps summit domain membership as an int32 array
+    shaped like the raster. Pixels which aren't a member of any
+    SummitDomain are label 0, members of a SummitDomain are its label,
+    which indexes self.domains.
+
+    SummitDomains created with a SummitDomainLabels don't keep their own
+    points, their points are read back out of the label array. So that
+    reading every domain's points isn't a pass over the raster each,
+    member pixels of all labels are sorted in one go, on first read after
+    a change.
+
+    While shared, see :meth:`share`, the label array lives in shared
+    memory, so processes forked from then on see every later change.
+
+    generation counts changes to the label array, so whoever depends
+    on labels can tell whether any changed since they last looked.
+    """
+
+    def __init__(self, shape: Tuple[int, int]):
+        """
+        :param shape: (rows, columns) of the raster.
+        """
+        self.labels = numpy.zeros(shape, dtype=numpy.int32)
+        self.width = shape[1]
+        # label 0 is no SummitDomain.
+        self.domains: List[SummitDomain | None] = [None]
+        self._members = None
+        self._indptr = None
+        self._shared_memory = None
+        # Bumped whenever a pixel's label changes.
+        self.generation = 0
+
+    def __len__(self) -> int:
+        """
+        :return: number of SummitDomains.
+        """
+        return len(self.domains) - 1
+
+    def __repr__(self) -> str:
+        """
+        :return: String representation of this object
+        """
+        return "<SummitDomainLabels> {} domains {} member pixels".format(
+            len(self), int(numpy.count_nonzero(self.labels)))
+
+    __str__ = __repr__
+
+    def share(self) -> None:
+        """
+        Move the label array into shared memory, so worker processes
+        forked from now on read labels as they are assigned, rather than
+        as they were when they forked.
+        """
+        if self._shared_memory is not None:
+            return
+        self._shared_memory = shared_memory.SharedMemory(
+            create=True, size=max(self.labels.nbytes, 1))
+        labels = numpy.ndarray(self.labels.shape, dtype=self.labels.dtype,
+                               buffer=self._shared_memory.buf)
+        labels[...] = self.labels
+        self.labels = labels
+
+    def unshare(self) -> None:
+        """
+        Move the label array back out of shared memory, and release it.
+        """
+        if self._shared_memory is None:
+            return
+        self.labels = self.labels.copy()
+        self._shared_memory.close()
+        self._shared_memory.unlink()
+        self._shared_memory = None
+
+    def add(self, domain: SummitDomain) -> int:
+        """
+        Register a SummitDomain.
+
+        :param domain: SummitDomain to label.
+        :return: label of domain.
+        """
+        self.domains.append(domain)
+        self._members = None
+        return len(self.domains) - 1
+
+    def get(self, x: Numpy_X, y: Numpy_Y) -> SummitDomain | None:
+        """
+        :param int x: x coordinate in raster data.
+        :param int y: y coordinate in raster data.
+        :return: SummitDomain x, y is a member of, or None, including for
+         coordinates off the map.
+        """
+        if 0 <= x < self.labels.shape[0] and 0 <= y < self.width:
+            return self.domains[self.labels[x, y]]
+        return None
+
+    def assign(self,
+            label: int,
+            xs: NDArray | List[int],
+            ys: NDArray | List[int]
+        ) -> None:
+        """
+        Make pixels members of label.
+
+        :param int label: label to assign.
+        :param xs: x coordinates in raster data.
+        :param ys: y coordinates in raster data.
+        """
+        self.labels[xs, ys] = label
+        self._members = None
+        self.generation += 1
+
+    def relabel(self, labels: NDArray) -> None:
+        """
+        Replace the label of every pixel.
+
+        :param labels: int32 labels shaped like the raster.
+        """
+        self.labels[...] = labels
+        self._members = None
+        self.generation += 1
+
+    def copy(self,
+            xs: NDArray | List[int],
+            ys: NDArray | List[int],
+            from_xs: NDArray | List[int],
+            from_ys: NDArray | List[int]
+        ) -> None:
+        """
+        Make each pixel a member of whatever the matching `from` pixel
+        is a member of.
+
+        :param xs: x coordinates in raster data.
+        :param ys: y coordinates in raster data.
+        :param from_xs: x coordinates to copy labels from.
+        :param from_ys: y coordinates to copy labels from.
+        """
+        labels = self.labels[from_xs, from_ys]
+        if numpy.array_equal(self.labels[xs, ys], labels):
+            return
+        self.labels[xs, ys] = labels
+        self._members = None
+        self.generation += 1
+
+    def points(self, label: int) -> List[XY]:
+        """
+        Member pixels of label in row major order, the same as
+        `numpy.nonzero(labels == label)`.
+
+        :param int label: label to look up.
+        :return: list of (x, y)
+        """
+        if self._members is None:
+            flat = self.labels.ravel()
+            self._members = numpy.argsort(flat, kind='stable')
+            self._indptr = numpy.searchsorted(
+                flat[self._members], numpy.arange(len(self.domains) + 1))
+        members = self._members[self._indptr[label]:self._indptr[label + 1]]
+        xs, ys = numpy.divmod(members, self.width)
+        return list(zip(xs.tolist(), ys.tolist()))
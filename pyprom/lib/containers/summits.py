@@ -7,13 +7,15 @@ the LICENSE file that accompanies it.
 This library contains a container class for storing Summit
 type location objects.
 """
+from __future__ import annotations
 
-from .spot_elevation import SpotElevationContainer
+from .spot_elevation import SpotElevationContainer, _holdsOnly
 from ..locations.summit import Summit, isSummit
 
 from typing import TYPE_CHECKING, List, Self
 if TYPE_CHECKING:
     from pyprom.lib.locations.summit import Summit
+    from pyprom.lib.containers.feature_table import FeatureTable
     from pyprom import DataMap
 
 
@@ -23,14 +25,15 @@ class SummitsContainer(SpotElevationContainer):
     Allows for various list transformations.
     """
 
-    def __init__(self, summitList: List[Summit]):
+    def __init__(self, summitList: List[Summit] | FeatureTable):
         """
-        :param summitList: list of Summits which reside in this container.
+        :param summitList: list (or FeatureTable) of Summits which reside
+         in this container.
         :type summitList: list(:class:`pyprom.lib.locations.summit.Summit`)
         :raises: TypeError if summitList contains non
          :class:`pyprom.lib.locations.summit.Summit` objects
         """
-        if len([x for x in summitList if not isinstance(x, Summit)]):
+        if not _holdsOnly(summitList, Summit):
             raise TypeError("summitList passed to SummitsContainer"
                             " can only contain Summit objects.")
         super().__init__(summitList)
@@ -56,8 +59,7 @@ class SummitsContainer(SpotElevationContainer):
          :class:`pyprom.lib.locations.summit.Summit`
         """
         isSummit(summit)
-        self.points.append(summit)
-        self.fast_lookup[summit.id] = summit
+        self._extend_points([summit])
 
     def extend(self, summits: List[Summit]) -> None:
         """
@@ -72,9 +74,7 @@ class SummitsContainer(SpotElevationContainer):
         """
         for su in summits:
             isSummit(su)
-        self.points.extend(summits)
-        for su in summits:
-            self.fast_lookup[su.id] = su
+        self._extend_points(summits)
 
     def to_dict(self) -> dict:
         """
@@ -127,6 +127,7 @@ class SummitsContainer(SpotElevationContainer):
          :class:`pyprom.lib.locations.summit.Summit`
         """
         isSummit(summit)
+        self.thaw()
         self.points[idx] = summit
 
     def __repr__(self) -> str:
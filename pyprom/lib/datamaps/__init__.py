@@ -1 +1,2 @@
-from .datamap import DataMap
\ No newline at end of file
+from .datamap import DataMap
+from .windowed_datamap import WindowedDataMap
\ No newline at end of file
@@ -12,10 +12,11 @@ import logging
 
 
 from math import hypot
+import numpy
 from shapely.geometry import Polygon
 from numpy import array2string
 
-from typing import TYPE_CHECKING, Tuple, Any
+from typing import TYPE_CHECKING, Tuple, Any, Generator
 if TYPE_CHECKING:
     from pyprom._typing.type_hints import (
         Numpy_X, Numpy_Y, 
@@ -46,8 +47,17 @@ DIAGONAL_SHIFT_LIST = (
     (-1, 1), (1, 1), (1, -1), (-1, -1)
 )
 FULL_SHIFT_ORTHOGONAL_DIAGONAL_LIST = ORTHOGONAL_SHIFT_LIST + DIAGONAL_SHIFT_LIST
+# FULL_SHIFT_LIST as arrays, for vectorized neighbor lookups.
+FULL_SHIFT_X = numpy.array([shift[0] for shift in FULL_SHIFT_LIST])
+FULL_SHIFT_Y = numpy.array([shift[1] for shift in FULL_SHIFT_LIST])
 
 class BaseDataMap:
+    # Multiplier from values stored in numpy_array to meters.
+    # Only quantized DataMaps store anything other than meters.
+    elevation_scale = 1.0
+    # nodata padded copy of numpy_array, built on first use by
+    # _padded_rows(). WindowedDataMaps never build one.
+    _padded_array = None
 
     def coord_inbounds(self, x, y) -> bool:
         return (x >= 0 and x <= self.max_x) & (y >= 0 and y <= self.max_y)
@@ -65,7 +75,7 @@ class BaseDataMap:
             _x = x + shift[0]
             _y = y + shift[1]
             if self.coord_inbounds(_x, _y):
-                yield _x, _y, float(self.numpy_array[_x, _y])
+                yield _x, _y, float(self.numpy_array[_x, _y]) * self.elevation_scale
             else:
                 yield _x, _y, self.nodata
 
@@ -82,7 +92,7 @@ class BaseDataMap:
             _x = x + shift[0]
             _y = y + shift[1]
             if self.coord_inbounds(_x, _y):
-                yield _x, _y, float(self.numpy_array[_x, _y])
+                yield _x, _y, float(self.numpy_array[_x, _y]) * self.elevation_scale
             else:
                 yield _x, _y, self.nodata
 
@@ -99,7 +109,7 @@ class BaseDataMap:
             _x = x + shift[0]
             _y = y + shift[1]
             if self.coord_inbounds(_x, _y):
-                yield _x, _y, float(self.numpy_array[_x, _y])
+                yield _x, _y, float(self.numpy_array[_x, _y]) * self.elevation_scale
             else:
                 yield _x, _y, self.nodata
 
@@ -141,10 +151,155 @@ class BaseDataMap:
         :param int y: y coordinate in raster data.
         :return: float
         """
-        return float(self.numpy_array[x, y])
+        return float(self.numpy_array[x, y]) * self.elevation_scale
 
     def is_map_edge(self, x: Numpy_X, y: Numpy_Y) -> bool:
         """
         Determine if x, y is on the map edge.
         """
-        return x == 0 or y == 0 or x == self.max_x or y == self.max_y
\ No newline at end of file
+        return x == 0 or y == 0 or x == self.max_x or y == self.max_y
+
+    def nodata_mask(self, values: NDArray) -> NDArray:
+        """
+        Vectorized nodata test for values read from numpy_array.
+        Unlike `==`, this is also correct for a NaN nodata value.
+
+        :param values: array of stored values.
+        :return: boolean array, True where values are nodata.
+        """
+        nodata = self.stored_nodata
+        if nodata is None:
+            return numpy.zeros(numpy.shape(values), dtype=bool)
+        if isinstance(nodata, float) and numpy.isnan(nodata):
+            return numpy.isnan(values)
+        return numpy.asarray(values) == nodata
+
+    def _pad(self, numpy_array: NDArray) -> NDArray:
+        """
+        Pad numpy_array with a 1 pixel border of nodata.
+        """
+        fill = self.stored_nodata
+        dtype = numpy_array.dtype
+        if fill is None:
+            fill = numpy.nan
+            if dtype.kind != 'f':
+                dtype = numpy.float64
+        return numpy.pad(numpy.asarray(numpy_array, dtype=dtype), 1,
+                         mode='constant', constant_values=fill)
+
+    def _padded_rows(self, x_start: Numpy_X, x_stop: Numpy_X) -> NDArray:
+        """
+        Padded raster rows x_start - 1 through x_stop (inclusive), that is,
+        rows x_start:x_stop with their neighboring rows on either side.
+        Row 0 of the result is padded row x_start.
+
+        In memory rasters are padded whole, once, on first use, see
+        _padded_array. Everything reading padded rows goes through here
+        (or neighbor_views() and friends), so
+        :class:`pyprom.lib.datamaps.windowed_datamap.WindowedDataMap` can
+        pad just the rows asked for, rather than the whole raster.
+        """
+        if self._padded_array is None:
+            self._padded_array = self._pad(self.numpy_array)
+        return self._padded_array[x_start:x_stop + 2]
+
+    def neighbor_views(self,
+            x_start: Numpy_X = 0,
+            x_stop: Numpy_X | None = None
+        ) -> Tuple[NDArray, ...]:
+        """
+        8 shifted views of the padded raster, in FULL_SHIFT_LIST order.
+        View `i` at [x - x_start, y] holds the stored value of neighbor `i`
+        of (x, y), or stored nodata (NaN if there's no nodata value) where
+        that neighbor is off the map, for rows x_start:x_stop. Multiply
+        by elevation_scale for meters.
+
+        :param int x_start: first row.
+        :param int x_stop: row to stop at, defaults to the end of the map.
+        :return: tuple of 8 arrays of shape (x_stop - x_start, max_y + 1)
+        """
+        x_stop = self.max_x + 1 if x_stop is None else x_stop
+        rows = self._padded_rows(x_start, x_stop)
+        span_x = x_stop - x_start
+        span_y = self.max_y + 1
+        return tuple(rows[1 + dx:1 + dx + span_x, 1 + dy:1 + dy + span_y]
+                     for dx, dy in FULL_SHIFT_LIST)
+
+    def neighbor_stack(self,
+            x_start: Numpy_X = 0,
+            x_stop: Numpy_X | None = None
+        ) -> Tuple[NDArray, NDArray]:
+        """
+        Neighbor elevations for every pixel in rows x_start:x_stop.
+
+        :param int x_start: first row.
+        :param int x_stop: row to stop at, defaults to the end of the map.
+        :return: (elevations, inbounds) both of shape
+         (8, x_stop - x_start, max_y + 1). inbounds is False where the
+         neighbor is off the map.
+        """
+        x_stop = self.max_x + 1 if x_stop is None else x_stop
+        elevations = numpy.stack(self.neighbor_views(x_start, x_stop))
+        if self.elevation_scale != 1.0:
+            elevations = elevations * self.elevation_scale
+        xs = numpy.arange(x_start, x_stop)[None, :, None] + FULL_SHIFT_X[:, None, None]
+        ys = numpy.arange(self.max_y + 1)[None, None, :] + FULL_SHIFT_Y[:, None, None]
+        inbounds = ((xs >= 0) & (xs <= self.max_x)) & ((ys >= 0) & (ys <= self.max_y))
+        return elevations, inbounds
+
+    def neighbors_of(self,
+            xs: NDArray,
+            ys: NDArray
+        ) -> Tuple[NDArray, NDArray]:
+        """
+        Batched equivalent of iterateFull. Looks up the 8 neighbors of
+        every (xs[i], ys[i]) in FULL_SHIFT_LIST order.
+
+        :param xs: array of x coordinates.
+        :param ys: array of y coordinates.
+        :return: (elevations, inbounds) both of shape (N, 8).
+         Off map neighbors are nodata (NaN if there's no nodata value)
+         and False in inbounds.
+        """
+        xs = numpy.asarray(xs, dtype=numpy.intp).reshape(-1)
+        ys = numpy.asarray(ys, dtype=numpy.intp).reshape(-1)
+        neighbor_xs = xs[:, None] + FULL_SHIFT_X
+        neighbor_ys = ys[:, None] + FULL_SHIFT_Y
+        inbounds = ((neighbor_xs >= 0) & (neighbor_xs <= self.max_x) &
+                    (neighbor_ys >= 0) & (neighbor_ys <= self.max_y))
+        if not xs.size:
+            return numpy.empty((0, 8), dtype=numpy.float64), inbounds
+        x_start = int(xs.min())
+        rows = self._padded_rows(x_start, int(xs.max()) + 1)
+        elevations = rows[neighbor_xs - x_start + 1, neighbor_ys + 1]
+        if self.elevation_scale != 1.0:
+            elevations = elevations * self.elevation_scale
+        return elevations, inbounds
+
+    def reopen(self) -> None:
+        """
+        Reopen anything file backed. Called in forked worker processes,
+        which would otherwise share their parent's file handles.
+        In memory rasters have nothing to do.
+        """
+
+    def iter_row_bands(self,
+            band_rows: int | None = None,
+            x_start: Numpy_X = 0,
+            x_stop: Numpy_X | None = None
+        ) -> Generator[Tuple[Numpy_X, NDArray]]:
+        """
+        Generator returns the raster as consecutive bands of full rows,
+        top to bottom, as (x offset of first row, band array) tuples.
+        This lets callers walk the whole map without needing
+        the entire raster in memory at once.
+
+        :param int band_rows: number of rows per band. Defaults to the
+         entire map as a single band.
+        :param int x_start: first row.
+        :param int x_stop: row to stop at, defaults to the end of the map.
+        """
+        x_stop = self.max_x + 1 if x_stop is None else x_stop
+        band_rows = band_rows or max(x_stop - x_start, 1)
+        for x_offset in range(x_start, x_stop, band_rows):
+            yield x_offset, self.numpy_array[x_offset:min(x_offset + band_rows, x_stop)]
\ No newline at end of file
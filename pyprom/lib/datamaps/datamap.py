@@ -9,13 +9,14 @@ used to analyze the map.
 """
 from __future__ import annotations
 import logging
+from copy import copy
+from pathlib import Path
 
 from .base_datamap import BaseDataMap
 import numpy
 from osgeo import gdal
 from shapely.geometry import Polygon
-from pyprom.lib.util import checksum
-from numpy import array2string
+from pyprom.lib.fingerprint import fingerprint_array, cached_fingerprint
 
 from typing import TYPE_CHECKING, Self, Any, Tuple
 if TYPE_CHECKING:
@@ -27,6 +28,7 @@ if TYPE_CHECKING:
         Elevation,
         LatLon
     )
+    from numpy.typing import NDArray
 
 
 class DataMap(BaseDataMap):
@@ -48,16 +50,42 @@ class DataMap(BaseDataMap):
     def __init__(self,
         loader: GDALLoader,
         gdal_dataset: gdal.Dataset,
+        numpy_array: numpy.ndarray | None = None,
+        native_dtype: bool = False,
+        vertical_resolution: float | None = None,
     ) -> None:
+        """
+        :param loader: loader this DataMap was created from.
+        :param gdal_dataset: GDAL dataset to analyze.
+        :param numpy_array: raster band of gdal_dataset, if it's already
+         available (for instance memory mapped from the raster cache).
+         Otherwise the raster band is read from gdal_dataset.
+        :param bool native_dtype: keep integer rasters (SRTM for instance)
+         in their native integer dtype instead of converting to float32.
+        :param float vertical_resolution: quantize elevations to integer
+         multiples of this many meters. Elevations are stored as integers
+         and scaled back to meters by get() and the iterators, and nodata
+         is reported on the same grid.
+        """
+        if native_dtype and vertical_resolution:
+            raise ValueError("native_dtype and vertical_resolution can't be combined.")
         self.loader = loader
         self.gdal_dataset = gdal_dataset
+        self.native_dtype = native_dtype
+        self.vertical_resolution = vertical_resolution
         raster_band = self.gdal_dataset.GetRasterBand(1)
         self.nodata = raster_band.GetNoDataValue()
-        self.numpy_array = numpy.array(
-            raster_band.ReadAsArray(buf_type=gdal.GDT_Float32)
-        )
-        self.md5 = f'{checksum(loader.filename)}{hash(array2string(self.numpy_array))}'
+        # nodata as it's stored in numpy_array.
+        self.stored_nodata = self.nodata
+        if vertical_resolution:
+            self.elevation_scale = vertical_resolution
+        if numpy_array is None:
+            numpy_array = self._read_raster_band(raster_band)
+        self.numpy_array = self._to_storage(numpy_array)
         self.geotransform = self.gdal_dataset.GetGeoTransform()
+        # Fingerprinting reads the whole raster, so wait until asked.
+        self._md5 = None
+        self._overridden = False
 
         self.max_y = self.gdal_dataset.RasterXSize - 1 # longitude, or NUMPY_Y
         self.max_x = self.gdal_dataset.RasterYSize - 1 # latitude, or NUMPY_X
@@ -66,12 +94,77 @@ class DataMap(BaseDataMap):
         self._y_mapEdge = {0: True, self.max_y: True}
 
     @classmethod
-    def from_loader(cls, loader: GDALLoader) -> Self:
+    def from_loader(cls, loader: GDALLoader, **kwargs: Any) -> Self:
         """
         Creates DataMap from a GDALLoader
+
+        :param kwargs: native_dtype and vertical_resolution, see __init__
+        """
+        return cls(loader, loader.gdal_dataset,
+                   numpy_array=getattr(loader, 'numpy_array', None),
+                   **kwargs)
+
+    def _read_raster_band(self, raster_band: gdal.Band) -> numpy.ndarray:
+        """
+        Reads the entire raster band into memory.
+        ReadAsArray already hands us a fresh array, so don't copy it again.
+        """
+        if self.native_dtype:
+            numpy_array = raster_band.ReadAsArray()
+            if numpy_array.dtype.kind in 'iu':
+                return numpy_array
+            return numpy_array.astype(numpy.float32, copy=False)
+        return raster_band.ReadAsArray(buf_type=gdal.GDT_Float32)
+
+    def _to_storage(self, numpy_array: numpy.ndarray) -> numpy.ndarray:
+        """
+        Quantize numpy_array if we have a vertical_resolution.
+        """
+        if not self.vertical_resolution:
+            return numpy_array
+        numpy_array, self.stored_nodata = quantize(
+            numpy_array, self.nodata, self.vertical_resolution)
+        if self.stored_nodata is not None:
+            self.nodata = float(self.stored_nodata) * self.elevation_scale
+        return numpy_array
+
+    @property
+    def md5(self) -> str:
         """
-        return cls(loader, loader.gdal_dataset)
+        Fingerprint used to tie DomainMaps to this DataMap.
+        Computed on first use.
+        """
+        if self._md5 is None:
+            self._md5 = self._fingerprint()
+        return self._md5
 
+    def _fingerprint(self) -> str:
+        """
+        Produce the md5 used to tie DomainMaps to this DataMap.
+        If our loader has a cache directory, the fingerprint is recorded
+        in a sidecar there so later loads of the same file don't have to
+        hash the raster again.
+        """
+        cache_dir = getattr(self.loader, 'cache_dir', None)
+        if cache_dir is None or self._overridden:
+            return self._fingerprint_raster()
+        context = {
+            'datamap': type(self).__name__,
+            'shape': list(self.numpy_array.shape),
+            'dtype': str(self.numpy_array.dtype),
+            'geotransform': list(self.geotransform),
+            'options': getattr(self.loader, 'options', None),
+        }
+        return cached_fingerprint(Path(cache_dir) / 'fingerprints.json',
+                                  self.loader.filename,
+                                  context,
+                                  self._fingerprint_raster)
+
+    def _fingerprint_raster(self) -> str:
+        """
+        Hash the raster itself.
+        """
+        return fingerprint_array(self.numpy_array, self.geotransform)
 
     def xy_to_latlon(self, x: Numpy_X, y: Numpy_Y) -> LatLon:
         """
@@ -103,6 +196,107 @@ class DataMap(BaseDataMap):
         """
         return self.get(*self.latlong_to_xy(lat, lon))
 
+    def xys_to_latlons(self,
+            xs: NDArray,
+            ys: NDArray
+        ) -> Tuple[NDArray, NDArray]:
+        """
+        Vectorized xy_to_latlon. Convert arrays of numpy array indices
+        to WGS84(4326) coordinates.
+
+        :param xs: array of x coordinates.
+        :param ys: array of y coordinates.
+        :return: (latitudes, longitudes) as float64 arrays.
+        """
+        xs = numpy.asarray(xs, dtype=numpy.float64)
+        ys = numpy.asarray(ys, dtype=numpy.float64)
+        lons = self.geotransform[0] + ys * self.geotransform[1] + xs * self.geotransform[2]
+        lats = self.geotransform[3] + ys * self.geotransform[4] + xs * self.geotransform[5]
+        return lats, lons
+
+    def latlons_to_xys(self,
+            lats: NDArray,
+            lons: NDArray
+        ) -> Tuple[NDArray, NDArray]:
+        """
+        Vectorized latlong_to_xy. Convert arrays of WGS84(4326)
+        coordinates to numpy_array[x][y] indices. Like round(),
+        halves are rounded to even.
+
+        :param lats: array of latitudes.
+        :param lons: array of longitudes.
+        :return: (xs, ys) as integer arrays.
+        """
+        lats = numpy.asarray(lats, dtype=numpy.float64)
+        lons = numpy.asarray(lons, dtype=numpy.float64)
+        numpy_ys = numpy.rint((lons - self.geotransform[0]) / self.geotransform[1])
+        numpy_xs = numpy.rint((lats - self.geotransform[3]) / self.geotransform[5])
+        return numpy_xs.astype(numpy.intp), numpy_ys.astype(numpy.intp)
+
+    def get_many(self, xs: NDArray, ys: NDArray) -> NDArray:
+        """
+        Vectorized get.
+
+        :param xs: array of x coordinates.
+        :param ys: array of y coordinates.
+        :return: float64 array of elevations.
+        :raises: IndexError if any coordinate is off the map.
+        """
+        xs = numpy.asarray(xs, dtype=numpy.intp)
+        ys = numpy.asarray(ys, dtype=numpy.intp)
+        if ((xs < 0) | (xs > self.max_x) | (ys < 0) | (ys > self.max_y)).any():
+            raise IndexError("Coordinates are outside of this DataMap.")
+        return numpy.asarray(self.numpy_array[xs, ys], dtype=numpy.float64) * self.elevation_scale
+
+    def elevations(self,
+            lats: NDArray,
+            lons: NDArray,
+            bilinear: bool = False
+        ) -> NDArray:
+        """
+        Vectorized elevation. Returns the elevations at arrays of lat/longs
+        in Meters.
+
+        :param lats: array of latitudes in dotted decimal notation.
+        :param lons: array of longitudes in dotted decimal notation.
+        :param bool bilinear: interpolate between the 4 surrounding
+         points rather than taking the nearest one. Where any of those
+         points with a say in the result is nodata, the result is nodata.
+        :return: float64 array of elevations in meters.
+        :raises: IndexError if any coordinate is off the map.
+        """
+        if not bilinear:
+            return self.get_many(*self.latlons_to_xys(lats, lons))
+        lats = numpy.asarray(lats, dtype=numpy.float64)
+        lons = numpy.asarray(lons, dtype=numpy.float64)
+        fractional_ys = (lons - self.geotransform[0]) / self.geotransform[1]
+        fractional_xs = (lats - self.geotransform[3]) / self.geotransform[5]
+        # Clamp the upper left corner so the lower right stays on the map.
+        x0 = numpy.clip(numpy.floor(fractional_xs), 0, max(self.max_x - 1, 0)).astype(numpy.intp)
+        y0 = numpy.clip(numpy.floor(fractional_ys), 0, max(self.max_y - 1, 0)).astype(numpy.intp)
+        dx = fractional_xs - x0
+        dy = fractional_ys - y0
+        if ((dx < -0.5) | (dx > 1.5) | (dy < -0.5) | (dy > 1.5)).any():
+            raise IndexError("Coordinates are outside of this DataMap.")
+        dx = numpy.clip(dx, 0, 1)
+        dy = numpy.clip(dy, 0, 1)
+        x1 = numpy.minimum(x0 + 1, self.max_x)
+        y1 = numpy.minimum(y0 + 1, self.max_y)
+        corners = ((x0, y0, (1 - dx) * (1 - dy)),
+                   (x0, y1, (1 - dx) * dy),
+                   (x1, y0, dx * (1 - dy)),
+                   (x1, y1, dx * dy))
+        result = numpy.zeros(fractional_xs.shape, dtype=numpy.float64)
+        nodata = numpy.zeros(fractional_xs.shape, dtype=bool)
+        for xs, ys, weight in corners:
+            elevation = self.get_many(xs, ys)
+            if self.nodata is not None:
+                nodata |= (elevation == self.nodata) & (weight > 0)
+            result += numpy.where(weight > 0, elevation * weight, 0)
+        if self.nodata is not None:
+            result[nodata] = self.nodata
+        return result
+
     def subset(self, x: Numpy_X, y: Numpy_Y, x_span: int, y_span: int) -> Self:
         """
         Produce a subset of this datamap.
@@ -110,22 +304,47 @@ class DataMap(BaseDataMap):
         so, in this context:
         X = LONGITUDE
         Y = LATITUDE 
+
+        The subset is a view, its numpy_array is a slice of ours, so
+        nothing is read or copied.
+
+        :raises: ValueError if the subset doesn't fit within this DataMap.
         """
+        if (x < 0 or y < 0 or x_span < 1 or y_span < 1 or
+                x + x_span > self.max_x + 1 or y + y_span > self.max_y + 1):
+            raise ValueError(f"Subset ({x}, {y}) spanning ({x_span}, {y_span}) "
+                             f"doesn't fit in ({self.max_x + 1}, {self.max_y + 1})")
+        view = copy(self)
+        view.numpy_array = self._subset_array(x, y, x_span, y_span)
 
         # remember, GDAL XY is cartesian, unlike a numpy array
-        x_offset = y
-        y_offset = x
-        x_size = y_span
-        y_size  = x_span
-
-        dataset = gdal.Translate(
+        view.gdal_dataset = gdal.Translate(
             '',
             self.gdal_dataset,
-            srcWin=[x_offset, y_offset, x_size, y_size],
-            format='MEM'
+            srcWin=[y, x, y_span, x_span],
+            format='VRT'
         )
+        # Shift the origin the same way gdal.Translate does.
+        gt = self.geotransform
+        view.geotransform = (gt[0] + (y * gt[1] + x * gt[2]), gt[1], gt[2],
+                             gt[3] + (y * gt[4] + x * gt[5]), gt[4], gt[5])
+        view.max_x = x_span - 1
+        view.max_y = y_span - 1
+        view._x_mapEdge = {0: True, view.max_x: True}
+        view._y_mapEdge = {0: True, view.max_y: True}
+        # Anything derived from the raster is our own business.
+        view._padded_array = None
+        view._md5 = None
+        return view
 
-        return DataMap(self.loader, dataset)
+    def _subset_array(self,
+            x: Numpy_X, y: Numpy_Y,
+            x_span: int, y_span: int
+        ) -> numpy.ndarray:
+        """
+        The part of numpy_array a subset covers.
+        """
+        return self.numpy_array[x:x + x_span, y:y + y_span]
 
     def point_geom(self, x: Numpy_X, y: Numpy_Y) -> Polygon:
         """
@@ -165,4 +384,88 @@ class DataMap(BaseDataMap):
         (useful for testing)
         """
         assert numpy_array.shape == self.numpy_array.shape
-        self.numpy_array = numpy_array
\ No newline at end of file
+        self.numpy_array = numpy_array
+        self._padded_array = None
+        self._md5 = None
+        self._overridden = True
+
+# Rows quantized at a time, to bound the float64 scratch space.
+QUANTIZE_BAND_ROWS = 1024
+
+
+def quantize(
+        numpy_array: NDArray,
+        nodata: float | None,
+        vertical_resolution: float,
+        dtype: numpy.dtype | None = None,
+    ) -> Tuple[NDArray, int | None]:
+    """
+    Quantize elevations to integer multiples of vertical_resolution.
+
+    :param numpy_array: elevations in meters.
+    :param nodata: nodata value of numpy_array.
+    :param float vertical_resolution: size of a quantization step in meters.
+    :param dtype: integer dtype to produce. Defaults to int16 if
+     everything fits, otherwise int32.
+    :return: (quantized array, nodata value in the quantized array)
+    :raises: ValueError if the elevations don't fit in dtype.
+    """
+    def bands():
+        for x_offset in range(0, numpy_array.shape[0], QUANTIZE_BAND_ROWS):
+            band = numpy.asarray(
+                numpy_array[x_offset:x_offset + QUANTIZE_BAND_ROWS],
+                dtype=numpy.float64)
+            steps = numpy.rint(band / vertical_resolution)
+            if nodata is None:
+                mask = numpy.zeros(band.shape, dtype=bool)
+            elif numpy.isnan(nodata):
+                mask = numpy.isnan(band)
+            else:
+                mask = band == nodata
+            yield x_offset, steps, mask
+
+    if dtype is None:
+        low, high = 0, 0
+        for _, steps, mask in bands():
+            valid = steps[~mask]
+            if valid.size:
+                low = min(low, valid.min())
+                high = max(high, valid.max())
+        dtype = numpy.int32
+        if numpy.iinfo(numpy.int16).min < low and high <= numpy.iinfo(numpy.int16).max:
+            dtype = numpy.int16
+    dtype = numpy.dtype(dtype)
+    info = numpy.iinfo(dtype)
+
+    stored_nodata = quantized_nodata(nodata, vertical_resolution, dtype)
+    quantized = numpy.empty(numpy_array.shape, dtype=dtype)
+    for x_offset, steps, mask in bands():
+        valid = steps[~mask]
+        if valid.size and (valid.min() <= info.min or valid.max() > info.max):
+            raise ValueError(f"Elevations don't fit in {dtype} at a "
+                             f"vertical resolution of {vertical_resolution}")
+        if stored_nodata is not None:
+            steps[mask] = stored_nodata
+        quantized[x_offset:x_offset + steps.shape[0]] = steps
+    return quantized, stored_nodata
+
+
+def quantized_nodata(
+        nodata: float | None,
+        vertical_resolution: float,
+        dtype: numpy.dtype
+    ) -> int | None:
+    """
+    The nodata value on a quantized grid. NaN, or anything which doesn't
+    fit in dtype, becomes the smallest value of dtype, which quantize()
+    keeps clear of real elevations.
+    """
+    if nodata is None:
+        return None
+    info = numpy.iinfo(dtype)
+    if numpy.isnan(nodata):
+        return int(info.min)
+    stored = int(round(nodata / vertical_resolution))
+    if not info.min <= stored <= info.max:
+        return int(info.min)
+    return stored
@@ -0,0 +1,575 @@
+"""
+pyProm: Copyright Marc Howes 2016 - 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains a DataMap which reads raster data from GDAL on demand,
+one block at a time, instead of loading the entire band into memory.
+"""
+from __future__ import annotations
+
+import os
+from collections import OrderedDict
+
+import numpy
+from osgeo import gdal
+
+from .datamap import DataMap, quantize, quantized_nodata
+from pyprom.lib.fingerprint import fingerprint
+
+from typing import TYPE_CHECKING, Any, Callable, Self, Tuple
+if TYPE_CHECKING:
+    from pyprom.lib.loaders.gdal_loader import GDALLoader
+    from pyprom._typing.type_hints import Numpy_X, Numpy_Y, Elevation
+
+# 256 MiB of cached blocks unless told otherwise.
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+# GDAL blocks are often a single scanline. We group native blocks together
+# until a block is at least this many pixels along each axis.
+MIN_BLOCK_EDGE = 256
+
+
+class BlockCache:
+    """
+    BlockCache is a bounded, least recently used cache of raster blocks
+    read from a GDAL raster band.
+
+    It can be indexed like the numpy array it stands in for, that is
+    `cache[x, y]` returns a single value and `cache[x0:x1, y0:y1]` returns
+    a numpy array for that window. Blocks are fetched through
+    `ReadAsArray(xoff, yoff, ...)` as they are needed and the least
+    recently used blocks are evicted once the cache grows beyond
+    `memory_budget` bytes.
+    """
+
+    def __init__(self,
+            raster_band: gdal.Band,
+            block_shape: Tuple[int, int],
+            memory_budget: int = DEFAULT_MEMORY_BUDGET,
+            buf_type: int | None = gdal.GDT_Float32,
+            convert: Callable[[numpy.ndarray], numpy.ndarray] | None = None,
+        ) -> None:
+        """
+        :param raster_band: GDAL raster band to read from.
+        :param block_shape: (rows, columns) of a cached block, in numpy
+         orientation.
+        :param int memory_budget: maximum bytes of cached blocks.
+        :param buf_type: GDAL data type to read blocks as, None for
+         the band's own data type.
+        :param convert: applied to each block as it's read, for instance
+         to quantize it.
+        """
+        self.raster_band = raster_band
+        self.shape = (raster_band.YSize, raster_band.XSize)
+        self.block_shape = block_shape
+        self.memory_budget = memory_budget
+        self.buf_type = buf_type
+        self.convert = convert
+        # Find out what our blocks look like from the corner pixel.
+        self.dtype = self._read_window(0, 0, 1, 1).dtype
+        self.blocks = OrderedDict()
+        self.nbytes = 0
+        self._last_key = None
+        self._last_block = None
+
+    @property
+    def size(self) -> int:
+        """
+        :return: number of pixels in the raster.
+        """
+        return self.shape[0] * self.shape[1]
+
+    def block(self, block_x: int, block_y: int) -> numpy.ndarray:
+        """
+        Returns a block, reading it from GDAL if it isn't cached.
+
+        :param int block_x: block row index.
+        :param int block_y: block column index.
+        :return: numpy array of the block.
+        """
+        key = (block_x, block_y)
+        # Walks and neighbor lookups hammer the same block, shortcut that.
+        if key == self._last_key:
+            return self._last_block
+        block = self.blocks.get(key)
+        if block is None:
+            block = self._read_block(block_x, block_y)
+            self.blocks[key] = block
+            self.nbytes += block.nbytes
+            self._evict()
+        else:
+            self.blocks.move_to_end(key)
+        self._last_key = key
+        self._last_block = block
+        return block
+
+    def read_window(self,
+            x_start: int, x_stop: int,
+            y_start: int, y_stop: int
+        ) -> numpy.ndarray:
+        """
+        Assembles a window out of cached blocks.
+
+        :return: numpy array of shape (x_stop - x_start, y_stop - y_start)
+        """
+        rows, cols = self.block_shape
+        window = numpy.empty((max(x_stop - x_start, 0),
+                              max(y_stop - y_start, 0)), dtype=self.dtype)
+        if not window.size:
+            return window
+        for block_x in range(x_start // rows, (x_stop - 1) // rows + 1):
+            bx0 = block_x * rows
+            ax0 = max(x_start, bx0)
+            ax1 = min(x_stop, bx0 + rows)
+            for block_y in range(y_start // cols, (y_stop - 1) // cols + 1):
+                by0 = block_y * cols
+                ay0 = max(y_start, by0)
+                ay1 = min(y_stop, by0 + cols)
+                window[ax0 - x_start:ax1 - x_start, ay0 - y_start:ay1 - y_start] = \
+                    self.block(block_x, block_y)[ax0 - bx0:ax1 - bx0, ay0 - by0:ay1 - by0]
+        return window
+
+    def take(self, xs: numpy.ndarray, ys: numpy.ndarray) -> numpy.ndarray:
+        """
+        Gather the values at arrays of coordinates, visiting
+        each block they fall in once.
+
+        :param xs: array of x coordinates.
+        :param ys: array of y coordinates.
+        :return: numpy array of values, shaped like xs.
+        """
+        xs, ys = numpy.broadcast_arrays(numpy.asarray(xs, dtype=numpy.intp),
+                                        numpy.asarray(ys, dtype=numpy.intp))
+        xs = numpy.where(xs < 0, xs + self.shape[0], xs)
+        ys = numpy.where(ys < 0, ys + self.shape[1], ys)
+        if ((xs < 0) | (xs >= self.shape[0]) |
+                (ys < 0) | (ys >= self.shape[1])).any():
+            raise IndexError(f"Coordinates are out of bounds for {self.shape}")
+        rows, cols = self.block_shape
+        block_xs, local_xs = numpy.divmod(xs.ravel(), rows)
+        block_ys, local_ys = numpy.divmod(ys.ravel(), cols)
+        block_ids = block_xs * (-(-self.shape[1] // cols)) + block_ys
+        values = numpy.empty(xs.size, dtype=self.dtype)
+        order = numpy.argsort(block_ids, kind='stable')
+        _, starts = numpy.unique(block_ids[order], return_index=True)
+        stops = numpy.append(starts[1:], order.size)
+        for start, stop in zip(starts, stops):
+            members = order[start:stop]
+            block = self.block(int(block_xs[members[0]]), int(block_ys[members[0]]))
+            values[members] = block[local_xs[members], local_ys[members]]
+        return values.reshape(xs.shape)
+
+    def window(self,
+            x_offset: int, y_offset: int,
+            rows: int, cols: int
+        ) -> BlockCacheWindow:
+        """
+        A view of part of this cache, which shares our cached blocks.
+
+        :param int x_offset: first row of the window.
+        :param int y_offset: first column of the window.
+        :param int rows: rows in the window.
+        :param int cols: columns in the window.
+        """
+        return BlockCacheWindow(self, x_offset, y_offset, (rows, cols))
+
+    def clear(self) -> None:
+        """
+        Drop all cached blocks.
+        """
+        self.blocks.clear()
+        self.nbytes = 0
+        self._last_key = None
+        self._last_block = None
+
+    def reopen(self) -> None:
+        """
+        Reopen the raster band we read from, if it's file backed.
+        Forked processes share their parent's GDAL file handles, and
+        with them file offsets, so each needs its own.
+        """
+        dataset = self.raster_band.GetDataset()
+        description = dataset.GetDescription()
+        if not description or not os.path.exists(description):
+            return
+        band_index = self.raster_band.GetBand()
+        # Hang on to the dataset, the band is no good without it.
+        self._dataset = gdal.Open(description)
+        self.raster_band = self._dataset.GetRasterBand(band_index)
+
+    def _read_block(self, block_x: int, block_y: int) -> numpy.ndarray:
+        """
+        Read a single block from GDAL. Remember, GDAL XY is cartesian,
+        unlike a numpy array.
+        """
+        rows, cols = self.block_shape
+        x_offset = block_x * rows
+        y_offset = block_y * cols
+        return self._read_window(x_offset, y_offset,
+                                 min(rows, self.shape[0] - x_offset),
+                                 min(cols, self.shape[1] - y_offset))
+
+    def _read_window(self,
+            x_offset: int, y_offset: int,
+            rows: int, cols: int
+        ) -> numpy.ndarray:
+        """
+        Read and convert a window from GDAL.
+        """
+        window = self.raster_band.ReadAsArray(
+            xoff=y_offset,
+            yoff=x_offset,
+            win_xsize=cols,
+            win_ysize=rows,
+            buf_type=self.buf_type
+        )
+        if self.convert is not None:
+            window = self.convert(window)
+        return window
+
+    def _evict(self) -> None:
+        """
+        Evict least recently used blocks until we're within budget.
+        The newest block always stays.
+        """
+        while self.nbytes > self.memory_budget and len(self.blocks) > 1:
+            key, block = self.blocks.popitem(last=False)
+            self.nbytes -= block.nbytes
+            if key == self._last_key:
+                self._last_key = None
+                self._last_block = None
+
+    def __getitem__(self, key) -> Elevation | numpy.ndarray:
+        """
+        Gives BlockCache numpy like get capabilities for [x, y],
+        [x0:x1, y0:y1] and [xs_array, ys_array] style keys.
+        """
+        if not isinstance(key, tuple):
+            key = (key, slice(None))
+        x, y = key
+        if isinstance(x, (numpy.ndarray, list)) or isinstance(y, (numpy.ndarray, list)):
+            return self.take(x, y)
+        if isinstance(x, slice) or isinstance(y, slice):
+            x_start, x_stop = _bounds(x, self.shape[0])
+            y_start, y_stop = _bounds(y, self.shape[1])
+            window = self.read_window(x_start, x_stop, y_start, y_stop)
+            # Mirror numpy and drop any axis indexed by an integer.
+            if not isinstance(x, slice):
+                return window[0]
+            if not isinstance(y, slice):
+                return window[:, 0]
+            return window
+        x = int(x)
+        y = int(y)
+        if x < 0:
+            x += self.shape[0]
+        if y < 0:
+            y += self.shape[1]
+        if not (0 <= x < self.shape[0] and 0 <= y < self.shape[1]):
+            raise IndexError(f"({x}, {y}) is out of bounds for {self.shape}")
+        return self._point(x, y)
+
+    def _point(self, x: int, y: int) -> Elevation:
+        """
+        Value at an in bounds x, y.
+        """
+        rows, cols = self.block_shape
+        block_x, local_x = divmod(x, rows)
+        block_y, local_y = divmod(y, cols)
+        return self.block(block_x, block_y)[local_x, local_y]
+
+    def __repr__(self) -> str:
+        """
+        :return: String representation of this object
+        """
+        return "<BlockCache> shape {} block shape {} cached {} blocks {} bytes".format(
+            self.shape, self.block_shape, len(self.blocks), self.nbytes)
+
+    __str__ = __repr__
+
+
+class BlockCacheWindow(BlockCache):
+    """
+    BlockCacheWindow is a rectangular window onto a :class:`BlockCache`.
+    It is indexed relative to its own origin, and reads through (and
+    shares the budget of) the BlockCache it came from.
+    """
+
+    def __init__(self,
+            cache: BlockCache,
+            x_offset: int,
+            y_offset: int,
+            shape: Tuple[int, int]
+        ) -> None:
+        """
+        :param cache: BlockCache to read through.
+        :param int x_offset: row of cache our origin is at.
+        :param int y_offset: column of cache our origin is at.
+        :param shape: (rows, columns) of the window.
+        """
+        self.cache = cache
+        self.x_offset = x_offset
+        self.y_offset = y_offset
+        self.shape = shape
+        self.dtype = cache.dtype
+        self.block_shape = cache.block_shape
+
+    @property
+    def nbytes(self) -> int:
+        """
+        :return: bytes cached by the underlying BlockCache.
+        """
+        return self.cache.nbytes
+
+    def block(self, block_x: int, block_y: int) -> numpy.ndarray:
+        """
+        Blocks are those of the underlying BlockCache.
+        """
+        return self.cache.block(block_x, block_y)
+
+    def reopen(self) -> None:
+        """
+        Reopen the underlying BlockCache.
+        """
+        self.cache.reopen()
+
+    def read_window(self,
+            x_start: int, x_stop: int,
+            y_start: int, y_stop: int
+        ) -> numpy.ndarray:
+        """
+        Assembles a window, relative to our origin, out of cached blocks.
+        """
+        return self.cache.read_window(x_start + self.x_offset,
+                                      x_stop + self.x_offset,
+                                      y_start + self.y_offset,
+                                      y_stop + self.y_offset)
+
+    def take(self, xs: numpy.ndarray, ys: numpy.ndarray) -> numpy.ndarray:
+        """
+        Gather the values at arrays of coordinates relative to our origin.
+        """
+        xs, ys = numpy.broadcast_arrays(numpy.asarray(xs, dtype=numpy.intp),
+                                        numpy.asarray(ys, dtype=numpy.intp))
+        xs = numpy.where(xs < 0, xs + self.shape[0], xs)
+        ys = numpy.where(ys < 0, ys + self.shape[1], ys)
+        if ((xs < 0) | (xs >= self.shape[0]) |
+                (ys < 0) | (ys >= self.shape[1])).any():
+            raise IndexError(f"Coordinates are out of bounds for {self.shape}")
+        return self.cache.take(xs + self.x_offset, ys + self.y_offset)
+
+    def _point(self, x: int, y: int) -> Elevation:
+        """
+        Value at an in bounds x, y relative to our origin.
+        """
+        return self.cache._point(x + self.x_offset, y + self.y_offset)
+
+    def window(self,
+            x_offset: int, y_offset: int,
+            rows: int, cols: int
+        ) -> BlockCacheWindow:
+        """
+        A window of this window.
+        """
+        return BlockCacheWindow(self.cache,
+                                self.x_offset + x_offset,
+                                self.y_offset + y_offset,
+                                (rows, cols))
+
+    def clear(self) -> None:
+        """
+        Drop all blocks cached by the underlying BlockCache.
+        """
+        self.cache.clear()
+
+    def __repr__(self) -> str:
+        """
+        :return: String representation of this object
+        """
+        return "<BlockCacheWindow> origin {} shape {} of {}".format(
+            (self.x_offset, self.y_offset), self.shape, self.cache)
+
+    __str__ = __repr__
+
+
+class WindowedDataMap(DataMap):
+    """
+    WindowedDataMap is a :class:`pyprom.lib.datamaps.datamap.DataMap` which
+    never loads the whole raster band. Raster data is read from GDAL
+    block by block as it is needed and held in a bounded
+    :class:`BlockCache`, so rasters larger than memory can be analyzed.
+
+    `numpy_array` is the :class:`BlockCache`, which supports the
+    [x, y] and [x0:x1, y0:y1] indexing used throughout pyProm.
+    """
+    numpy_array: BlockCache
+
+    def __init__(self,
+        loader: GDALLoader,
+        gdal_dataset: gdal.Dataset,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+        block_shape: Tuple[int, int] | None = None,
+        native_dtype: bool = False,
+        vertical_resolution: float | None = None,
+    ) -> None:
+        """
+        :param loader: loader this DataMap was created from.
+        :param gdal_dataset: GDAL dataset to read from.
+        :param int memory_budget: maximum bytes of cached raster blocks.
+        :param block_shape: (rows, columns) of cached blocks. Defaults to
+         the band's native block size, grouped so each side is at least
+         MIN_BLOCK_EDGE pixels.
+        :param bool native_dtype: keep integer rasters in their native
+         integer dtype instead of converting to float32.
+        :param float vertical_resolution: quantize elevations to int32
+         multiples of this many meters, block by block.
+        """
+        self.memory_budget = memory_budget
+        self.block_shape = block_shape
+        super().__init__(loader, gdal_dataset,
+                         native_dtype=native_dtype,
+                         vertical_resolution=vertical_resolution)
+
+    @classmethod
+    def from_loader(cls,
+            loader: GDALLoader,
+            memory_budget: int = DEFAULT_MEMORY_BUDGET,
+            block_shape: Tuple[int, int] | None = None,
+            **kwargs: Any
+        ) -> Self:
+        """
+        Creates WindowedDataMap from a GDALLoader
+
+        :param kwargs: native_dtype and vertical_resolution, see __init__
+        """
+        return cls(loader, loader.gdal_dataset,
+                   memory_budget=memory_budget, block_shape=block_shape,
+                   **kwargs)
+
+    def _read_raster_band(self, raster_band: gdal.Band) -> BlockCache:
+        """
+        Rather than reading the band, wrap it in a BlockCache.
+        """
+        block_shape = self.block_shape or block_aligned_shape(raster_band)
+        self.block_shape = block_shape
+        buf_type = gdal.GDT_Float32
+        convert = None
+        if self.native_dtype:
+            buf_type = None
+            convert = _native_or_float32
+        elif self.vertical_resolution:
+            # Every block has to agree on a dtype, so no int16 here.
+            self.stored_nodata = quantized_nodata(
+                self.nodata, self.vertical_resolution, numpy.int32)
+            # _to_storage puts self.nodata on the quantized grid, blocks
+            # still hold the source nodata.
+            source_nodata = self.nodata
+            vertical_resolution = self.vertical_resolution
+
+            def convert(block):
+                return quantize(block, source_nodata,
+                                vertical_resolution, numpy.int32)[0]
+        return BlockCache(raster_band, block_shape, self.memory_budget,
+                          buf_type=buf_type, convert=convert)
+
+    def _to_storage(self, numpy_array: BlockCache) -> BlockCache:
+        """
+        Blocks are quantized as they're read, all that's left is
+        putting nodata on the quantized grid.
+        """
+        if self.vertical_resolution and self.stored_nodata is not None:
+            self.nodata = float(self.stored_nodata) * self.elevation_scale
+        return numpy_array
+
+    def reopen(self) -> None:
+        """
+        Reopen our raster band, see BlockCache.reopen.
+        """
+        self.numpy_array.reopen()
+
+    def _fingerprint_raster(self) -> str:
+        """
+        Hash the raster one band of blocks at a time. This matches
+        the fingerprint of a DataMap over the same raster.
+        """
+        return fingerprint(self.numpy_array.shape,
+                           self.numpy_array.dtype,
+                           self.geotransform,
+                           (band for _, band in self.iter_row_bands()))
+
+    def _padded_rows(self, x_start: Numpy_X, x_stop: Numpy_X) -> numpy.ndarray:
+        """
+        Read rows x_start - 1 through x_stop from the block cache and pad
+        them, rather than padding the whole raster.
+        """
+        window = self.numpy_array[max(x_start - 1, 0):min(x_stop + 1, self.max_x + 1), :]
+        rows = self._pad(window)
+        # Trim the padding rows which aren't off the edge of the map.
+        top = 0 if x_start == 0 else 1
+        bottom = rows.shape[0] - (0 if x_stop > self.max_x else 1)
+        return rows[top:bottom]
+
+    def iter_row_bands(self,
+            band_rows: int | None = None,
+            x_start: Numpy_X = 0,
+            x_stop: Numpy_X | None = None
+        ):
+        """
+        Generator returns the raster as consecutive bands of full rows.
+        Defaults to one row of blocks per band.
+
+        :param int band_rows: number of rows per band.
+        :param int x_start: first row.
+        :param int x_stop: row to stop at, defaults to the end of the map.
+        """
+        return super().iter_row_bands(band_rows or self.block_shape[0],
+                                      x_start, x_stop)
+
+    def _subset_array(self,
+            x: Numpy_X, y: Numpy_Y,
+            x_span: int, y_span: int
+        ) -> BlockCacheWindow:
+        """
+        A window onto our block cache, so subsets share cached blocks.
+        """
+        return self.numpy_array.window(x, y, x_span, y_span)
+
+
+def _native_or_float32(block: numpy.ndarray) -> numpy.ndarray:
+    """
+    Keep integer blocks as they are, anything else becomes float32.
+    """
+    if block.dtype.kind in 'iu':
+        return block
+    return block.astype(numpy.float32, copy=False)
+
+
+def block_aligned_shape(raster_band: gdal.Band) -> Tuple[int, int]:
+    """
+    Produce a numpy oriented (rows, columns) block shape which is a
+    multiple of the band's native GDAL block size, and at least
+    MIN_BLOCK_EDGE on each side (unless the raster is smaller than that).
+
+    :param raster_band: GDAL raster band.
+    :return: (rows, columns)
+    """
+    native_cols, native_rows = raster_band.GetBlockSize()
+    rows = native_rows * max(1, -(-MIN_BLOCK_EDGE // native_rows))
+    cols = native_cols * max(1, -(-MIN_BLOCK_EDGE // native_cols))
+    return min(rows, raster_band.YSize), min(cols, raster_band.XSize)
+
+
+def _bounds(index: int | slice, length: int) -> Tuple[int, int]:
+    """
+    Convert a slice or an integer index into (start, stop) bounds.
+    """
+    if isinstance(index, slice):
+        start, stop, step = index.indices(length)
+        if step != 1:
+            raise IndexError("BlockCache does not support stepped slices.")
+        return start, max(start, stop)
+    index = int(index)
+    if index < 0:
+        index += length
+    return index, index + 1
@@ -0,0 +1,205 @@
+"""
+pyProm: Copyright Marc Howes 2016 - 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains an on disk cache of feature discovery (and walk)
+results, so iterating on later stages doesn't mean rediscovering the
+features of every tile each time.
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+import cbor
+
+from pyprom import version_info
+from pyprom.lib.constants import DOMAIN_EXTENSION
+
+from typing import Any, List
+
+# Bump this whenever discovery or the walk change in a way which would
+# produce different results, so stale entries are ignored.
+DISCOVERY_CACHE_VERSION = 2
+
+# Stages of DomainMap.run() which can be cached.
+DISCOVERY = 'discovery'
+WALK = 'walk'
+
+# Temporary files left by a failed or crashed store() are removed once
+# they're this many seconds old, so a write in progress is left alone.
+STALE_TMP_AGE = 60 * 60
+
+
+def discovery_cache_key(fingerprint: str, stage: str, **options: Any) -> str:
+    """
+    Produce the key for a stage of results. The key covers the datamap
+    fingerprint, the stage, whatever options affect its results, the
+    pyProm version and the cache version.
+
+    :param str fingerprint: fingerprint (md5) of the datamap.
+    :param str stage: DISCOVERY or WALK.
+    :param options: options which affect the results of stage.
+    :return: hex digest key.
+    """
+    identity = {
+        'fingerprint': fingerprint,
+        'stage': stage,
+        'version': DISCOVERY_CACHE_VERSION,
+        'pyprom': list(version_info),
+        'options': {k: options[k] for k in sorted(options)},
+    }
+    return hashlib.md5(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+class DiscoveryCache:
+    """
+    DiscoveryCache stores the results of
+    :meth:`pyprom.domain_map.DomainMap.run` stages in `cache_dir`.
+
+    Each entry is `<stage>-<key>.dom`, the gzipped cbor dict
+    representation of a :class:`pyprom.domain_map.DomainMap` as it was
+    after that stage, the same format as
+    :meth:`pyprom.domain_map.DomainMap.write`.
+
+    Entries are evicted, least recently used first, once there are more
+    than `max_bytes` of them, and once they haven't been used for
+    `max_age` seconds. Failing to read or write an entry is not an error,
+    the stage is just run.
+    """
+
+    def __init__(self,
+            cache_dir: str | Path,
+            max_bytes: int | None = None,
+            max_age: float | None = None,
+            walks: bool = False
+        ) -> None:
+        """
+        :param cache_dir: directory to keep cached results in.
+         It's created if it doesn't exist.
+        :param int max_bytes: evict entries beyond this many bytes.
+         None for no limit.
+        :param float max_age: evict entries not used in this many seconds.
+         None for no limit.
+        :param bool walks: cache walk results as well as discovery.
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.walks = walks
+        self.logger = logging.getLogger('{}'.format(__name__))
+
+    def path(self, stage: str, key: str) -> Path:
+        """
+        :param str stage: DISCOVERY or WALK.
+        :param str key: cache key.
+        :return: path of the entry for key.
+        """
+        return self.cache_dir / f'{stage}-{key}{DOMAIN_EXTENSION}'
+
+    def entries(self) -> List[Path]:
+        """
+        :return: paths of all entries, least recently used first.
+        """
+        entries = []
+        for path in self.cache_dir.glob(f'*{DOMAIN_EXTENSION}'):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        return [path for _, path in sorted(entries)]
+
+    def load(self, stage: str, key: str) -> dict | None:
+        """
+        Load a cached stage, and mark it used.
+
+        :param str stage: DISCOVERY or WALK.
+        :param str key: cache key.
+        :return: dict representation of a DomainMap, or None if
+         there is no valid entry for key.
+        """
+        path = self.path(stage, key)
+        try:
+            with gzip.open(path, 'rb') as incoming:
+                domainDict = cbor.loads(incoming.read())
+            os.utime(path)
+        except (OSError, EOFError, ValueError):
+            return None
+        if domainDict.get('cache_key') != key:
+            return None
+        self.logger.info("Loaded {} from {}".format(stage, path))
+        return domainDict
+
+    def store(self, stage: str, key: str, domainDict: dict) -> None:
+        """
+        Write a stage into the cache, then evict whatever no longer fits.
+
+        :param str stage: DISCOVERY or WALK.
+        :param str key: cache key.
+        :param dict domainDict: dict representation of a DomainMap.
+        """
+        path = self.path(stage, key)
+        domainDict = dict(domainDict, cache_key=key)
+        # Write to a temporary file and move it into place, so a crash
+        # or a concurrent writer never leaves a half written entry.
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            with gzip.open(tmp, 'wb', 5) as outgoing:
+                outgoing.write(cbor.dumps(domainDict))
+            os.replace(tmp, path)
+        except OSError:
+            self.logger.warning("Could not cache {} to {}".format(stage, path))
+            return
+        finally:
+            # Only still there if the write or the move failed.
+            self._remove(tmp)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Remove entries older than max_age, then the least recently used
+        entries until those left fit in max_bytes. Stale temporary files
+        from failed writes are removed as well.
+        """
+        now = time.time()
+        for path in self.cache_dir.glob(f'*{DOMAIN_EXTENSION}.*.tmp'):
+            try:
+                if now - path.stat().st_mtime > STALE_TMP_AGE:
+                    self._remove(path)
+            except OSError:
+                continue
+        sized = []
+        for path in self.entries():
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self.max_age is not None and now - stat.st_mtime > self.max_age:
+                self._remove(path)
+                continue
+            sized.append((path, stat.st_size))
+        if self.max_bytes is None:
+            return
+        total = sum(size for _, size in sized)
+        for path, size in sized:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    def _remove(self, path: Path) -> None:
+        """
+        Remove an entry, it's fine if someone else got to it first.
+        """
+        try:
+            path.unlink()
+        except OSError:
+            pass
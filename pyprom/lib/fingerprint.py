@@ -0,0 +1,159 @@
+"""
+pyProm: Copyright Marc Howes 2016 - 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains functions for fingerprinting raster data. A fingerprint
+is a stable digest of a raster's shape, dtype, geotransform and pixels,
+which ties saved results (DomainMaps) to the raster they came from.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy
+
+from typing import Any, Callable, Iterable, Tuple
+
+# Bump this if the fingerprint layout changes.
+FINGERPRINT_VERSION = 1
+
+# Bytes handed to the hash at a time.
+CHUNK_BYTES = 16 * 1024 * 1024
+
+
+def fingerprint(
+        shape: Tuple[int, ...],
+        dtype: numpy.dtype,
+        geotransform: Iterable[float] | None,
+        bands: Iterable[numpy.ndarray],
+        hash_factory: Callable = hashlib.md5,
+    ) -> str:
+    """
+    Stream a raster through a hash. The raster is provided as consecutive
+    bands of rows so that rasters which aren't in memory can be hashed
+    one band at a time.
+
+    The digest covers a header of shape, dtype and geotransform, followed
+    by the raw pixel buffer in row major order. Contiguous bands are
+    hashed zero copy through a memoryview.
+
+    :param shape: shape of the whole raster.
+    :param dtype: dtype of the raster.
+    :param geotransform: GDAL geotransform of the raster.
+    :param bands: iterable of row bands which make up the raster.
+    :param hash_factory: factory for producing hash
+    :return: hex digest
+    """
+    h = hash_factory()
+    h.update(_header(shape, dtype, geotransform).encode())
+    dtype = numpy.dtype(dtype)
+    for band in bands:
+        _update(h, numpy.asarray(band, dtype=dtype))
+    return h.hexdigest()
+
+
+def fingerprint_array(
+        numpy_array: numpy.ndarray,
+        geotransform: Iterable[float] | None = None,
+        hash_factory: Callable = hashlib.md5,
+    ) -> str:
+    """
+    Fingerprint an in memory array.
+
+    :param numpy_array: array to fingerprint.
+    :param geotransform: GDAL geotransform of the array.
+    :param hash_factory: factory for producing hash
+    :return: hex digest
+    """
+    return fingerprint(numpy_array.shape, numpy_array.dtype, geotransform,
+                       [numpy_array], hash_factory)
+
+
+def cached_fingerprint(
+        sidecar: str | Path,
+        source: str | Path,
+        context: dict,
+        compute: Callable[[], str],
+    ) -> str:
+    """
+    Look up a fingerprint in a json sidecar file, computing and recording
+    it if it isn't there. Entries are keyed by `context` together with
+    the size and modification time of `source`, so touching the source
+    invalidates them. Failing to read or write the sidecar is not an
+    error, we just compute the fingerprint.
+
+    :param sidecar: path of the sidecar file.
+    :param source: file the fingerprinted raster was loaded from.
+    :param dict context: anything else which identifies the raster,
+     such as shape, dtype, geotransform and loader options.
+    :param compute: callable producing the fingerprint on a miss.
+    :return: hex digest
+    """
+    sidecar = Path(sidecar)
+    try:
+        stat = os.stat(source)
+    except OSError:
+        return compute()
+    key = json.dumps({
+        'version': FINGERPRINT_VERSION,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'context': context,
+    }, sort_keys=True, default=str)
+    try:
+        with open(sidecar) as f:
+            entries = json.load(f)
+    except (OSError, ValueError):
+        entries = {}
+    digest = entries.get(key)
+    if digest:
+        return digest
+    digest = compute()
+    entries[key] = digest
+    try:
+        tmp = sidecar.with_name(f'{sidecar.name}.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(entries))
+        os.replace(tmp, sidecar)
+    except OSError:
+        pass
+    return digest
+
+
+def _header(
+        shape: Tuple[int, ...],
+        dtype: numpy.dtype,
+        geotransform: Iterable[float] | None
+    ) -> str:
+    """
+    Describe the raster in a stable string.
+    """
+    return json.dumps({
+        'version': FINGERPRINT_VERSION,
+        'shape': [int(s) for s in shape],
+        'dtype': numpy.dtype(dtype).str,
+        'geotransform': None if geotransform is None else
+            [float(v) for v in geotransform],
+    }, sort_keys=True)
+
+
+def _update(h: Any, band: numpy.ndarray) -> None:
+    """
+    Feed a band to the hash in chunks. Contiguous bands go straight
+    through a memoryview, others are made contiguous a few rows at a time.
+    """
+    if not band.size:
+        return
+    if band.flags.c_contiguous:
+        view = memoryview(band).cast('B')
+        for start in range(0, len(view), CHUNK_BYTES):
+            h.update(view[start:start + CHUNK_BYTES])
+        return
+    rows = max(1, CHUNK_BYTES // max(1, band[:1].nbytes))
+    for start in range(0, band.shape[0], rows):
+        h.update(memoryview(
+            numpy.ascontiguousarray(band[start:start + rows])).cast('B'))
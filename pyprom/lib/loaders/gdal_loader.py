@@ -5,15 +5,27 @@ This software is distributed under a license that is described in
 the LICENSE file that accompanies it.
 """
 
+from __future__ import annotations
+
+import os
+import tempfile
+import weakref
 from pathlib import Path
 
+import numpy
 from osgeo import gdal
 from .util.metricate_vertical_dataset import convert_dataset_vertical_units_from_feet_to_meters
-from .util.warp_to_geographic import warp_to_geographic
+from .util.warp_to_geographic import (
+    warp_to_geographic, is_geographic, DEFAULT_WARP_MEMORY_LIMIT
+)
 from .util.detect_vertical_units import detect_vertical_unit
+from .util.raster_cache import RasterCache, raster_cache_key
 from pyprom.lib.datamaps.datamap import DataMap
+from pyprom.lib.datamaps.windowed_datamap import WindowedDataMap, DEFAULT_MEMORY_BUDGET
 from pyprom.lib.constants import Units, Confidence
 
+from typing import List, Tuple
+
 class BaseLoader:
     """
     Base class for data loaders.
@@ -39,12 +51,17 @@ class GDALLoader(BaseLoader):
     """
     source_gdal_dataset: gdal.Dataset
     gdal_dataset: gdal.Dataset
+    numpy_array: numpy.memmap | None
 
     def __init__(self,
             filename: str,
             band_index: int = 1,
             force_vertical_units: Units | None = None,
-            gdal_min_vertical_unit_condence: Confidence = Confidence.MEDIUM
+            gdal_min_vertical_unit_condence: Confidence = Confidence.MEDIUM,
+            cache_dir: str | Path | None = None,
+            warp_memory_limit: int = DEFAULT_WARP_MEMORY_LIMIT,
+            warp_threads: int | str = 'ALL_CPUS',
+            warp_dir: str | Path | None = None,
         ) -> None:
         """
         Create Dataload and provide any necessary overrides.
@@ -58,11 +75,78 @@ class GDALLoader(BaseLoader):
             gdal_min_vertical_unit_condence (Confidence, optional): We 
                 use a function to determine the vertical units. it has
                 a variety of confidence levels. Defaults to Confidence.MEDIUM.
+            cache_dir (str | Path | None, optional): Directory for caching
+                the preprocessed raster. When set, the converted and warped
+                raster is stored there keyed by the source file contents
+                and these options, and later loads memory map it instead
+                of preprocessing again. Defaults to None (no caching).
+            warp_memory_limit (int, optional): Bytes GDAL's warper may
+                use per chunk when reprojecting to WGS84.
+            warp_threads (int | str, optional): Threads used when
+                reprojecting. Defaults to 'ALL_CPUS'.
+            warp_dir (str | Path | None, optional): Reproject into a
+                temporary GeoTIFF in this directory rather than memory.
+                The file is removed along with this loader. Defaults to
+                None (reproject in memory).
 
         """
         super().__init__(filename)
-        self.source_gdal_dataset = gdal.Open(self.filename)
+        self.source_gdal_dataset = self._open_source()
+        # Populated with a read only memory map when loaded from cache.
+        self.numpy_array = None
+        self.cache_dir = None
+        self.warp_memory_limit = warp_memory_limit
+        self.warp_threads = warp_threads
+        self.warp_dir = warp_dir
+        # Options which affect the preprocessed raster.
+        self.options = {
+            'band_index': band_index,
+            'force_vertical_units': force_vertical_units,
+            'gdal_min_vertical_unit_condence': gdal_min_vertical_unit_condence,
+        }
+
+        if cache_dir is not None:
+            cache = RasterCache(cache_dir)
+            self.cache_dir = cache.cache_dir
+            key = raster_cache_key(self.source_files(), **self.options)
+            cached = cache.load(key)
+            if cached is None:
+                self._preprocess(band_index, force_vertical_units,
+                                 gdal_min_vertical_unit_condence)
+                cached = cache.store(key, self.gdal_dataset)
+            self.numpy_array, self.gdal_dataset = cached
+            return
+
+        self._preprocess(band_index, force_vertical_units,
+                         gdal_min_vertical_unit_condence)
+
+    def _open_source(self) -> gdal.Dataset:
+        """
+        Open our source dataset.
+        """
+        return gdal.Open(self.filename)
+
+    def source_files(self) -> List[Path]:
+        """
+        :return: the files our source dataset is made of.
+        """
+        return [self.filename]
+
+    def _detect_vertical_unit(self, band_index: int) -> Tuple[Units, Confidence]:
+        """
+        Determine the vertical units of our source dataset.
+        """
+        return detect_vertical_unit(self.source_gdal_dataset, band_index)
 
+    def _preprocess(self,
+            band_index: int,
+            force_vertical_units: Units | None,
+            gdal_min_vertical_unit_condence: Confidence
+        ) -> None:
+        """
+        Convert the source dataset to metric and geographic, and set
+        it as our gdal_dataset.
+        """
         # We need to make some considerations for Vertical units.
         # pyProm expects all data to come in with metric units, so if our
         # source data is NOT in metric units, we need to change that.
@@ -71,7 +155,7 @@ class GDALLoader(BaseLoader):
         if force_vertical_units:
             units = force_vertical_units
         else:
-            units, confidence = detect_vertical_unit(self.source_gdal_dataset, band_index)
+            units, confidence = self._detect_vertical_unit(band_index)
             if confidence < gdal_min_vertical_unit_condence or units == Units.UNKNOWN:
                 raise Exception("Couldn't confidently determine Vertical Units. Try manual override if known")
         if units != Units.METERS:
@@ -80,10 +164,55 @@ class GDALLoader(BaseLoader):
             self.gdal_dataset = self.source_gdal_dataset
 
         # pyprom also expects data to be geographic (that is, lat/lon or WGS84)
-        self.gdal_dataset = warp_to_geographic(self.source_gdal_dataset)
+        # Data which already is, SRTM for instance, passes straight through.
+        destination = None
+        if self.warp_dir is not None and not is_geographic(self.gdal_dataset):
+            handle, destination = tempfile.mkstemp(suffix='.tif', dir=self.warp_dir)
+            os.close(handle)
+            weakref.finalize(self, _remove_file, destination)
+        self.gdal_dataset = warp_to_geographic(
+            self.gdal_dataset,
+            warp_memory_limit=self.warp_memory_limit,
+            num_threads=self.warp_threads,
+            destination=destination
+        )
 
-    def to_datamap(self) -> DataMap:
+    def to_datamap(self,
+            native_dtype: bool = False,
+            vertical_resolution: float | None = None
+        ) -> DataMap:
         """
         Create a DataMap from this Loader
+
+        :param bool native_dtype: keep integer rasters in their native
+         integer dtype instead of converting to float32.
+        :param float vertical_resolution: quantize elevations to integer
+         multiples of this many meters.
+        """
+        return DataMap.from_loader(self,
+                                   native_dtype=native_dtype,
+                                   vertical_resolution=vertical_resolution)
+
+    def to_windowed_datamap(self,
+            memory_budget: int = DEFAULT_MEMORY_BUDGET,
+            native_dtype: bool = False,
+            vertical_resolution: float | None = None
+        ) -> WindowedDataMap:
+        """
+        Create a WindowedDataMap from this Loader. Raster blocks are read
+        on demand and at most `memory_budget` bytes of them are cached.
+        See to_datamap for native_dtype and vertical_resolution.
         """
-        return DataMap.from_loader(self)
+        return WindowedDataMap.from_loader(self, memory_budget=memory_budget,
+                                           native_dtype=native_dtype,
+                                           vertical_resolution=vertical_resolution)
+
+
+def _remove_file(path: str) -> None:
+    """
+    Remove a temporary file, if it's still there.
+    """
+    try:
+        os.remove(path)
+    except OSError:
+        pass
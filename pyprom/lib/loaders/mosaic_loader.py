@@ -0,0 +1,139 @@
+"""
+pyProm: Copyright Marc Howes 2016 - 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains a loader which stitches many raster tiles into a
+single surface.
+"""
+from __future__ import annotations
+
+import glob
+import os
+import tempfile
+import weakref
+from pathlib import Path
+
+from osgeo import gdal
+from .gdal_loader import GDALLoader, _remove_file
+from .util.detect_vertical_units import detect_vertical_unit
+from .util.warp_to_geographic import DEFAULT_WARP_MEMORY_LIMIT
+from pyprom.lib.constants import Units, Confidence
+
+from typing import Iterable, List, Tuple
+
+
+class MosaicLoader(GDALLoader):
+    """
+    Load many adjacent raster tiles (1x1 degree .hgt or GeoTIFF tiles
+    for instance) as a single surface.
+
+    The tiles are mosaicked with gdal.BuildVRT, which references the tile
+    files rather than copying their pixels, and are then converted to
+    metric and geographic like any other :class:`GDALLoader`. Paired with
+    :meth:`to_windowed_datamap` only the blocks which are actually
+    touched are ever read.
+    """
+    filenames: List[Path]
+
+    def __init__(self,
+            tiles: str | Iterable[str | Path],
+            band_index: int = 1,
+            force_vertical_units: Units | None = None,
+            gdal_min_vertical_unit_condence: Confidence = Confidence.MEDIUM,
+            cache_dir: str | Path | None = None,
+            warp_memory_limit: int = DEFAULT_WARP_MEMORY_LIMIT,
+            warp_threads: int | str = 'ALL_CPUS',
+            warp_dir: str | Path | None = None,
+            vrt_path: str | Path | None = None,
+        ) -> None:
+        """
+        Args:
+            tiles (str | Iterable[str | Path]): A glob pattern
+                (e.g. '/data/srtm/N4*W07*.hgt') or an iterable of tile
+                filenames.
+            vrt_path (str | Path | None, optional): Where to write the
+                mosaic VRT. Defaults to None, a temporary file which is
+                removed along with this loader.
+
+        All other arguments are as for :class:`GDALLoader`.
+        """
+        self.filenames = expand_tiles(tiles)
+        self.vrt_path = Path(vrt_path).expanduser() if vrt_path else None
+        super().__init__(self.filenames[0],
+                         band_index=band_index,
+                         force_vertical_units=force_vertical_units,
+                         gdal_min_vertical_unit_condence=gdal_min_vertical_unit_condence,
+                         cache_dir=cache_dir,
+                         warp_memory_limit=warp_memory_limit,
+                         warp_threads=warp_threads,
+                         warp_dir=warp_dir)
+        # filename is only our first tile, so anything keyed on it
+        # (fingerprint sidecars) needs to know about the rest too.
+        self.options['tiles'] = [_tile_identity(tile) for tile in self.filenames]
+
+    def _open_source(self) -> gdal.Dataset:
+        """
+        Build the mosaic VRT over our tiles. It's written to a file so
+        a lazy feet to meters VRT can reference it.
+        """
+        if self.vrt_path is None:
+            handle, vrt_path = tempfile.mkstemp(suffix='.vrt')
+            os.close(handle)
+            weakref.finalize(self, _remove_file, vrt_path)
+            self.vrt_path = Path(vrt_path)
+        mosaic = gdal.BuildVRT(str(self.vrt_path),
+                               [str(tile) for tile in self.filenames])
+        if mosaic is None:
+            raise OSError("Couldn't build a mosaic of these tiles.")
+        # Flush the VRT to disk and reopen it from there.
+        mosaic = None
+        return gdal.Open(str(self.vrt_path))
+
+    def source_files(self) -> List[Path]:
+        """
+        :return: our tiles.
+        """
+        return list(self.filenames)
+
+    def _detect_vertical_unit(self, band_index: int) -> Tuple[Units, Confidence]:
+        """
+        A VRT doesn't necessarily carry its tiles' unit type, so ask the
+        tiles. They need to agree.
+        """
+        detected = set()
+        for tile in self.filenames:
+            detected.add(detect_vertical_unit(gdal.Open(str(tile)), band_index))
+        if len({units for units, _ in detected}) > 1:
+            raise Exception("Tiles don't agree on vertical units. Try manual override if known")
+        # The least confident answer is the one we have to live with.
+        return min(detected, key=lambda result: int(result[1].value))
+
+
+def expand_tiles(tiles: str | Iterable[str | Path]) -> List[Path]:
+    """
+    Turn a glob pattern or an iterable of filenames into a list of tiles.
+
+    :param tiles: glob pattern, or iterable of filenames.
+    :return: list of tile paths.
+    :raises: OSError if there are no tiles, or a tile doesn't exist.
+    """
+    if isinstance(tiles, (str, Path)):
+        filenames = [Path(tile) for tile in sorted(glob.glob(os.path.expanduser(str(tiles))))]
+    else:
+        filenames = [Path(tile).expanduser() for tile in tiles]
+    if not filenames:
+        raise OSError("No tiles found.")
+    for tile in filenames:
+        if not tile.exists():
+            raise OSError(f"Tile {tile} does not exist or uses unfamiliar formatting.")
+    return filenames
+
+
+def _tile_identity(tile: Path) -> Tuple[str, int, int]:
+    """
+    Name, size and modification time of a tile.
+    """
+    stat = tile.stat()
+    return str(tile), stat.st_size, stat.st_mtime_ns
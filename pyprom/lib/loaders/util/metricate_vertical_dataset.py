@@ -4,43 +4,128 @@ pyProm: Copyright Marc Howes 2016 - 2025.
 This software is distributed under a license that is described in
 the LICENSE file that accompanies it.
 """
+import math
+import os
+from xml.sax.saxutils import escape
 
+import numpy
 from osgeo import gdal
 from pyprom.lib import constants
 
+# Rows converted at a time when we can't convert lazily.
+CONVERT_BAND_ROWS = 1024
+
+SCALED_VRT_TEMPLATE = """<VRTDataset rasterXSize="{cols}" rasterYSize="{rows}">
+  <SRS>{srs}</SRS>
+  <GeoTransform>{geotransform}</GeoTransform>
+  <VRTRasterBand dataType="Float32" band="1">
+    {nodata}<UnitType>m</UnitType>
+    <ComplexSource>
+      <SourceFilename relativeToVRT="0">{source}</SourceFilename>
+      <SourceBand>{band_index}</SourceBand>
+      <SrcRect xOff="0" yOff="0" xSize="{cols}" ySize="{rows}" />
+      <DstRect xOff="0" yOff="0" xSize="{cols}" ySize="{rows}" />
+      {source_nodata}<ScaleOffset>0</ScaleOffset>
+      <ScaleRatio>{scale}</ScaleRatio>
+    </ComplexSource>
+  </VRTRasterBand>
+</VRTDataset>
+"""
+
+
 def convert_dataset_vertical_units_from_feet_to_meters(
         dataset: gdal.Dataset,
         band_index: int = 1
     ) -> gdal.Dataset:
     """
     Converts the Vertical units in this dataset to Meters.
-    """        
+
+    The conversion is lazy: we return a VRT over the source whose
+    ComplexSource scales each pixel by METERS_PER_FOOT as it is read,
+    so no copy of the raster is made. nodata pixels are left alone.
+    Datasets which don't live in a file (MEM for instance) can't be
+    referenced from a VRT, those are converted into a single float32
+    MEM dataset a band of rows at a time.
+    """
     raster_band = dataset.GetRasterBand(band_index)
 
     # As of GDAL 3.9 the recognized units are
     # m, metre, metre, ft, foot, US survey foot
     # see docs https://gdal.org/_/downloads/en/release-3.9/pdf/ pp118
-    
-    projection = dataset.GetProjection()
-    geotransform = dataset.GetGeoTransform()
 
-    # Convert stupid units to Metric.
-    raster_array = raster_band.ReadAsArray()
-    raster_array_meters = raster_array * constants.METERS_PER_FOOT
+    source = dataset.GetDescription()
+    if source and os.path.exists(source):
+        return _scaled_vrt(dataset, band_index, constants.METERS_PER_FOOT)
+    return _scaled_mem(dataset, raster_band, constants.METERS_PER_FOOT)
 
-    # Make sure we set our unit type as 'm' just in case someone reads this later.
-    raster_array_meters.SetUnitType('m')
 
+def _scaled_vrt(
+        dataset: gdal.Dataset,
+        band_index: int,
+        scale: float
+    ) -> gdal.Dataset:
+    """
+    VRT which scales band_index of dataset on read.
+    """
+    nodata = dataset.GetRasterBand(band_index).GetNoDataValue()
+    nodata_xml = ''
+    source_nodata_xml = ''
+    if nodata is not None:
+        value = 'nan' if math.isnan(nodata) else repr(nodata)
+        nodata_xml = f'<NoDataValue>{value}</NoDataValue>\n    '
+        source_nodata_xml = f'<NODATA>{value}</NODATA>\n      '
+    vrt = SCALED_VRT_TEMPLATE.format(
+        cols=dataset.RasterXSize,
+        rows=dataset.RasterYSize,
+        srs=escape(dataset.GetProjection()),
+        geotransform=', '.join(repr(v) for v in dataset.GetGeoTransform()),
+        nodata=nodata_xml,
+        source=escape(os.path.abspath(dataset.GetDescription())),
+        band_index=band_index,
+        source_nodata=source_nodata_xml,
+        scale=repr(scale),
+    )
+    # GDAL opens VRT XML handed to it in place of a filename.
+    return gdal.Open(vrt)
+
+
+def _scaled_mem(
+        dataset: gdal.Dataset,
+        raster_band: gdal.Band,
+        scale: float
+    ) -> gdal.Dataset:
+    """
+    float32 MEM copy of raster_band, scaled a band of rows at a time.
+    """
+    nodata = raster_band.GetNoDataValue()
     mem_driver = gdal.GetDriverByName('MEM')
     metric_vertical_dataset = mem_driver.Create(
-        '', 
-        dataset.RasterXSize, 
-        dataset.RasterYSize, 
-        1, 
-        raster_band.DataType
+        '',
+        dataset.RasterXSize,
+        dataset.RasterYSize,
+        1,
+        gdal.GDT_Float32
     )
-    metric_vertical_dataset.SetGeoTransform(geotransform)
-    metric_vertical_dataset.SetProjection(projection)
-    metric_vertical_dataset.GetRasterBand(band_index).WriteArray(raster_array_meters)
-    
+    metric_vertical_dataset.SetGeoTransform(dataset.GetGeoTransform())
+    metric_vertical_dataset.SetProjection(dataset.GetProjection())
+    metric_band = metric_vertical_dataset.GetRasterBand(1)
+    if nodata is not None:
+        metric_band.SetNoDataValue(nodata)
+    # Make sure we set our unit type as 'm' just in case someone reads this later.
+    metric_band.SetUnitType('m')
+
+    # Scale in float64, as a VRT would, and let GDAL write float32.
+    for x_offset in range(0, dataset.RasterYSize, CONVERT_BAND_ROWS):
+        rows = min(CONVERT_BAND_ROWS, dataset.RasterYSize - x_offset)
+        band = raster_band.ReadAsArray(
+            xoff=0, yoff=x_offset,
+            win_xsize=dataset.RasterXSize, win_ysize=rows,
+            buf_type=gdal.GDT_Float64)
+        if nodata is None:
+            band *= scale
+        elif math.isnan(nodata):
+            numpy.multiply(band, scale, out=band, where=~numpy.isnan(band))
+        else:
+            numpy.multiply(band, scale, out=band, where=band != nodata)
+        metric_band.WriteArray(band, xoff=0, yoff=x_offset)
     return metric_vertical_dataset
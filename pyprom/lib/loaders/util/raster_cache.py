@@ -0,0 +1,201 @@
+"""
+pyProm: Copyright Marc Howes 2016 - 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains an on disk cache of preprocessed (metric, geographic)
+rasters, so a source file only has to be converted and warped once.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy
+from osgeo import gdal
+from pyprom.lib.util import checksum
+
+from typing import Any, Iterable, Tuple
+
+# Bump this whenever the preprocessing pipeline changes in a way which
+# would produce different rasters, so stale entries are ignored.
+RASTER_CACHE_VERSION = 1
+
+# Rows copied from GDAL to disk at a time when storing.
+STORE_BAND_ROWS = 1024
+
+VRT_TEMPLATE = """<VRTDataset rasterXSize="{cols}" rasterYSize="{rows}">
+  <SRS>{srs}</SRS>
+  <GeoTransform>{geotransform}</GeoTransform>
+  <VRTRasterBand dataType="Float32" band="1" subClass="VRTRawRasterBand">
+    {nodata}<SourceFilename relativeToVRT="1">{source}</SourceFilename>
+    <ImageOffset>{offset}</ImageOffset>
+    <PixelOffset>{pixel_offset}</PixelOffset>
+    <LineOffset>{line_offset}</LineOffset>
+    <ByteOrder>{byte_order}</ByteOrder>
+  </VRTRasterBand>
+</VRTDataset>
+"""
+
+
+def raster_cache_key(filenames: Iterable[str | Path], **options: Any) -> str:
+    """
+    Produce the key for a preprocessed raster. The key covers the
+    source files contents, the loader options and the cache version.
+
+    :param filenames: source raster files.
+    :param options: loader options which affect preprocessing.
+    :return: hex digest key.
+    """
+    identity = {
+        'source': [checksum(filename) for filename in filenames],
+        'version': RASTER_CACHE_VERSION,
+        'options': {k: _jsonable(v) for k, v in sorted(options.items())},
+    }
+    return hashlib.md5(json.dumps(identity, sort_keys=True).encode()).hexdigest()
+
+
+class RasterCache:
+    """
+    RasterCache stores preprocessed rasters in `cache_dir`.
+
+    Each entry is three files sharing the key as their name:
+
+    - `<key>.npy` the float32 raster, readable with `numpy.load(mmap_mode='r')`
+    - `<key>.vrt` a raw VRT pointing GDAL at the pixels in the `.npy`
+    - `<key>.json` a sidecar holding the geotransform, projection,
+      nodata value and shape.
+
+    Loading an entry maps the `.npy` read only, so nothing is read until
+    it is used, and several processes share the same pages.
+    """
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        """
+        :param cache_dir: directory to keep cached rasters in.
+         It's created if it doesn't exist.
+        """
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def paths(self, key: str) -> Tuple[Path, Path, Path]:
+        """
+        :param str key: cache key.
+        :return: (npy, vrt, json) paths for key.
+        """
+        return (self.cache_dir / f'{key}.npy',
+                self.cache_dir / f'{key}.vrt',
+                self.cache_dir / f'{key}.json')
+
+    def load(self, key: str) -> Tuple[numpy.memmap, gdal.Dataset] | None:
+        """
+        Load a cached raster.
+
+        :param str key: cache key.
+        :return: (memory mapped array, gdal dataset) or None if
+         there is no valid entry for key.
+        """
+        npy_path, vrt_path, json_path = self.paths(key)
+        try:
+            with open(json_path) as f:
+                sidecar = json.load(f)
+            numpy_array = numpy.load(npy_path, mmap_mode='r')
+        except (OSError, ValueError):
+            return None
+        if (sidecar.get('version') != RASTER_CACHE_VERSION or
+                list(numpy_array.shape) != sidecar.get('shape')):
+            return None
+        gdal_dataset = gdal.Open(str(vrt_path))
+        if gdal_dataset is None:
+            return None
+        return numpy_array, gdal_dataset
+
+    def store(self,
+            key: str,
+            dataset: gdal.Dataset,
+            band_index: int = 1
+        ) -> Tuple[numpy.memmap, gdal.Dataset]:
+        """
+        Write `dataset` into the cache and load it back.
+        The raster is copied in bands of rows so the whole raster
+        never needs to be in memory at once.
+
+        :param str key: cache key.
+        :param dataset: preprocessed gdal dataset.
+        :param int band_index: raster band to store.
+        :return: (memory mapped array, gdal dataset)
+        """
+        npy_path, vrt_path, json_path = self.paths(key)
+        raster_band = dataset.GetRasterBand(band_index)
+        rows, cols = dataset.RasterYSize, dataset.RasterXSize
+
+        # Write to temporary files and move them into place, so a crash
+        # or a concurrent writer never leaves a half written entry.
+        suffix = f'.{os.getpid()}.tmp'
+        tmp_npy = npy_path.with_name(npy_path.name + suffix)
+        out = numpy.lib.format.open_memmap(
+            tmp_npy, mode='w+', dtype=numpy.float32, shape=(rows, cols))
+        for x_offset in range(0, rows, STORE_BAND_ROWS):
+            band_rows = min(STORE_BAND_ROWS, rows - x_offset)
+            out[x_offset:x_offset + band_rows] = raster_band.ReadAsArray(
+                xoff=0, yoff=x_offset, win_xsize=cols, win_ysize=band_rows,
+                buf_type=gdal.GDT_Float32)
+        out.flush()
+        offset = out.offset
+        byte_order = 'MSB' if out.dtype.byteorder == '>' else 'LSB'
+        del out
+
+        nodata = raster_band.GetNoDataValue()
+        geotransform = list(dataset.GetGeoTransform())
+        projection = dataset.GetProjection()
+        vrt = VRT_TEMPLATE.format(
+            cols=cols,
+            rows=rows,
+            srs=_escape(projection),
+            geotransform=', '.join(repr(v) for v in geotransform),
+            nodata='' if nodata is None else
+                f'<NoDataValue>{nodata!r}</NoDataValue>\n    ',
+            source=npy_path.name,
+            offset=offset,
+            pixel_offset=4,
+            line_offset=4 * cols,
+            byte_order=byte_order,
+        )
+        sidecar = {
+            'version': RASTER_CACHE_VERSION,
+            'geotransform': geotransform,
+            'projection': projection,
+            'nodata': nodata,
+            'shape': [rows, cols],
+            'offset': offset,
+        }
+        tmp_vrt = vrt_path.with_name(vrt_path.name + suffix)
+        tmp_json = json_path.with_name(json_path.name + suffix)
+        tmp_vrt.write_text(vrt)
+        tmp_json.write_text(json.dumps(sidecar))
+        os.replace(tmp_npy, npy_path)
+        os.replace(tmp_vrt, vrt_path)
+        # The sidecar goes last, an entry without one is ignored.
+        os.replace(tmp_json, json_path)
+        return self.load(key)
+
+
+def _jsonable(value: Any) -> Any:
+    """
+    Enums and other odd bits to something json can hash.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return getattr(value, 'value', value)
+    return str(value)
+
+
+def _escape(text: str) -> str:
+    """
+    Escape text for inclusion in VRT XML.
+    """
+    return (text.replace('&', '&amp;')
+                .replace('<', '&lt;')
+                .replace('>', '&gt;'))
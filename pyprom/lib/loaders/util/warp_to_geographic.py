@@ -1,27 +1,86 @@
 from osgeo import gdal, osr
 
-def warp_to_geographic(dataset: gdal.Dataset) -> gdal.Dataset:
+# Bytes of source and destination pixels the warper may hold at once.
+DEFAULT_WARP_MEMORY_LIMIT = 512 * 1024 * 1024
+
+
+def geographic_srs() -> osr.SpatialReference:
+    """
+    Returns our target spatial reference, EPSG:4326.
+    """
+    target_srs = osr.SpatialReference()
+    target_srs.ImportFromEPSG(4326)
+    return target_srs
+
+
+def is_geographic(dataset: gdal.Dataset) -> bool:
+    """
+    Determine if a dataset is already what warp_to_geographic would
+    produce, that is EPSG:4326 with a north up geotransform.
+
+    Args:
+        dataset (gdal.Dataset): dataset to check.
+
+    Returns:
+        bool: True if warping would be an identity reprojection.
+    """
+    wkt = dataset.GetProjection()
+    if not wkt:
+        return False
+    source_srs = osr.SpatialReference(wkt=wkt)
+    # We only care about the datum and units here, not which axis GDAL
+    # thinks comes first. The geotransform settles that.
+    if not source_srs.IsSame(geographic_srs(),
+                             ['IGNORE_DATA_AXIS_TO_SRS_AXIS_MAPPING=YES']):
+        return False
+    geotransform = dataset.GetGeoTransform()
+    # No rotation or shear, and rows run north to south.
+    return (geotransform[2] == 0 and geotransform[4] == 0 and
+            geotransform[1] > 0 and geotransform[5] < 0)
+
+
+def warp_to_geographic(
+        dataset: gdal.Dataset,
+        warp_memory_limit: int = DEFAULT_WARP_MEMORY_LIMIT,
+        num_threads: int | str = 'ALL_CPUS',
+        destination: str | None = None
+    ) -> gdal.Dataset:
     """
-    Reprojects our data to 4326.
+    Reprojects our data to 4326. If the data is already in 4326,
+    it is returned as is.
 
     Args:
         dataset (gdal.Dataset): dataset to reproject.
-        epsg_code (int | None, optional): Target EPSG code. Defaults to 4326.
+        warp_memory_limit (int, optional): Bytes the warper may use for
+            each chunk. Defaults to DEFAULT_WARP_MEMORY_LIMIT.
+        num_threads (int | str, optional): Threads used for warping
+            chunks. Defaults to 'ALL_CPUS'.
+        destination (str | None, optional): Warp into a tiled GeoTIFF at
+            this path instead of memory. Defaults to None (MEM).
 
     Returns:
         gdal.Dataset: reprojected dataset.
     """
+    if is_geographic(dataset):
+        return dataset
 
-    target_srs = osr.SpatialReference()
-    target_srs.ImportFromEPSG(4326)
-    target_wkt = target_srs.ExportToWkt()
+    target_wkt = geographic_srs().ExportToWkt()
 
-    # Warp our raster to conform to 4326
-    mem_driver = gdal.GetDriverByName('MEM')
+    # Warp our raster to conform to 4326, chunk by chunk, on every core.
+    options = dict(
+        dstSRS=target_wkt,
+        resampleAlg=gdal.GRA_Bilinear,
+        multithread=True,
+        warpMemoryLimit=warp_memory_limit,
+        warpOptions=[f'NUM_THREADS={num_threads}'],
+    )
+    if destination is None:
+        return gdal.Warp('', dataset, format='MEM', **options)
     return gdal.Warp(
-        '',
+        destination,
         dataset,
-        format='MEM',
-        dstSRS=target_wkt,
-        resampleAlg=gdal.GRA_Bilinear
-    )
\ No newline at end of file
+        format='GTiff',
+        creationOptions=['TILED=YES', 'BIGTIFF=IF_SAFER',
+                         f'NUM_THREADS={num_threads}'],
+        **options
+    )
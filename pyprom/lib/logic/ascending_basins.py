@@ -0,0 +1,113 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains a whole raster assignment of every pixel to the
+summit domain (ascending basin) it climbs to, found by pointer jumping
+along the steepest ascent raster rather than climbing pixel by pixel.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import numpy
+
+from ..datamaps.base_datamap import FULL_SHIFT_LIST
+from .shortest_path_by_points import find_closest_point_by_distance_map
+from .steepest_ascent import BAND_ROWS
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from numpy import NDArray
+    from pyprom.lib.datamaps.base_datamap import BaseDataMap
+    from pyprom.lib.logic.plateaus import PlateauLabels
+
+logger = logging.getLogger('{}'.format(__name__))
+
+
+def ascending_basins(
+        datamap: BaseDataMap,
+        directions: NDArray,
+        plateaus: PlateauLabels,
+        seeds: NDArray,
+        band_rows: int = BAND_ROWS
+    ) -> NDArray:
+    """
+    Assign every pixel the label of the seed (summit) its ascent ends at.
+
+    Each pixel points at its steepest neighbor. Members of a plateau
+    which some climb crosses level (a member with no higher neighbor)
+    instead all point at their closest high perimeter point, as
+    :meth:`pyprom.lib.logic.summit_domain_walk.Walk.climb_points`
+    assigns them. Every pointer leads strictly uphill, so repeatedly
+    replacing each pointer with its target's pointer (pointer jumping)
+    reaches every pixel's root in log2(longest ascent) passes.
+
+    Pixels whose ascent ends at a seed get that seed's label. Those
+    ending anywhere else, nowhere, off the map, on a plateau with no
+    high perimeter, or on nodata, are label 0.
+
+    :param datamap: datamap to assign.
+    :param directions: steepest ascent directions, see
+     :func:`pyprom.lib.logic.steepest_ascent.steepest_ascent`.
+    :param plateaus: plateau labels of datamap.
+    :type plateaus: :class:`pyprom.lib.logic.plateaus.PlateauLabels`
+    :param seeds: int32 labels shaped like the raster, nonzero for
+     pixels already assigned (summits). These keep their label.
+    :param int band_rows: rows looked at at once while building pointers.
+    :return: int32 labels shaped like the raster.
+    """
+    width = datamap.max_y + 1
+    size = (datamap.max_x + 1) * width
+    pixels = numpy.arange(size, dtype=numpy.int64)
+    parents = pixels.copy()
+    plateau_labels = plateaus.labels.ravel()
+    level_pixels = []
+    for x_offset, band in datamap.iter_row_bands(band_rows):
+        first = x_offset * width
+        band_pixels = pixels[first:first + band.size]
+        xs, ys = numpy.divmod(band_pixels, width)
+        band_directions = directions[x_offset:x_offset + band.shape[0]].ravel()
+        # nodata goes nowhere, and nothing goes anywhere from it.
+        valid = ~datamap.nodata_mask(band).ravel()
+        views = datamap.neighbor_views(x_offset, x_offset + band.shape[0])
+        for shift, (dx, dy) in enumerate(FULL_SHIFT_LIST):
+            here = (band_directions == shift) & valid
+            # Off the map ascents go nowhere too.
+            here &= ((xs + dx >= 0) & (xs + dx <= datamap.max_x) &
+                     (ys + dy >= 0) & (ys + dy < width))
+            parents[band_pixels[here]] = band_pixels[here] + (dx * width + dy)
+            level = here & (views[shift].ravel() == band.ravel())
+            level_pixels.append(band_pixels[level])
+    # Level pixels are plateau members, resolve each plateau crossed
+    # level as a whole, every member goes to its closest high perimeter point.
+    level_labels = plateau_labels[numpy.concatenate(level_pixels)]
+    for label in numpy.unique(level_labels[level_labels > 0]).tolist():
+        xs, ys = plateaus.member_xys(label)
+        members = xs * width + ys
+        highPerimeter = plateaus.high_perimeter(label)
+        if not highPerimeter:
+            parents[members] = members
+            continue
+        memberPoints = list(zip(xs.tolist(), ys.tolist()))
+        closest = find_closest_point_by_distance_map(memberPoints, highPerimeter)
+        parents[members] = [closest[point][0] * width + closest[point][1]
+                            for point in memberPoints]
+
+    # Seeds are roots, whatever their direction.
+    flat_seeds = seeds.ravel()
+    seeded = numpy.nonzero(flat_seeds)[0]
+    parents[seeded] = seeded
+
+    passes = 0
+    while True:
+        jumped = parents[parents]
+        if numpy.array_equal(jumped, parents):
+            break
+        parents = jumped
+        passes += 1
+    logger.info("Ascending basins resolved in {} passes".format(passes))
+    return flat_seeds[parents].reshape(seeds.shape)
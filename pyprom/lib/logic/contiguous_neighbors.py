@@ -5,9 +5,17 @@ This software is distributed under a license that is described in
 the LICENSE file that accompanies it.
 """
 
+from __future__ import annotations
+
 from collections import defaultdict
+
+import numpy
+
+from ..datamaps.base_datamap import FULL_SHIFT_LIST
+
 from typing import TYPE_CHECKING, List, Dict
 if TYPE_CHECKING:
+    from numpy import NDArray
     from pyprom._typing.type_hints import XY_Elevation
     from pyprom import DataMap
 
@@ -61,7 +69,7 @@ def contiguous_neighbors(
 
 def touching_neighborhoods(
         list_of_point_lists: List[List[XY_Elevation]],
-        datamap: DataMap
+        datamap: DataMap | None = None
     ) -> Dict[int, List[int]]:
     """
     Consumes list of point lists and which lists touch.
@@ -72,24 +80,62 @@ def touching_neighborhoods(
     Example:
     {0: [2, 4], 1: [3, 2]})
     {my_idx: [touching_neighborhood_1_idx, ...]}
+
+    Each touching pair is only listed once, under whichever list
+    touched the other first. Neighbors are looked up for all points at
+    once, 8 vectorized lookups, rather than point by point.
+
     :param list list_of_point_lists: list(list(tuple(x, y, ele)))
-    :param datamap: datamap
+    :param datamap: unused, points off the map never match anything.
     """
     touching_neighborhoods = defaultdict(list)
+    sizes = [len(pt_list) for pt_list in list_of_point_lists]
+    if not sum(sizes):
+        return touching_neighborhoods
 
-    tracker = []
-    lookup = defaultdict(dict)
-    for idx, pt_list in enumerate(list_of_point_lists):
-        for pt in pt_list:
-            lookup[pt[0]][pt[1]] = idx
-    for us, pt_list in enumerate(list_of_point_lists):
-        for pt in pt_list:
-            for x, y, el in datamap.iterateFull(pt[0], pt[1]):
-                if lookup[x].get(y, None):
-                    them = lookup[x][y]
-                    if us == them:
-                        continue
-                    if (us, them) not in tracker:
-                        tracker.extend([(them, us), (us, them)])
-                        touching_neighborhoods[us].append(them)
+    owners = numpy.repeat(numpy.arange(len(sizes)), sizes)
+    xys = numpy.array([pt[:2] for pt_list in list_of_point_lists
+                       for pt in pt_list], dtype=numpy.int64)
+    xs, ys = xys[:, 0], xys[:, 1]
+    keys = _keys(xs, ys)
+    # Stable, and searching from the right finds the last list a point
+    # is in, should it be in more than one.
+    order = numpy.argsort(keys, kind='stable')
+    sortedKeys = keys[order]
+
+    us, them, encountered = [], [], []
+    for shift, (dx, dy) in enumerate(FULL_SHIFT_LIST):
+        wanted = _keys(xs + dx, ys + dy)
+        found = numpy.searchsorted(sortedKeys, wanted, side='right') - 1
+        hit = sortedKeys[numpy.maximum(found, 0)] == wanted
+        hit &= found >= 0
+        neighbor = numpy.full(xs.size, -1, dtype=numpy.int64)
+        neighbor[hit] = owners[order[found[hit]]]
+        # list 0 has never been looked for as a neighbor, but pairs with
+        # it are found from list 0 itself.
+        keep = numpy.flatnonzero((neighbor > 0) & (neighbor != owners))
+        us.append(owners[keep])
+        them.append(neighbor[keep])
+        encountered.append(keep * len(FULL_SHIFT_LIST) + shift)
+    us = numpy.concatenate(us)
+    them = numpy.concatenate(them)
+    encountered = numpy.concatenate(encountered)
+    if not us.size:
+        return touching_neighborhoods
+
+    # Keep only the first encounter of each pair, in encounter order.
+    byEncounter = numpy.argsort(encountered, kind='stable')
+    us, them = us[byEncounter], them[byEncounter]
+    pairs = numpy.minimum(us, them) * len(sizes) + numpy.maximum(us, them)
+    first = numpy.sort(numpy.unique(pairs, return_index=True)[1])
+    for mine, theirs in zip(us[first].tolist(), them[first].tolist()):
+        touching_neighborhoods[mine].append(theirs)
     return touching_neighborhoods
+
+
+def _keys(xs: NDArray, ys: NDArray) -> NDArray:
+    """
+    Sortable int64 key of each x, y. Negative coordinates, which are off
+    the map, never collide with a point on it.
+    """
+    return (xs << 32) + ys
@@ -0,0 +1,118 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains vectorized classification of single pixels by the
+ring of 8 neighbors around them.
+"""
+
+from __future__ import annotations
+
+import numpy
+
+from ..datamaps.base_datamap import FULL_SHIFT_LIST
+from .contiguous_neighbors import contiguous_neighbors
+
+from typing import TYPE_CHECKING, Tuple
+if TYPE_CHECKING:
+    from numpy import NDArray
+    from pyprom._typing.type_hints import Numpy_X
+    from pyprom.lib.datamaps.base_datamap import BaseDataMap
+
+# Returned by high_neighborhood_counts for pixels the ring alone can't
+# classify, which need the full summit_and_saddle analysis.
+NEEDS_ANALYSIS = 255
+
+
+def _ring_neighborhood_count(mask: int) -> int:
+    """
+    Number of contiguous high perimeter neighborhoods formed by the
+    ring positions set in mask. Bit i is FULL_SHIFT_LIST[i].
+    """
+    # Shifted to be non negative, contiguous_neighbors ignores
+    # negative coordinates.
+    high = [(dx + 1, dy + 1, 0)
+            for bit, (dx, dy) in enumerate(FULL_SHIFT_LIST)
+            if mask & (1 << bit)]
+    return len(contiguous_neighbors(high))
+
+
+# HIGH_NEIGHBORHOOD_COUNT[mask] is the number of high perimeter
+# neighborhoods around a pixel whose higher neighbors are the bits of mask.
+HIGH_NEIGHBORHOOD_COUNT = numpy.array(
+    [_ring_neighborhood_count(mask) for mask in range(256)],
+    dtype=numpy.uint8)
+
+
+def high_neighborhood_counts(
+        datamap: BaseDataMap,
+        x_offset: Numpy_X,
+        band: NDArray
+    ) -> NDArray:
+    """
+    Classify every pixel in a band of rows by its ring of 8 neighbors.
+
+    Each pixel's higher neighbors are encoded as an 8 bit mask (bit i
+    is FULL_SHIFT_LIST[i]) and looked up in HIGH_NEIGHBORHOOD_COUNT.
+    Pixels on the map edge, or with an equal or nodata neighbor,
+    are plateaus, edge features or otherwise need their surroundings
+    looked at, and get NEEDS_ANALYSIS instead.
+
+    A single high perimeter neighborhood is an ordinary slope, no
+    neighborhoods is a summit and more than one is a saddle.
+
+    :param datamap: datamap band is from.
+    :param int x_offset: x coordinate of the first row of band.
+    :param band: rows x_offset:x_offset + len(band) of numpy_array.
+    :return: uint8 array shaped like band.
+    """
+    x_stop = x_offset + band.shape[0]
+    mask = numpy.zeros(band.shape, dtype=numpy.uint8)
+    needs_analysis = numpy.zeros(band.shape, dtype=bool)
+    for bit, neighbor in enumerate(datamap.neighbor_views(x_offset, x_stop)):
+        mask |= (neighbor > band).view(numpy.uint8) << numpy.uint8(bit)
+        needs_analysis |= neighbor == band
+        needs_analysis |= datamap.nodata_mask(neighbor)
+    # Map edges, including whichever rows of the band are on one.
+    needs_analysis[:, 0] = True
+    needs_analysis[:, -1] = True
+    if x_offset == 0:
+        needs_analysis[0] = True
+    if x_stop == datamap.max_x + 1:
+        needs_analysis[-1] = True
+    counts = HIGH_NEIGHBORHOOD_COUNT[mask]
+    counts[needs_analysis] = NEEDS_ANALYSIS
+    return counts
+
+
+def ring_summits(
+        datamap: BaseDataMap,
+        x_offset: Numpy_X,
+        band: NDArray
+    ) -> Tuple[NDArray, NDArray]:
+    """
+    Find summits in a band of rows by the highest of the ring of 8
+    neighbors around each pixel, that is a 3x3 maximum filter leaving
+    out the center. Off map and nodata neighbors don't count.
+
+    A pixel higher than all its neighbors is a single pixel summit.
+    A pixel as high as its highest neighbor is on a plateau with no
+    higher neighbors of its own, which might be a summit, depending on
+    what's around the rest of the plateau.
+
+    :param datamap: datamap band is from.
+    :param int x_offset: x coordinate of the first row of band.
+    :param band: rows x_offset:x_offset + len(band) of numpy_array.
+    :return: (single pixel summits, plateau summit candidates) boolean
+     arrays shaped like band.
+    """
+    x_stop = x_offset + band.shape[0]
+    ring_max = numpy.full(band.shape, -numpy.inf)
+    for neighbor in datamap.neighbor_views(x_offset, x_stop):
+        # fmax skips the NaN padding off maps without a nodata value.
+        ring_max = numpy.fmax(ring_max, numpy.where(
+            datamap.nodata_mask(neighbor), -numpy.inf, neighbor))
+    valid = ~datamap.nodata_mask(band)
+    return valid & (ring_max < band), valid & (ring_max == band)
@@ -0,0 +1,336 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains an up front labeling of every plateau (connected
+pixels of equal elevation) on a datamap.
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from math import isnan
+
+import numpy
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+from ..containers.base_self_iterable import PackedPoints
+from ..containers.multipoint import MultiPoint
+from ..containers.perimeter import Perimeter
+from ..datamaps.base_datamap import FULL_SHIFT_LIST, FULL_SHIFT_X, FULL_SHIFT_Y
+
+from typing import TYPE_CHECKING, List, Tuple
+if TYPE_CHECKING:
+    from numpy import NDArray
+    from pyprom import DataMap
+    from pyprom._typing.type_hints import (
+        Numpy_X, Numpy_Y,
+        Elevation,
+        XY_Elevation
+    )
+
+# Indexes into FULL_SHIFT_LIST of the neighbors after a pixel in row
+# major order, (0, 1) (1, 1) (1, 0) and (1, -1). Linking each pixel to
+# these covers every 8-connected pair once.
+FORWARD_SHIFTS = (2, 3, 4, 5)
+
+
+class PlateauLabels:
+    """
+    PlateauLabels finds every plateau, that is a group of two or more
+    diagonally or orthogonally connected pixels of equal elevation, on a
+    datamap in one pass, rather than flood filling each one as it's found.
+
+    Plateaus are labeled 1 through len(self), in row major order of their
+    first member. Pixels which aren't on a plateau are label 0.
+
+    Members and high perimeter points are kept per label in CSR form:
+    the members of label `l` are `members[member_indptr[l - 1]:member_indptr[l]]`
+    as flat (x * (max_y + 1) + y) raster indexes, in row major order.
+    High perimeter points and map edge perimeter points are kept likewise,
+    as flat indexes into the raster padded by one pixel on every side, as
+    map edge perimeter points can be just off the map.
+
+    :func:`blob` builds the same
+    :class:`pyprom.lib.containers.multipoint.MultiPoint` and edgePoints
+    as :func:`pyprom.lib.logic.equalheight.equalHeightBlob` from these.
+    """
+
+    def __init__(self,
+            datamap: DataMap,
+            band_rows: int | None = None
+        ):
+        """
+        :param datamap: datamap to label plateaus on.
+        :param int band_rows: rows of the raster looked at at once.
+         Defaults to whatever the datamap iterates in.
+        """
+        self.datamap = datamap
+        self.width = datamap.max_y + 1
+        self.band_rows = band_rows
+        self._labels = None
+
+        self.pixels, self.pixel_labels = self._label(band_rows)
+        order = numpy.argsort(self.pixel_labels, kind='stable')
+        self.members = self.pixels[order]
+        self.member_indptr = _indptr(self.pixel_labels[order], len(self))
+        (self.perimeter, self.perimeter_elevations, self.perimeter_indptr,
+         self.edge_perimeter, self.edge_perimeter_elevations,
+         self.edge_perimeter_indptr) = self._perimeters()
+
+    def __len__(self) -> int:
+        """
+        :return: number of plateaus.
+        """
+        if not self.pixel_labels.size:
+            return 0
+        return int(self.pixel_labels.max())
+
+    def __repr__(self) -> str:
+        """
+        :return: String representation of this object
+        """
+        return "<PlateauLabels> {} plateaus {} member pixels".format(
+            len(self), self.pixels.size)
+
+    __str__ = __repr__
+
+    def _label(self,
+            band_rows: int | None
+        ) -> Tuple[NDArray, NDArray]:
+        """
+        Link every pair of equal neighbors, and label the connected
+        components of the resulting graph.
+
+        :return: (sorted flat indexes of plateau pixels, their labels)
+        """
+        heads = []
+        tails = []
+        # Remember how the datamap banded the raster, for _perimeters.
+        self._band_starts = []
+        for x_offset, band in self.datamap.iter_row_bands(band_rows):
+            self._band_starts.append(x_offset)
+            x_stop = x_offset + band.shape[0]
+            views = self.datamap.neighbor_views(x_offset, x_stop)
+            valid = ~self.datamap.nodata_mask(band)
+            for shift in FORWARD_SHIFTS:
+                dx, dy = FULL_SHIFT_LIST[shift]
+                # Off map neighbors are padded with nodata, which nothing
+                # valid is equal to.
+                xs, ys = numpy.nonzero((views[shift] == band) & valid)
+                head = (xs + x_offset) * self.width + ys
+                heads.append(head)
+                tails.append(head + (dx * self.width + dy))
+        heads = numpy.concatenate(heads) if heads else numpy.empty(0, numpy.int64)
+        tails = numpy.concatenate(tails) if tails else numpy.empty(0, numpy.int64)
+        pixels = numpy.unique(numpy.concatenate((heads, tails)))
+        if not pixels.size:
+            return pixels, numpy.empty(0, dtype=numpy.int32)
+        graph = coo_matrix(
+            (numpy.ones(heads.size, dtype=numpy.int8),
+             (numpy.searchsorted(pixels, heads),
+              numpy.searchsorted(pixels, tails))),
+            shape=(pixels.size, pixels.size)).tocsr()
+        _, components = connected_components(graph, directed=False)
+        # Number components by their first pixel, pixels are row major.
+        _, first = numpy.unique(components, return_index=True)
+        rank = numpy.empty(first.size, dtype=numpy.int32)
+        rank[numpy.argsort(first, kind='stable')] = numpy.arange(
+            1, first.size + 1, dtype=numpy.int32)
+        return pixels, rank[components]
+
+    def _perimeters(self) -> Tuple[NDArray, ...]:
+        """
+        Find the high perimeter points and map edge perimeter points of
+        every plateau, using the same rules as equalHeightBlob.
+
+        :return: (perimeter, elevations, indptr) for high perimeter points
+         followed by the same for map edge perimeter points.
+        """
+        datamap = self.datamap
+        nodata = datamap.nodata
+        nan_nodata = isinstance(nodata, float) and isnan(nodata)
+        high = ([], [], [])
+        edge = ([], [], [])
+        # Look at members in the same bands of rows as labeling did, so
+        # windowed datamaps never need more than a band (and its
+        # neighboring rows) at once.
+        member_xs = self.pixels // self.width
+        bounds = numpy.searchsorted(
+            member_xs, self._band_starts + [datamap.max_x + 1])
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            if start == stop:
+                continue
+            pixels = self.pixels[start:stop]
+            labels = self.pixel_labels[start:stop]
+            xs, ys = numpy.divmod(pixels, self.width)
+            elevations, inbounds = datamap.neighbors_of(xs, ys)
+            own = datamap.get_many(xs, ys)
+            neighbor_xs = xs[:, None] + FULL_SHIFT_X
+            neighbor_ys = ys[:, None] + FULL_SHIFT_Y
+            # nodata neighbors are skipped, as are off map neighbors
+            # unless nodata is NaN (which isn't equal to itself).
+            if nodata is None:
+                skip = ~inbounds
+            else:
+                skip = elevations == nodata
+                if not nan_nodata:
+                    skip |= ~inbounds
+            is_high = ~skip & (elevations > own[:, None])
+            is_edge = (~skip & (elevations != own[:, None]) &
+                       ((neighbor_xs == 0) | (neighbor_ys == 0) |
+                        (neighbor_xs == datamap.max_x) |
+                        (neighbor_ys == datamap.max_y)))
+            for found, out in ((is_high, high), (is_edge, edge)):
+                rows, cols = numpy.nonzero(found)
+                out[0].append(labels[rows])
+                # Perimeter points can be off the map by one, so they're
+                # indexed into the raster padded by one on every side.
+                out[1].append((neighbor_xs[rows, cols] + 1) * (self.width + 2) +
+                              neighbor_ys[rows, cols] + 1)
+                out[2].append(elevations[rows, cols])
+        return (*self._group(*high), *self._group(*edge))
+
+    def _group(self,
+            labels: List[NDArray],
+            pixels: List[NDArray],
+            elevations: List[NDArray]
+        ) -> Tuple[NDArray, NDArray, NDArray]:
+        """
+        Deduplicate (label, pixel) pairs and sort them into CSR form.
+        """
+        if not labels:
+            return (numpy.empty(0, dtype=numpy.int64),
+                    numpy.empty(0, dtype=numpy.float64),
+                    numpy.zeros(len(self) + 1, dtype=numpy.int64))
+        labels = numpy.concatenate(labels)
+        pixels = numpy.concatenate(pixels)
+        elevations = numpy.concatenate(elevations)
+        order = numpy.lexsort((pixels, labels))
+        labels, pixels, elevations = labels[order], pixels[order], elevations[order]
+        keep = numpy.ones(labels.size, dtype=bool)
+        keep[1:] = (labels[1:] != labels[:-1]) | (pixels[1:] != pixels[:-1])
+        return (pixels[keep], elevations[keep],
+                _indptr(labels[keep], len(self)))
+
+    @property
+    def labels(self) -> NDArray:
+        """
+        Dense int32 label array shaped like the raster. Built on first use.
+        """
+        if self._labels is None:
+            self._labels = numpy.zeros((self.datamap.max_x + 1, self.width),
+                                       dtype=numpy.int32)
+            self._labels.flat[self.pixels] = self.pixel_labels
+        return self._labels
+
+    def label_of(self, x: Numpy_X, y: Numpy_Y) -> int:
+        """
+        :param int x: x coordinate in raster data.
+        :param int y: y coordinate in raster data.
+        :return: label of the plateau x, y is a member of, or 0.
+        """
+        pixel = x * self.width + y
+        idx = numpy.searchsorted(self.pixels, pixel)
+        if idx < self.pixels.size and self.pixels[idx] == pixel:
+            return int(self.pixel_labels[idx])
+        return 0
+
+    def member_xys(self, label: int) -> Tuple[NDArray, NDArray]:
+        """
+        :param int label: plateau label.
+        :return: (xs, ys) of the members of label.
+        """
+        members = self.members[self.member_indptr[label - 1]:self.member_indptr[label]]
+        return numpy.divmod(members, self.width)
+
+    def high_perimeter(self, label: int) -> List[XY_Elevation]:
+        """
+        :param int label: plateau label.
+        :return: high perimeter points of label as (x, y, ele), in the
+         same order as the findHighPerimeter() of its blob().
+        """
+        span = slice(self.perimeter_indptr[label - 1], self.perimeter_indptr[label])
+        return _points(self.perimeter[span], self.perimeter_elevations[span],
+                       self.width)
+
+    def blob(self,
+            label: int,
+            elevation: Elevation | None = None,
+            packed: bool = False
+        ) -> Tuple[MultiPoint, List[XY_Elevation]]:
+        """
+        Build the :class:`pyprom.lib.containers.multipoint.MultiPoint` for
+        a plateau, as equalHeightBlob would.
+
+        :param int label: plateau label.
+        :param elevation: elevation of the plateau, looked up if not given.
+        :param bool packed: build the MultiPoint and its Perimeter packed,
+         straight from the label arrays.
+        :return: (MultiPoint, list of member points on the map edge)
+        """
+        xs, ys = self.member_xys(label)
+        if elevation is None:
+            elevation = self.datamap.get(int(xs[0]), int(ys[0]))
+        on_edge = ((xs == 0) | (ys == 0) |
+                   (xs == self.datamap.max_x) | (ys == self.datamap.max_y))
+        multipointEdges = [(x, y, elevation) for x, y in
+                           zip(xs[on_edge].tolist(), ys[on_edge].tolist())]
+
+        span = slice(self.perimeter_indptr[label - 1], self.perimeter_indptr[label])
+        if packed:
+            memberPoints = PackedPoints(xs, ys)
+            perimeter_xs, perimeter_ys = numpy.divmod(self.perimeter[span],
+                                                      self.width + 2)
+            perimeter = Perimeter(
+                packedPoints=PackedPoints(perimeter_xs - 1, perimeter_ys - 1,
+                                          self.perimeter_elevations[span]))
+        else:
+            memberPoints = list(zip(xs.tolist(), ys.tolist()))
+            perimeterPoints = _points(self.perimeter[span],
+                                      self.perimeter_elevations[span], self.width)
+            perimeterPointHash = defaultdict(dict)
+            for point in perimeterPoints:
+                perimeterPointHash[point[0]][point[1]] = point
+            perimeter = Perimeter(pointList=perimeterPoints,
+                                  pointIndex=perimeterPointHash)
+        perimeter.datamap = self.datamap
+        perimeter.mapEdge = bool(multipointEdges)
+
+        span = slice(self.edge_perimeter_indptr[label - 1],
+                     self.edge_perimeter_indptr[label])
+        perimeter.mapEdgePoints = _points(self.edge_perimeter[span],
+                                          self.edge_perimeter_elevations[span],
+                                          self.width)
+        return (
+            MultiPoint(
+                memberPoints,
+                elevation,
+                self.datamap,
+                perimeter=perimeter
+                ),
+            multipointEdges
+        )
+
+
+def _indptr(sorted_labels: NDArray, count: int) -> NDArray:
+    """
+    CSR index pointer for labels 1 through count.
+    """
+    return numpy.searchsorted(sorted_labels, numpy.arange(1, count + 2)).astype(numpy.int64)
+
+
+def _points(
+        pixels: NDArray,
+        elevations: NDArray,
+        width: int
+    ) -> List[XY_Elevation]:
+    """
+    Flat padded raster indexes and elevations to a list of
+    (x, y, ele) tuples.
+    """
+    xs, ys = numpy.divmod(pixels, width + 2)
+    return list(zip((xs - 1).tolist(), (ys - 1).tolist(), elevations.tolist()))
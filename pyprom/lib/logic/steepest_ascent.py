@@ -0,0 +1,103 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains a vectorized steepest ascent (D8) direction raster,
+which lets a walk follow precomputed pointers uphill rather than look
+at every neighbor of every pixel it passes.
+"""
+
+from __future__ import annotations
+
+from math import hypot
+
+import numpy
+
+from ..datamaps.base_datamap import FULL_SHIFT_LIST
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from numpy import NDArray
+    from pyprom._typing.type_hints import Numpy_X, Numpy_Y, XY_Elevation
+    from pyprom.lib.datamaps.base_datamap import BaseDataMap
+
+# Direction of pixels with no neighbor as high as themselves.
+NO_ASCENT = 255
+
+# Rows looked at at once while building directions.
+BAND_ROWS = 512
+
+
+def steepest_ascent(
+        datamap: BaseDataMap,
+        band_rows: int = BAND_ROWS
+    ) -> NDArray:
+    """
+    Find the steepest neighbor of every pixel, as
+    :meth:`pyprom.lib.datamaps.base_datamap.BaseDataMap.steepestNeighbor`
+    would: the neighbor with the greatest slope, rise over distance, among
+    neighbors at least as high as the pixel. Ties go to whichever comes
+    first in FULL_SHIFT_LIST.
+
+    :param datamap: datamap to find directions on.
+    :param int band_rows: rows looked at at once.
+    :return: uint8 array shaped like the raster holding the FULL_SHIFT_LIST
+     index of each pixel's steepest neighbor, or NO_ASCENT.
+    """
+    scale = datamap.elevation_scale
+    # Off map neighbors are nodata, and skipped if there isn't one.
+    off_map = numpy.nan if datamap.nodata is None else datamap.nodata
+    distances = [hypot(dx * datamap.geotransform[5], dy * datamap.geotransform[1])
+                 for dx, dy in FULL_SHIFT_LIST]
+    directions = numpy.full((datamap.max_x + 1, datamap.max_y + 1), NO_ASCENT,
+                            dtype=numpy.uint8)
+    for x_offset, band in datamap.iter_row_bands(band_rows):
+        x_stop = x_offset + band.shape[0]
+        elevations = band.astype(numpy.float64) * scale
+        steepest = numpy.full(band.shape, -1.0)
+        out = directions[x_offset:x_stop]
+        views = datamap.neighbor_views(x_offset, x_stop)
+        for shift, (view, distance) in enumerate(zip(views, distances)):
+            dx, dy = FULL_SHIFT_LIST[shift]
+            neighbor = view.astype(numpy.float64) * scale
+            if dx == -1 and x_offset == 0:
+                neighbor[0] = off_map
+            if dx == 1 and x_stop == datamap.max_x + 1:
+                neighbor[-1] = off_map
+            if dy == -1:
+                neighbor[:, 0] = off_map
+            if dy == 1:
+                neighbor[:, -1] = off_map
+            slope = (neighbor - elevations) / distance
+            # NaN fails both comparisons, as it does in steepestNeighbor.
+            steeper = (neighbor >= elevations) & (slope > steepest)
+            steepest[steeper] = slope[steeper]
+            out[steeper] = shift
+    return directions
+
+
+def ascend(
+        directions: NDArray,
+        datamap: BaseDataMap,
+        x: Numpy_X, y: Numpy_Y
+    ) -> XY_Elevation | None:
+    """
+    Follow a pixel's direction to its steepest neighbor.
+
+    :param directions: directions from steepest_ascent.
+    :param datamap: datamap directions were found on.
+    :param int x: x coordinate in raster data.
+    :param int y: y coordinate in raster data.
+    :return: tuple(x, y, elevation) of the steepest neighbor, or None.
+    """
+    direction = directions[x, y]
+    if direction == NO_ASCENT:
+        return None
+    dx, dy = FULL_SHIFT_LIST[direction]
+    _x = x + dx
+    _y = y + dy
+    if datamap.coord_inbounds(_x, _y):
+        return _x, _y, datamap.get(_x, _y)
+    return _x, _y, datamap.nodata
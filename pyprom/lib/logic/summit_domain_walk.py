@@ -5,28 +5,43 @@ This software is distributed under a license that is described in
 the LICENSE file that accompanies it.
 """
 
-from collections import defaultdict
+import numpy
+
 from ..locations.gridpoint import GridPoint
 from ..locations.saddle import Saddle
 from ..locations.runoff import Runoff
 from ..containers.summit_domain import SummitDomain
+from ..containers.summit_domain_labels import SummitDomainLabels
 from .equalheight import equalHeightBlob
 from ..containers.linker import Linker
 from ..containers.saddles import SaddlesContainer
 from ..containers.runoffs import RunoffsContainer
-from ..containers.spot_elevation import SpotElevationContainer
 from ..logic.internal_saddle_network import InternalSaddleNetwork
 from ..logic.tuple_funcs import highest
 from ..logic.shortest_path_by_points import find_closest_point_by_distance_map
+from .steepest_ascent import steepest_ascent, ascend
+from .ascending_basins import ascending_basins
+from .plateaus import PlateauLabels
+from ..parallel import can_fork, fork_map, resolve_workers, shared
 
+from itertools import chain
 from timeit import default_timer
 from datetime import timedelta
 import logging
 
-from typing import TYPE_CHECKING, Set, List, Tuple
+from typing import TYPE_CHECKING, Set, List, Tuple, Dict, Iterator
 if TYPE_CHECKING:
+    from numpy import NDArray
     from pyprom.domain_map import DomainMap
-    from pyprom._typing.type_hints import XY_Elevation
+    from pyprom._typing.type_hints import XY, XY_Elevation
+
+# Saddles handed to a walk worker at once.
+WALK_CHUNK = 64
+
+# How an ascent found by a walk worker ends, see Walk._ascent().
+ASCENT_LABELED = 0
+ASCENT_NOWHERE = 1
+ASCENT_LEVEL = 2
 
 class Walk:
     """
@@ -36,36 +51,92 @@ class Walk:
     """
 
     def __init__(self, 
-            domainmap: DomainMap
+            domainmap: DomainMap,
+            basins: bool = False
         ):
+        """
+        :param domainmap: DomainMap to walk.
+        :param bool basins: assign every point to a SummitDomain up front,
+         see :meth:`assign_basins`, so climbs are just lookups.
+        """
         self.domainmap = domainmap
-        # all points found to be members of a Summit_Domain
-        self.summit_domain_points = defaultdict(dict)
+        self.basins = basins
+        # Walking links summits, saddles and runoffs to each other, which
+        # would be lost on the copies packed containers hand out.
+        for container in (domainmap.summits, domainmap.saddles,
+                          domainmap.runoffs):
+            container.thaw()
+        datamap = domainmap.datamap
+        # SummitDomain membership of every point, see SummitDomainLabels.
+        self.summit_domain_labels = SummitDomainLabels(
+            (datamap.max_x + 1, datamap.max_y + 1))
+        # steepest neighbor of every pixel, see steepest_ascent.
+        self._directions = None
+        # What a walk worker worked out for the saddle being walked,
+        # see _plan_saddle().
+        self._plan = None
+        # What's left of plateaus climb_points() resolved, by each member
+        # left unassigned, see _resolve_plateau().
+        self._unresolved_plateaus: Dict[XY, List] = {}
         self.logger = logging.getLogger('{}'.format(__name__))
 
-        self._prepopulate_summit_domain_points()
+        self._prepopulate_summit_domains()
+        if basins:
+            self.assign_basins()
 
-    def _prepopulate_summit_domain_points(self) -> None:
+    def _prepopulate_summit_domains(self) -> None:
         """
         Finds all summit member points, creates SummitDomain objects,
-        and prepopulates those objects with those member points.
-        This also populates the summit_domain_points which allows us to quickly
-        loop of which SummitDomain if any an X, Y coordinate is a member of.
+        and labels those member points in summit_domain_labels, which
+        allows us to quickly look up which SummitDomain if any an X, Y
+        coordinate is a member of.
         """
-        for summit in self.domainmap.summits:
+        # Convert all the summit lat/longs in one go.
+        summits = self.domainmap.summits.points
+        xs, ys = self.domainmap.datamap.latlons_to_xys(
+            [summit.latitude for summit in summits],
+            [summit.longitude for summit in summits])
+        for summit, x, y in zip(summits, xs.tolist(), ys.tolist()):
             # Already got one? move along.
             if summit.domain:
                 continue
-            sd = SummitDomain(self.domainmap.datamap, summit, [], [])
+            sd = SummitDomain(self.domainmap.datamap, summit, [], [],
+                              labels=self.summit_domain_labels)
             summit.domain = sd
             if summit.multipoint:
-                sd.extend(summit.multipoint.points, self.summit_domain_points)
+                self.summit_domain_labels.assign(sd.label,
+                                                 *summit.multipoint.xys())
             else:
-                x, y = self.domainmap.datamap.latlong_to_xy(summit.latitude,
-                                                  summit.longitude)
-                sd.append((x, y), self.summit_domain_points)
+                sd.append((x, y))
 
 
+    def assign_basins(self) -> None:
+        """
+        Assigns every point on the datamap to the SummitDomain it climbs
+        to in one go, see
+        :func:`pyprom.lib.logic.ascending_basins.ascending_basins`.
+        Plateaus are resolved with the DomainMap's plateau labels, which
+        are made here if the DomainMap doesn't have any.
+        """
+        datamap = self.domainmap.datamap
+        plateaus = self.domainmap.plateaus
+        if plateaus is None:
+            plateaus = PlateauLabels(datamap)
+        self.summit_domain_labels.relabel(
+            ascending_basins(datamap, self.directions, plateaus,
+                             self.summit_domain_labels.labels))
+
+    @property
+    def directions(self) -> NDArray:
+        """
+        Steepest ascent direction of every pixel on the datamap,
+        see :func:`pyprom.lib.logic.steepest_ascent.steepest_ascent`.
+        Built on first use.
+        """
+        if self._directions is None:
+            self._directions = steepest_ascent(self.domainmap.datamap)
+        return self._directions
+
     def climb(self, 
             point: XY_Elevation
         ) -> SummitDomain:
@@ -80,13 +151,27 @@ class Walk:
         :return: :class:`SummitDomain` for which it was determined that this
          point climbed to.
         """
+        summit_domain_labels = self.summit_domain_labels
+        # Every point was assigned up front, nothing to climb.
+        if self.basins:
+            return summit_domain_labels.get(point[0], point[1])
+        # Did a walk worker already find the way up?
+        if self._plan is not None:
+            ascent = self._plan[3].get((point[0], point[1]))
+            if ascent is not None:
+                resolved, summit_domain = self._follow(ascent)
+                if resolved:
+                    return summit_domain
         climbed_points = [point]
         current_point = point
         # are we a summit right off the bat?
-        if self.summit_domain_points[point[0]].get(point[1], None):
-            return self.summit_domain_points[point[0]][point[1]]
+        summit_domain = summit_domain_labels.get(point[0], point[1])
+        if summit_domain:
+            return summit_domain
+        datamap = self.domainmap.datamap
+        directions = self.directions
         while True:
-            sn = self.domainmap.datamap.steepestNeighbor(current_point[0], current_point[1])
+            sn = ascend(directions, datamap, current_point[0], current_point[1])
 
             if not sn:
                 self.logger.info(f"Strip Went Nowhere! Ends at {current_point} climbed points: {climbed_points}")
@@ -94,18 +179,98 @@ class Walk:
 
             # If the steepest neighbor is already a member of a SummitDomain,
             # add all climbed points to that Summit domain, and return that SummitDomain
-            if self.summit_domain_points[sn[0]].get(sn[1], None):
-                self.summit_domain_points[sn[0]][sn[1]].extend(climbed_points,
-                                                               self.summit_domain_points)
-                return self.summit_domain_points[sn[0]][sn[1]]
+            summit_domain = summit_domain_labels.get(sn[0], sn[1])
+            if summit_domain:
+                summit_domain.extend(climbed_points)
+                return summit_domain
             # equal height? (idx 2 is elevation)
             if sn[2] == current_point[2]:
                 summit_domain = self.climb_points([], sn)
-                summit_domain.extend(climbed_points, self.summit_domain_points)
+                if not summit_domain:
+                    self.logger.info(f"Plateau at {sn} went nowhere! climbed points: {climbed_points}")
+                    return None
+                summit_domain.extend(climbed_points)
                 return summit_domain
             climbed_points.append(sn)
             current_point = sn
 
+    def _ascent(self,
+            point: XY_Elevation
+        ) -> Tuple[NDArray, NDArray, int, XY_Elevation | None] | None:
+        """
+        Find the way up from point, in a walk worker, the same way climb()
+        would, without assigning anything. The way up only depends on
+        the datamap, so it's the same whenever it's followed, only where
+        it meets an assigned point can change. The ascent stops at the
+        first point already assigned, a level step onto a plateau, or
+        where it goes nowhere.
+
+        :param point: (x, y, ele)
+        :return: (xs, ys, ASCENT_*, level point stepped onto or None),
+         or None if the ascent goes off the map.
+        """
+        summit_domain_labels = self.summit_domain_labels
+        datamap = self.domainmap.datamap
+        directions = self.directions
+        xs = [point[0]]
+        ys = [point[1]]
+        current_point = point
+        end = ASCENT_LABELED
+        entry = None
+        if not summit_domain_labels.get(point[0], point[1]):
+            while True:
+                sn = ascend(directions, datamap, current_point[0], current_point[1])
+                if not sn:
+                    end = ASCENT_NOWHERE
+                    break
+                if not datamap.coord_inbounds(sn[0], sn[1]):
+                    return None
+                xs.append(sn[0])
+                ys.append(sn[1])
+                if summit_domain_labels.get(sn[0], sn[1]):
+                    break
+                if sn[2] == current_point[2]:
+                    end = ASCENT_LEVEL
+                    entry = sn
+                    break
+                current_point = sn
+        return (numpy.array(xs, dtype=numpy.int64),
+                numpy.array(ys, dtype=numpy.int64), end, entry)
+
+    def _follow(self,
+            ascent: Tuple[NDArray, NDArray, int, XY_Elevation | None]
+        ) -> Tuple[bool, SummitDomain | None]:
+        """
+        Climb along an ascent found by _ascent(), assigning its points
+        just as climb() would have.
+
+        :param ascent: (xs, ys, ASCENT_*, level point stepped onto or None)
+        :return: (True, :class:`SummitDomain` or None as climb() would
+         return) or (False, None) if climb() needs to climb after all.
+        """
+        xs, ys, end, entry = ascent
+        summit_domain_labels = self.summit_domain_labels
+        labels = summit_domain_labels.labels[xs, ys]
+        assigned = numpy.flatnonzero(labels)
+        if assigned.size:
+            first = assigned[0]
+            summit_domain = summit_domain_labels.domains[labels[first]]
+            if first:
+                summit_domain_labels.assign(summit_domain.label, xs[:first], ys[:first])
+            return True, summit_domain
+        if end == ASCENT_NOWHERE:
+            self.logger.info(f"Strip Went Nowhere! Ends at {(xs[-1], ys[-1])} climbed points: {len(xs)}")
+            return True, None
+        if end == ASCENT_LEVEL:
+            summit_domain = self.climb_points([], entry)
+            if not summit_domain:
+                self.logger.info(f"Plateau at {entry} went nowhere! climbed points: {len(xs) - 1}")
+                return True, None
+            summit_domain_labels.assign(summit_domain.label, xs[:-1], ys[:-1])
+            return True, summit_domain
+        # Wherever the worker stopped isn't assigned anymore.
+        return False, None
+
     def climb_points(self, 
             points: XY_Elevation, 
             entryPoint: XY_Elevation | None = None,
@@ -131,8 +296,13 @@ class Walk:
         summit_domains = set()
         # Entrypoint means we know this is an equalheight
         if entryPoint:
-            mp, _ = equalHeightBlob(self.domainmap.datamap, entryPoint[0], entryPoint[1], entryPoint[2])
-            points = mp.perimeter.findHighPerimeter(entryPoint[2])  # needs better logic, this currently blindly overwrites points
+            resolution = self._resolve_plateau(entryPoint)
+            generation = self.summit_domain_labels.generation
+            # Nothing was assigned since what's left of this plateau went
+            # nowhere, so it would go nowhere again.
+            if resolution[3] == generation:
+                return None
+            points = resolution[0]  # needs better logic, this currently blindly overwrites points
         # Loop and climb!
         for point in points:
             sd = self.climb(point)
@@ -142,23 +312,137 @@ class Walk:
                 self.logger.info("point {} didn't climb anywhere!".format(point))
 
         if entryPoint:
-            closest = find_closest_point_by_distance_map(mp.points, mp.perimeter.findHighPerimeter(mp.elevation))
-            for internal_pt, highPerimeter in closest.items():
-                # assign all internal members of the multipoint to the summit domain of the closest highPerimeter
-                self.summit_domain_points[internal_pt[0]][internal_pt[1]] = self.summit_domain_points[highPerimeter[0]][highPerimeter[1]]
-            return self.summit_domain_points[entryPoint[0]][entryPoint[1]]
+            # Climbs from the high perimeter never come back down to
+            # the plateau, so only what they assigned can change them.
+            settled = generation == self.summit_domain_labels.generation
+            # assign all internal members of the multipoint to the summit domain of the closest highPerimeter
+            _, internal, highPerimeters, _ = resolution
+            self.summit_domain_labels.copy(internal[:, 0], internal[:, 1],
+                                           highPerimeters[:, 0], highPerimeters[:, 1])
+            self._prune_plateau(resolution)
+            resolution[3] = self.summit_domain_labels.generation if settled else None
+            return self.summit_domain_labels.get(entryPoint[0], entryPoint[1])
         else:
             return summit_domains
 
+    def _resolve_plateau(self,
+            entryPoint: XY_Elevation
+        ) -> List:
+        """
+        Find the high perimeter of the plateau entryPoint is on, and the
+        closest high perimeter point of each of its members.
+
+        Plateaus are only flooded and measured the first time a climb
+        steps onto them. Members whose closest high perimeter point went
+        nowhere are left unassigned, and are the only way a later climb
+        can step onto the plateau again. So what's left of the plateau,
+        its unassigned members and high perimeter points, is kept by
+        each of those members, see _prune_plateau(). A later climb onto
+        one looks it up, rather than flooding the plateau again, and
+        only climbs from, and assigns, what's left. If what's left went
+        nowhere, and no label changed since, it would go nowhere again,
+        see climb_points().
+
+        :param entryPoint: (x, y, ele)
+        :return: [high perimeter points, (x, y) of every member, (x, y)
+         of the closest high perimeter point to each member, label
+         generation as of which what's left went nowhere, or None]
+        """
+        x, y, elevation = entryPoint[:3]
+        resolution = self._unresolved_plateaus.get((x, y))
+        if resolution is not None:
+            # Members might have been assigned some other way since.
+            if resolution[3] != self.summit_domain_labels.generation:
+                self._prune_plateau(resolution)
+            return resolution
+
+        plateaus = self.domainmap.plateaus
+        if plateaus is not None:
+            mp, _ = plateaus.blob(plateaus.label_of(x, y), elevation)
+        else:
+            mp, _ = equalHeightBlob(self.domainmap.datamap, x, y, elevation)
+        highPerimeter = mp.perimeter.findHighPerimeter(elevation)
+        closest = find_closest_point_by_distance_map(mp.points, highPerimeter)
+        internal = numpy.array([pt[:2] for pt in closest.keys()], dtype=numpy.int64).reshape(-1, 2)
+        highPerimeters = numpy.array([pt[:2] for pt in closest.values()], dtype=numpy.int64).reshape(-1, 2)
+        return [highPerimeter, internal, highPerimeters, None]
+
+    def _prune_plateau(self, resolution: List) -> None:
+        """
+        Drop members, and high perimeter points, of a resolved plateau
+        which are now assigned, and keep what's left by each member left
+        unassigned, see _resolve_plateau(). Once a whole plateau is
+        assigned, nothing is kept.
+
+        :param resolution: see _resolve_plateau().
+        """
+        highPerimeter, internal, highPerimeters, _ = resolution
+        labels = self.summit_domain_labels.labels
+        unassigned = labels[internal[:, 0], internal[:, 1]] == 0
+        for x, y in internal[~unassigned].tolist():
+            self._unresolved_plateaus.pop((x, y), None)
+        resolution[0] = [point for point in highPerimeter
+                         if not labels[point[0], point[1]]]
+        resolution[1] = internal[unassigned]
+        resolution[2] = highPerimeters[unassigned]
+        for x, y in resolution[1].tolist():
+            self._unresolved_plateaus[(x, y)] = resolution
+
     def climb_from_saddles(self, 
-            saddles: List[Saddle] | List = []
+            saddles: List[Saddle] | List = [],
+            workers: int | None = 1
         ) -> Tuple[SaddlesContainer, RunoffsContainer, List[Linker], Set[SummitDomain]]:
         """
         Climbs from all saddles contained in self.domainmap.saddles
+
+        With more than one worker, forked processes work out the synthetic
+        saddles of, and the ascents from, saddles ahead of the one being
+        walked, see :meth:`_plan_saddle`. Saddles are still walked one by
+        one, in order, so linkers and summit domains are the same
+        regardless of how many workers there are. Summit domain labels
+        are kept in shared memory meanwhile, so workers stop their
+        ascents wherever they meet an already assigned point.
+
+        :param int workers: processes to walk with. None for one per
+         core. Platforms which can't fork use one.
         :return: walkedSaddles, walkedRunOffs, linkers, summitDomains
         """
         if not saddles:
-            saddles = SpotElevationContainer(self.domainmap.saddles.points + self.domainmap.runoffs.points)
+            saddles = list(self.domainmap.saddles) + list(self.domainmap.runoffs)
+        # Packed containers build new objects every time they're iterated.
+        saddles = list(saddles)
+        plans = None
+        workers = resolve_workers(workers)
+        if workers > 1 and can_fork() and saddles:
+            # Build directions before forking, so workers share them.
+            if not self.basins:
+                self.directions
+            self.summit_domain_labels.share()
+            chunks = [(start, min(start + WALK_CHUNK, len(saddles)))
+                      for start in range(0, len(saddles), WALK_CHUNK)]
+            plans = fork_map(_plan_chunk, chunks, (self, saddles), workers,
+                             initializer=self.domainmap.datamap.reopen)
+        try:
+            return self._climb_from_saddles(
+                saddles, None if plans is None else chain.from_iterable(plans))
+        finally:
+            self._plan = None
+            if plans is not None:
+                plans.close()
+                self.summit_domain_labels.unshare()
+
+    def _climb_from_saddles(self,
+            saddles: List[Saddle],
+            plans: Iterator[Tuple] | None
+        ) -> Tuple[SaddlesContainer, RunoffsContainer, List[Linker], Set[SummitDomain]]:
+        """
+        Climbs from saddles, one by one, see climb_from_saddles().
+
+        :param saddles: saddles to climb from.
+        :param plans: iterator of what a worker worked out for each saddle,
+         see :meth:`_plan_saddle`, or None to work everything out here.
+        :return: walkedSaddles, walkedRunOffs, linkers, summitDomains
+        """
         walkedFeatures = list()
         linkers = list()
         summitDomains = set()
@@ -178,13 +462,15 @@ class Walk:
                         round(now - then, 2)
                     ))
                 then = now
+            if plans is not None:
+                self._plan = next(plans)
 
             # If this saddle is not an edgeEffect, we can build a Synthetic Saddle
             # and just walk up from the highPerimeter points closest to other high perimeter neighborhoods.
             saddlesUnderTest = [basesaddle]
             synthetic = False
             if not basesaddle.edgeEffect:
-                saddlesUnderTest = self.generate_synthetic_saddles(basesaddle)
+                saddlesUnderTest = self._synthetic_saddles(basesaddle)
                 synthetic = True
             # loop through synthetic/non synthetic saddles.
             # non synthetic saddles will have their full highEdges explored.
@@ -213,7 +499,7 @@ class Walk:
                         # No highPerimeterNeighborhoods, means this is a Summit-Like Runoff, look for matching summit domain at runoff point.
                         if not saddle.highPerimeterNeighborhoods:
                             point = saddle.toXYTuple(self.domainmap.datamap)
-                            sd = self.summit_domain_points[point[0]].get(point[1], None)
+                            sd = self.summit_domain_labels.get(point[0], point[1])
                             # nothing there? continue.
                             if not sd:
                                 self.logger.info("Failed to find SummitDomain for summit-like Runoff {}".format(saddle))
@@ -229,11 +515,11 @@ class Walk:
                             # if we are a Runoff and there is a high edge, treat like any old Saddle
                             # becasue we walk from all highPerimeterNeighborhoods points, this should be OK.
                             edge_saddles = [saddle]
-                    edge_saddles = self.generate_synthetic_saddles(saddle) if not edge_saddles else edge_saddles
+                    edge_saddles = self._synthetic_saddles(saddle) if not edge_saddles else edge_saddles
                     for edge_saddle in edge_saddles:
                         for highEdge in edge_saddle.highPerimeterNeighborhoods:
                             h0 = highEdge[0]
-                            sd = self.summit_domain_points[h0[0]].get(h0[1], None)
+                            sd = self.summit_domain_labels.get(h0[0], h0[1])
                             # nothing there? continue.
                             if not sd:
                                 self.logger.info("highEdge {} in NON-synthetic saddle {} was not a summit domain member.".format(h0, edge_saddle))
@@ -257,7 +543,7 @@ class Walk:
                     # synthetic saddles only have 1 point in each HS, so we know they'll be a domain member.
                     for highEdge in saddle.highPerimeterNeighborhoods:
                         h0 = highEdge[0]
-                        sd = self.summit_domain_points[h0[0]].get(h0[1], None)
+                        sd = self.summit_domain_labels.get(h0[0], h0[1])
                         if not sd:
                             self.logger.info("highEdge {} in synthetic saddle {} was not a summit domain member.".format(h0, saddle))
                             continue
@@ -279,6 +565,64 @@ class Walk:
 
         return walkedSaddles, walkedRunOffs, linkers, summitDomains
 
+    def _plan_saddle(self,
+            basesaddle: Saddle
+        ) -> Tuple[bool, List[Saddle] | None, bool, Dict[XY, Tuple]]:
+        """
+        Work out, in a walk worker, whatever the walk of basesaddle
+        needs that doesn't depend on the walk of any other saddle: its
+        synthetic saddles, and the ascents from their high edges.
+
+        :param basesaddle: saddle to be walked.
+        :return: (whether synthetic saddles were generated, synthetic
+         saddles or None if basesaddle is its own, whether they were
+         made children of basesaddle, {(x, y): ascent from _ascent()})
+        """
+        generated = False
+        synthetic = None
+        children = False
+        # Edge effect runoffs with high edges are walked as they are.
+        if not (basesaddle.edgeEffect and isinstance(basesaddle, Runoff) and
+                basesaddle.highPerimeterNeighborhoods):
+            generated = True
+            synthetic = self.generate_synthetic_saddles(basesaddle)
+            if len(synthetic) == 1 and synthetic[0] is basesaddle:
+                synthetic = None
+            else:
+                # Parents stay behind, _synthetic_saddles() links the
+                # parent's own.
+                children = any(s.parent is basesaddle for s in synthetic)
+                for syntheticSaddle in synthetic:
+                    syntheticSaddle.parent = None
+        ascents = dict()
+        if not self.basins:
+            saddlesUnderTest = [basesaddle]
+            if not basesaddle.edgeEffect and synthetic:
+                saddlesUnderTest = synthetic
+            for saddle in saddlesUnderTest:
+                for highEdge in saddle.highPerimeterNeighborhoods:
+                    for point in highEdge:
+                        if (point[0], point[1]) not in ascents:
+                            ascent = self._ascent(point)
+                            if ascent is not None:
+                                ascents[(point[0], point[1])] = ascent
+        return generated, synthetic, children, ascents
+
+    def _synthetic_saddles(self, saddle: Saddle) -> List[Saddle]:
+        """
+        generate_synthetic_saddles(), unless a walk worker already did.
+        """
+        if self._plan is None or not self._plan[0]:
+            return self.generate_synthetic_saddles(saddle)
+        _, synthetic, children, _ = self._plan
+        if synthetic is None:
+            return [saddle]
+        if children:
+            for syntheticSaddle in synthetic:
+                syntheticSaddle.parent = saddle
+                saddle.children.append(syntheticSaddle)
+        return synthetic
+
     def generate_synthetic_saddles(self, saddle: Saddle) -> List[Saddle]:
 
         # This should not be, just return it.
@@ -318,3 +662,14 @@ class Walk:
         newSaddle.highPerimeterNeighborhoods = highPerimeterNeighborhoods
         return [newSaddle]
 
+
+def _plan_chunk(chunk: Tuple[int, int]) -> List[Tuple]:
+    """
+    Work out the walk of a chunk of saddles, in a forked worker. The
+    worker's copy of the parent's Walk and saddles do the work.
+
+    :param chunk: (first saddle, saddle to stop at)
+    :return: _plan_saddle() of each saddle in chunk.
+    """
+    walk, saddles = shared()
+    return [walk._plan_saddle(saddle) for saddle in saddles[chunk[0]:chunk[1]]]
@@ -0,0 +1,103 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+
+This file contains helpers for spreading work over forked worker processes.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from typing import Any, Callable, Iterable, Iterator
+
+# Tasks submitted per worker before waiting on the oldest.
+IN_FLIGHT_PER_WORKER = 2
+
+# State handed to forked workers. fork_map sets this in the parent right
+# before the pool forks, so workers inherit it instead of unpickling it.
+_shared = None
+
+
+def can_fork() -> bool:
+    """
+    :return: True if this platform can fork worker processes.
+    """
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+
+def resolve_workers(workers: int | None) -> int:
+    """
+    :param int workers: requested worker processes. None (or 0) for one
+     per available core.
+    :return: number of worker processes to use.
+    """
+    if workers:
+        return max(1, workers)
+    if hasattr(os, 'process_cpu_count'):
+        return os.process_cpu_count() or 1
+    return os.cpu_count() or 1
+
+
+def shared() -> Any:
+    """
+    :return: the state fork_map handed to this worker.
+    """
+    return _shared
+
+
+def fork_map(
+        function: Callable[[Any], Any],
+        tasks: Iterable[Any],
+        state: Any,
+        workers: int,
+        initializer: Callable[[], None] | None = None
+    ) -> Iterator[Any]:
+    """
+    Generator returns function(task) for each task, in order, computed in
+    forked worker processes.
+
+    Workers inherit `state`, available to function through shared(), by
+    forking rather than pickling, so it can be large or unpicklable
+    (GDAL datasets for instance). Tasks and results are pickled.
+    Only a couple of tasks per worker are in flight at once, so results
+    don't pile up ahead of a slow consumer.
+
+    :param function: module level function of one task.
+    :param tasks: iterable of tasks.
+    :param state: state shared with workers.
+    :param int workers: number of worker processes.
+    :param initializer: called in each worker once it's forked.
+    """
+    global _shared
+    _shared = state
+    try:
+        context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(max_workers=workers,
+                                 mp_context=context,
+                                 initializer=_initialize_worker,
+                                 initargs=(initializer,)) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(function, task))
+                if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+    finally:
+        _shared = None
+
+
+def _initialize_worker(initializer: Callable[[], None] | None) -> None:
+    """
+    Every worker forks with its parent's random state, which would hand
+    out the same feature ids in every worker. Reseed, then initialize.
+    """
+    random.seed()
+    if initializer is not None:
+        initializer()
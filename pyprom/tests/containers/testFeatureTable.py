@@ -0,0 +1,95 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+"""
+
+import unittest
+from pyprom.lib.containers.feature_table import FeatureTable
+from pyprom.lib.containers.saddles import SaddlesContainer
+from pyprom.lib.containers.summits import SummitsContainer
+from pyprom.lib.containers.linker import Linker
+from pyprom.lib.locations.saddle import Saddle
+from pyprom.lib.locations.summit import Summit
+from pyprom.feature_discovery import AnalyzeData
+from pyprom.tests.getData import gettestzip
+from pyprom.lib.loaders.gdal_loader import GDALLoader
+
+
+class FeatureTableTests(unittest.TestCase):
+    """Test FeatureTable."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set Up Tests."""
+        gettestzip()
+        cls.datafile = GDALLoader('/tmp/N44W072.hgt')
+        cls.datamap = cls.datafile.to_datamap()
+        cls.someslice = cls.datamap.subset(1000, 1000, 100, 100)
+
+    def assertSameFeature(self, a, b):
+        """
+        Ensure two features have the same attributes.
+        """
+        self.assertEqual(type(a), type(b))
+        self.assertEqual(a.id, b.id)
+        self.assertEqual((a.latitude, a.longitude, a.elevation),
+                         (b.latitude, b.longitude, b.elevation))
+        self.assertEqual(a.edgeEffect, b.edgeEffect)
+        self.assertEqual(a.edgePoints, b.edgePoints)
+        self.assertEqual(a.disqualified, b.disqualified)
+        self.assertIs(a.multipoint or None, b.multipoint or None)
+        if isinstance(a, Saddle):
+            self.assertEqual(a.highPerimeterNeighborhoods,
+                             b.highPerimeterNeighborhoods)
+            self.assertEqual(a.parent.id if a.parent else None,
+                             b.parent.id if b.parent else None)
+            self.assertEqual([c.id for c in a.children],
+                             [c.id for c in b.children])
+
+    def testFeatureTableRoundTrip(self):
+        """
+        Ensure packed features are built back the way they were.
+        """
+        summits, saddles, runoffs = AnalyzeData(self.someslice).run()
+        for container in (summits, saddles, runoffs):
+            table = FeatureTable.from_features(container)
+            self.assertEqual(len(table), len(container))
+            for a, b in zip(container, table):
+                self.assertSameFeature(a, b)
+
+    def testFeatureTableRefusesLinkedFeatures(self):
+        """
+        Ensure features linked to other features can't be packed.
+        """
+        summit = Summit(1, 2, 3)
+        saddle = Saddle(1, 2, 2)
+        linker = Linker(summit, saddle)
+        saddle.addSummitLinker(linker)
+        with self.assertRaises(ValueError):
+            FeatureTable.from_features([saddle])
+
+    def testPackedRun(self):
+        """
+        Ensure packed containers answer the same as unpacked ones,
+        and thaw when they're modified.
+        """
+        summits = AnalyzeData(self.someslice).run(packed=False)[0]
+        packed, saddles, runoffs = AnalyzeData(self.someslice).run(packed=True)
+        for container in (packed, saddles, runoffs):
+            self.assertTrue(container.packed)
+        self.assertIsInstance(packed, SummitsContainer)
+        self.assertIsInstance(saddles, SaddlesContainer)
+        self.assertEqual(len(packed), len(summits))
+        self.assertEqual([s.elevation for s in packed.highest],
+                         [s.elevation for s in summits.highest])
+        self.assertEqual([(s.latitude, s.longitude) for s in packed.elevationRangeMetric(200, 400)],
+                         [(s.latitude, s.longitude) for s in summits.elevationRangeMetric(200, 400)])
+        summit = packed[3]
+        self.assertEqual(packed.by_id(summit.id).elevation, summit.elevation)
+        self.assertEqual(packed.index(summit), 3)
+
+        packed.append(Summit(1, 2, 3))
+        self.assertFalse(packed.packed)
+        self.assertEqual(len(packed), len(summits) + 1)
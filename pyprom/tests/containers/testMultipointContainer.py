@@ -300,4 +300,40 @@ class MultipointTests(unittest.TestCase):
         result = mp.points_with_elevation()
         self.assertEqual(pwe, result)
 
+    def testMultiPointClosestMixed(self):
+        """
+        Ensure closestPoint() copes with members with and without
+        elevations in the same MultiPoint.
+        """
+        mp = MultiPoint([(100, 200), (100, 201, 100), (105, 205),
+                         (109, 209, 100)], 100, self.datamap)
+        self.assertEqual(mp.closestPoint(GridPoint(108, 208, 100)),
+                         GridPoint(109, 209, 100))
+        self.assertEqual(mp.xys()[1].tolist(), [200, 201, 205, 209])
 
+    def testMultiPointPacked(self):
+        """
+        Ensure a packed MultiPoint answers the same as an unpacked one.
+        """
+        points = []
+        for x in range(100, 110):
+            for y in range(200, 210):
+                points.append((x, y))
+        mp = MultiPoint(list(points), 100, self.datamap)
+        mp.pack()
+        self.assertIsNotNone(mp.packed)
+        self.assertEqual(mp.points, points)
+        self.assertEqual(list(mp), points)
+        self.assertEqual(len(mp), 100)
+        self.assertEqual(mp[-1], BaseGridPoint(109, 209))
+        self.assertEqual(mp.closestPoint(GridPoint(200, 0, 1)),
+                         GridPoint(109, 200, 100))
+        # Equally close, the first wins.
+        self.assertEqual(mp.closestPoint(GridPoint(99, 0, 1)),
+                         GridPoint(100, 200, 100))
+        self.assertEqual(mp.points_with_elevation()[0], (100, 200, 100))
+
+        # Modifying unpacks.
+        mp.append((110, 200))
+        self.assertIsNone(mp.packed)
+        self.assertEqual(mp.points, points + [(110, 200)])
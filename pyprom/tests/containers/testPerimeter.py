@@ -294,3 +294,30 @@ class PerimeterTests(unittest.TestCase):
         self.assertEqual(newPerimeter.mapEdgePoints,
                          self.perimeter.mapEdgePoints)
         self.assertEqual(newPerimeter.pointIndex, self.perimeter.pointIndex)
+
+    def testPerimeterPacked(self):
+        """
+        Ensure a packed Perimeter answers the same as an unpacked one.
+        """
+        points = [self.p11, self.p12, self.p13, self.p14,
+                  self.p24, self.p25, self.p26]
+        perimeter = Perimeter(pointList=list(points), datamap=self.datamap)
+        perm = Perimeter(pointList=list(points), datamap=self.datamap)
+        perm.pack()
+        self.assertIsNotNone(perm.packed)
+        self.assertEqual(perm.points, points)
+        self.assertEqual(len(perm), len(points))
+        self.assertEqual(perm[1], self.p12)
+        for point in points:
+            self.assertEqual(sorted(perm.iterNeighborFull(point)),
+                             sorted(perimeter.iterNeighborFull(point)))
+            self.assertEqual(sorted(perm.iterNeighborOrthogonal(point)),
+                             sorted(perimeter.iterNeighborOrthogonal(point)))
+        self.assertEqual(perm.findHighPerimeter(553),
+                         perimeter.findHighPerimeter(553))
+        self.assertEqual(perm.to_dict(), perimeter.to_dict())
+
+        # Modifying unpacks.
+        perm.append((5, 5, 600))
+        self.assertIsNone(perm.packed)
+        self.assertEqual(perm.findHighPerimeter(599), [(5, 5, 600)])
@@ -310,3 +310,29 @@ class SaddlesContainerRebuildTests(unittest.TestCase):
         self.assertEqual(len(newSaddles), 2)
         self.assertEqual(newSaddles[0], ns0)
         self.assertEqual(newSaddles[1], ns1)
+
+    def testSaddlesContainerRebuildWorkers(self):
+        """
+        Ensure rebuilding in worker processes produces the same saddles,
+        in the same order, with their parent/child links.
+        """
+        islands = generate_multipoint_saddle(100, 200, 10, 10, self.datamap,
+                                             self.elevation, self.islands, 2)
+        island = generate_multipoint_saddle(100, 200, 10, 10, self.datamap,
+                                            self.elevation, self.island, 2)
+        island.edgeEffect = True
+        single = Saddle(44.97236111111111, -71.94458333333333, 1000)
+        saddles = SaddlesContainer([islands, single, island])
+        serial = saddles.rebuildSaddles(self.datamap)
+        island.children = []
+        island.disqualified = False
+        parallel = saddles.rebuildSaddles(self.datamap, workers=3)
+        self.assertEqual(len(parallel), len(serial))
+        for a, b in zip(serial, parallel):
+            self.assertEqual(a, b)
+            self.assertEqual(a.highPerimeterNeighborhoods,
+                             b.highPerimeterNeighborhoods)
+            self.assertIs(a.parent, b.parent)
+        self.assertIs(parallel[-1], island)
+        self.assertTrue(island.disqualified)
+        self.assertEqual(island.children, parallel[4:6])
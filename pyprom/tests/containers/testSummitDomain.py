@@ -6,6 +6,8 @@ the LICENSE file that accompanies it.
 """
 
 import unittest
+
+import numpy
 from pyprom.tests.getData import gettestzip
 from pyprom.lib.loaders.gdal_loader import GDALLoader
 from pyprom.domain_map import DomainMap
@@ -99,6 +101,26 @@ class SummitsDomainTests(unittest.TestCase):
         sd.extend([(2, 2, 2)], externalHash=hash)
         self.assertEqual(hash[2][2], sd)
 
+    def testSummitDomainLabels(self):
+        """
+        Ensure walked SummitDomains read their points out of the label
+        raster, and label whatever is appended to them.
+        """
+        sd = self.test_summit_domain
+        labels = sd.labels.labels
+        self.assertEqual(labels.dtype, numpy.int32)
+        xs, ys = numpy.nonzero(labels == sd.label)
+        self.assertEqual(sd.points, list(zip(xs.tolist(), ys.tolist())))
+        self.assertIs(sd.labels.get(xs[0], ys[0]), sd)
+        self.assertIsNone(sd.labels.get(-1, 0))
+
+        unassigned = numpy.argwhere(labels == 0)[0].tolist()
+        sd.append((unassigned[0], unassigned[1], 1))
+        self.assertIn(tuple(unassigned), sd.points)
+        self.assertIs(sd.labels.get(*unassigned), sd)
+        sd.labels.assign(0, [unassigned[0]], [unassigned[1]])
+        self.assertNotIn(tuple(unassigned), sd.points)
+
     def testSummitDomainRemoveSaddle(self):
         """
         Ensure Saddle removal function works.
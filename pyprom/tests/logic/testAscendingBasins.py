@@ -0,0 +1,67 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+"""
+
+import unittest
+
+import numpy
+from pyprom.tests.getData import gettestzip
+from pyprom.lib.loaders.gdal_loader import GDALLoader
+from pyprom.lib.logic.ascending_basins import ascending_basins
+from pyprom.lib.logic.plateaus import PlateauLabels
+from pyprom.lib.logic.steepest_ascent import (NO_ASCENT, ascend,
+                                              steepest_ascent)
+
+
+class AscendingBasinsTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Set Up Tests."""
+        gettestzip()
+        cls.datafile = GDALLoader('/tmp/N44W072.hgt')
+        cls.datamap = cls.datafile.to_datamap()
+        cls.someslice = cls.datamap.subset(1000, 1000, 100, 100)
+
+    def testAscendingBasinsFollowSteepestAscent(self):
+        """
+        Ensure every pixel off a plateau (and not nodata) gets the label
+        of its steepest neighbor, and seeds keep theirs.
+        """
+        datamap = self.someslice
+        directions = steepest_ascent(datamap)
+        plateaus = PlateauLabels(datamap)
+        seeds = numpy.zeros(directions.shape, dtype=numpy.int32)
+        summits = numpy.argwhere(directions == NO_ASCENT)
+        seeds[summits[:, 0], summits[:, 1]] = numpy.arange(1, len(summits) + 1)
+        labels = ascending_basins(datamap, directions, plateaus, seeds,
+                                  band_rows=7)
+        self.assertEqual(labels.dtype, numpy.int32)
+        numpy.testing.assert_array_equal(labels[seeds > 0], seeds[seeds > 0])
+        valid = ~datamap.nodata_mask(datamap.numpy_array)
+        for x, y in numpy.argwhere((plateaus.labels == 0) & valid).tolist():
+            neighbor = ascend(directions, datamap, x, y)
+            if neighbor is None or not datamap.coord_inbounds(*neighbor[:2]):
+                continue
+            self.assertEqual(labels[x, y], labels[neighbor[0], neighbor[1]])
+
+    def testAscendingBasinsPlateau(self):
+        """
+        Ensure members of a plateau go to their closest high perimeter
+        point, the first one found on a tie.
+        """
+        datamap = self.datamap.subset(0, 0, 3, 5)
+        datamap.numpy_array_override(numpy.array([[9, 5, 5, 5, 8],
+                                                  [4, 5, 5, 5, 4],
+                                                  [1, 2, 2, 2, 1]]))
+        seeds = numpy.zeros((3, 5), dtype=numpy.int32)
+        seeds[0, 0] = 1
+        seeds[0, 4] = 2
+        labels = ascending_basins(datamap, steepest_ascent(datamap),
+                                  PlateauLabels(datamap), seeds)
+        numpy.testing.assert_array_equal(labels[:2], [[1, 1, 1, 2, 2],
+                                                      [1, 1, 1, 2, 2]])
+        self.assertTrue(labels.all())
@@ -0,0 +1,40 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+"""
+
+import unittest
+
+from pyprom.lib.logic.contiguous_neighbors import (contiguous_neighbors,
+                                                   touching_neighborhoods)
+
+
+class ContiguousNeighborsTests(unittest.TestCase):
+
+    def testContiguousNeighbors(self):
+        """
+        Ensure points touching orthogonally or diagonally are grouped.
+        """
+        points = [(0, 0, 1), (0, 1, 1), (1, 2, 1), (0, 5, 1), (4, 4, 1)]
+        neighborhoods = contiguous_neighbors(points)
+        self.assertEqual(sorted(sorted(n) for n in neighborhoods),
+                         [[(0, 0, 1), (0, 1, 1), (1, 2, 1)],
+                          [(0, 5, 1)],
+                          [(4, 4, 1)]])
+
+    def testTouchingNeighborhoods(self):
+        """
+        Ensure each touching pair is listed once, under whichever
+        neighborhood touched the other first.
+        """
+        neighborhoods = [[(0, 0, 1), (0, 1, 1)],
+                         [(0, 2, 1)],
+                         [(1, 0, 1)],
+                         [(0, 3, 1), (0, 4, 1)],
+                         [(0, 9, 1)]]
+        touching = touching_neighborhoods(neighborhoods)
+        self.assertEqual(dict(touching), {0: [2, 1], 1: [3]})
+        self.assertEqual(list(touching), [0, 1])
+        self.assertEqual(dict(touching_neighborhoods([])), {})
@@ -0,0 +1,62 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+"""
+
+import unittest
+
+import numpy
+from pyprom.tests.getData import gettestzip
+from pyprom.lib.loaders.gdal_loader import GDALLoader
+from pyprom.feature_discovery import AnalyzeData
+from pyprom.lib.locations.saddle import Saddle
+from pyprom.lib.locations.summit import Summit
+from pyprom.lib.logic.high_ring import (HIGH_NEIGHBORHOOD_COUNT,
+                                        NEEDS_ANALYSIS,
+                                        high_neighborhood_counts)
+
+
+class HighRingTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Set Up Tests."""
+        gettestzip()
+        cls.datafile = GDALLoader('/tmp/N44W072.hgt')
+        cls.datamap = cls.datafile.to_datamap()
+        cls.someslice = cls.datamap.subset(1000, 1000, 100, 100)
+
+    def testHighNeighborhoodCountTable(self):
+        """
+        Ensure the lookup table counts ring neighborhoods.
+        """
+        self.assertEqual(HIGH_NEIGHBORHOOD_COUNT[0], 0)
+        self.assertEqual(HIGH_NEIGHBORHOOD_COUNT[255], 1)
+        # N and S
+        self.assertEqual(HIGH_NEIGHBORHOOD_COUNT[0b00010001], 2)
+        # N and E touch diagonally.
+        self.assertEqual(HIGH_NEIGHBORHOOD_COUNT[0b00000101], 1)
+        # All four corners.
+        self.assertEqual(HIGH_NEIGHBORHOOD_COUNT[0b10101010], 4)
+
+    def testHighNeighborhoodCountsMatchAnalysis(self):
+        """
+        Ensure pixels classified by their ring are what summit_and_saddle
+        finds at them.
+        """
+        counts = high_neighborhood_counts(self.someslice, 0,
+                                          self.someslice.numpy_array)
+        analyze = AnalyzeData(self.someslice)
+        for x, y in zip(*numpy.nonzero(counts != NEEDS_ANALYSIS)):
+            analyze.elevation = self.someslice.get(x, y)
+            results = analyze.summit_and_saddle(int(x), int(y))
+            if counts[x, y] == 0:
+                self.assertEqual([type(r) for r in results], [Summit])
+            elif counts[x, y] == 1:
+                self.assertEqual(results, [])
+            else:
+                self.assertEqual([type(r) for r in results], [Saddle])
+                self.assertEqual(len(results[0].highPerimeterNeighborhoods),
+                                 counts[x, y])
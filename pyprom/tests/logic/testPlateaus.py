@@ -0,0 +1,71 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+"""
+
+import unittest
+
+from pyprom.tests.getData import gettestzip
+from pyprom.lib.loaders.gdal_loader import GDALLoader
+from pyprom.domain_map import DomainMap
+from pyprom.lib.logic.equalheight import equalHeightBlob
+from pyprom.lib.logic.plateaus import PlateauLabels
+
+
+class PlateausTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Set Up Tests."""
+        gettestzip()
+        cls.datafile = GDALLoader('/tmp/N44W072.hgt')
+        cls.datamap = cls.datafile.to_datamap()
+        cls.someslice = cls.datamap.subset(1000, 1000, 100, 100)
+        cls.plateaus = PlateauLabels(cls.someslice)
+
+    def testPlateauBlobsMatchEqualHeightBlob(self):
+        """
+        Ensure every labeled plateau is the blob equalHeightBlob finds.
+        """
+        self.assertTrue(len(self.plateaus))
+        for label in range(1, len(self.plateaus) + 1):
+            xs, ys = self.plateaus.member_xys(label)
+            x, y = int(xs[0]), int(ys[0])
+            elevation = self.someslice.get(x, y)
+            expected, expectedEdgePoints = equalHeightBlob(self.someslice, x, y, elevation)
+            blob, edgePoints = self.plateaus.blob(label, elevation)
+            self.assertEqual(sorted(blob.points), sorted(expected.points))
+            self.assertEqual(sorted(blob.perimeter.points),
+                             sorted(expected.perimeter.points))
+            self.assertEqual(blob.perimeter.mapEdge, expected.perimeter.mapEdge)
+            self.assertEqual(sorted(blob.perimeter.mapEdgePoints),
+                             sorted(expected.perimeter.mapEdgePoints))
+            self.assertEqual(sorted(edgePoints), sorted(expectedEdgePoints))
+            for member in blob.points:
+                self.assertEqual(self.plateaus.label_of(*member), label)
+                self.assertEqual(self.plateaus.labels[member], label)
+
+    def testPlateauLabelsBanded(self):
+        """
+        Ensure labeling a band of rows at a time gives the same labels.
+        """
+        banded = PlateauLabels(self.someslice, band_rows=7)
+        self.assertEqual(len(banded), len(self.plateaus))
+        self.assertTrue((banded.labels == self.plateaus.labels).all())
+        self.assertTrue((banded.perimeter == self.plateaus.perimeter).all())
+
+    def testDomainMapRunPlateaus(self):
+        """
+        Ensure discovery with plateaus labeled up front finds the same
+        summits.
+        """
+        domain = DomainMap(self.someslice)
+        domain.run(sparse=True)
+        labeled = DomainMap(self.someslice)
+        labeled.run(sparse=True, plateaus=True)
+        self.assertIsInstance(labeled.plateaus, PlateauLabels)
+        self.assertEqual(sorted(s.elevation for s in labeled.summits),
+                         sorted(s.elevation for s in domain.summits))
+        self.assertEqual(len(labeled.saddles), len(domain.saddles))
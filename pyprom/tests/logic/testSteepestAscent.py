@@ -0,0 +1,52 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+"""
+
+import unittest
+
+import numpy
+from pyprom.tests.getData import gettestzip
+from pyprom.lib.loaders.gdal_loader import GDALLoader
+from pyprom.lib.logic.steepest_ascent import (NO_ASCENT, ascend,
+                                              steepest_ascent)
+
+
+class SteepestAscentTests(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        """Set Up Tests."""
+        gettestzip()
+        cls.datafile = GDALLoader('/tmp/N44W072.hgt')
+        cls.datamap = cls.datafile.to_datamap()
+        cls.someslice = cls.datamap.subset(1000, 1000, 100, 100)
+
+    def testSteepestAscentMatchesSteepestNeighbor(self):
+        """
+        Ensure every pixel's direction leads to its steepestNeighbor,
+        looking at a few rows at a time.
+        """
+        directions = steepest_ascent(self.someslice, band_rows=7)
+        self.assertEqual(directions.dtype, numpy.uint8)
+        self.assertEqual(directions.shape, self.someslice.numpy_array.shape)
+        for x in range(self.someslice.max_x + 1):
+            for y in range(self.someslice.max_y + 1):
+                self.assertEqual(ascend(directions, self.someslice, x, y),
+                                 self.someslice.steepestNeighbor(x, y))
+
+    def testSteepestAscentSummit(self):
+        """
+        Ensure a pixel higher than its neighbors goes nowhere, and
+        diagonals lose to closer, less steep, neighbors.
+        """
+        datamap = self.datamap.subset(0, 0, 3, 3)
+        datamap.numpy_array_override(numpy.array([[17, 15, 12],
+                                                  [13, 10, 9],
+                                                  [14, 11, 8]]))
+        directions = steepest_ascent(datamap)
+        self.assertEqual(directions[0, 0], NO_ASCENT)
+        self.assertIsNone(ascend(directions, datamap, 0, 0))
+        self.assertEqual(ascend(directions, datamap, 1, 1), (0, 1, 15.0))
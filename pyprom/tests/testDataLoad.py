@@ -5,9 +5,14 @@ This software is distributed under a license that is described in
 the LICENSE file that accompanies it.
 """
 
+import tempfile
 import unittest
+
+import numpy
 from pyprom.tests.getData import gettestzip
 from pyprom.lib.loaders.gdal_loader import GDALLoader
+from pyprom.lib.loaders.mosaic_loader import MosaicLoader
+from pyprom.lib.constants import Units, METERS_PER_FOOT
 
 
 class GDALDataTests(unittest.TestCase):
@@ -32,5 +37,51 @@ class GDALDataTests(unittest.TestCase):
         self.assertEqual(self.datafile.source_gdal_dataset.RasterXSize, 3601)
         self.assertEqual(self.datafile.source_gdal_dataset.RasterYSize, 3601)
 
+    def testGDALLoadGeographicPassThrough(self):
+        """Ensure SRTM data, already in WGS84, isn't warped."""
+        self.assertIs(self.datafile.gdal_dataset,
+                      self.datafile.source_gdal_dataset)
+
+    def testGDALLoadFeetToMeters(self):
+        """Ensure feet are lazily scaled to meters, leaving nodata alone."""
+        feet = GDALLoader(self.filename, force_vertical_units=Units.FEET)
+        self.assertEqual(
+            feet.gdal_dataset.GetRasterBand(1).GetUnitType(), 'm')
+        meters = self.datafile.to_datamap()
+        converted = feet.to_datamap()
+        self.assertEqual(converted.nodata, meters.nodata)
+        self.assertAlmostEqual(converted.get(0, 0),
+                               meters.get(0, 0) * METERS_PER_FOOT, places=3)
+
+    def testGDALLoadRasterCache(self):
+        """Ensure a cached load memory maps the same preprocessed raster."""
+        datamap = self.datafile.to_datamap()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            first = GDALLoader(self.filename, cache_dir=cache_dir)
+            second = GDALLoader(self.filename, cache_dir=cache_dir)
+            self.assertIsInstance(second.numpy_array, numpy.memmap)
+            cached = second.to_datamap()
+            self.assertEqual(cached.geotransform, datamap.geotransform)
+            self.assertEqual(cached.nodata, datamap.nodata)
+            self.assertEqual(cached.md5, first.to_datamap().md5)
+            numpy.testing.assert_array_equal(cached.numpy_array,
+                                             datamap.numpy_array)
+            del cached, first, second
+
+    def testMosaicLoad(self):
+        """Ensure a mosaic of one tile is that tile."""
+        mosaic = MosaicLoader('/tmp/N44W07*.hgt')
+        self.assertEqual(mosaic.source_files(), [self.datafile.filename])
+        datamap = self.datafile.to_datamap()
+        mosaicked = mosaic.to_datamap()
+        self.assertEqual(mosaicked.geotransform, datamap.geotransform)
+        self.assertEqual(mosaicked.nodata, datamap.nodata)
+        numpy.testing.assert_array_equal(mosaicked.numpy_array,
+                                         datamap.numpy_array)
+        windowed = mosaic.to_windowed_datamap()
+        self.assertEqual(windowed.get(1800, 1800), datamap.get(1800, 1800))
+        with self.assertRaises(OSError):
+            MosaicLoader([self.filename, '/tmp/doesnotexist.hgt'])
+
 if __name__ == '__main__':
     unittest.main()
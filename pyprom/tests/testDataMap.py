@@ -6,6 +6,7 @@ the LICENSE file that accompanies it.
 """
 import unittest
 
+import numpy
 from numpy import array
 from shapely.geometry import Polygon
 from shapely.ops import unary_union
@@ -118,6 +119,120 @@ class DataMapTests(unittest.TestCase):
         self.assertEqual(self.datamap.get(0, 0),
                          415.0)
 
+    def testDataMapBatchedTransforms(self):
+        """
+        Ensure batched coordinate transforms match their scalar equivalents.
+        """
+        xs = list(range(0, 3601, 113))
+        ys = list(range(3600, -1, -113))
+        lats, longs = self.datamap.xys_to_latlons(xs, ys)
+        for x, y, lat, long in zip(xs, ys, lats, longs):
+            self.assertEqual(self.datamap.xy_to_latlon(x, y), (lat, long))
+        _xs, _ys = self.datamap.latlons_to_xys(lats, longs)
+        self.assertEqual(list(_xs), xs)
+        self.assertEqual(list(_ys), ys)
+        elevations = self.datamap.elevations(lats, longs)
+        for x, y, elevation in zip(xs, ys, elevations):
+            self.assertEqual(self.datamap.get(x, y), elevation)
+
+    def testDataMapBilinearElevations(self):
+        """
+        Ensure bilinear elevations interpolate between pixels.
+        """
+        lat, long = self.datamap.xy_to_latlon(100.5, 200.5)
+        expected = sum(self.datamap.get(x, y)
+                       for x, y in ((100, 200), (100, 201),
+                                    (101, 200), (101, 201))) / 4
+        self.assertAlmostEqual(
+            self.datamap.elevations([lat], [long], bilinear=True)[0],
+            expected)
+
+    def testDataMapNeighborsOf(self):
+        """
+        Ensure batched neighbor lookups match iterateFull.
+        """
+        points = [(0, 0), (0, 1800), (1800, 1800), (3600, 3600), (17, 3600)]
+        elevations, inbounds = self.datamap.neighbors_of(
+            [x for x, _ in points], [y for _, y in points])
+        self.assertEqual(elevations.shape, (len(points), 8))
+        for index, (x, y) in enumerate(points):
+            for shift, (_x, _y, elevation) in enumerate(
+                    self.datamap.iterateFull(x, y)):
+                self.assertEqual(inbounds[index, shift],
+                                 self.datamap.coord_inbounds(_x, _y))
+                self.assertEqual(elevations[index, shift], elevation)
+
+    def testDataMapNeighborStack(self):
+        """
+        Ensure neighbor stacks line up with neighbors_of.
+        """
+        elevations, inbounds = self.datamap.neighbor_stack(3599, 3601)
+        self.assertEqual(elevations.shape, (8, 2, 3601))
+        _elevations, _inbounds = self.datamap.neighbors_of([3600, 3600],
+                                                           [0, 3600])
+        self.assertEqual(list(elevations[:, 1, 0]), list(_elevations[0]))
+        self.assertEqual(list(elevations[:, 1, 3600]), list(_elevations[1]))
+        self.assertEqual(list(inbounds[:, 1, 3600]), list(_inbounds[1]))
+
+    def testDataMapSubsetView(self):
+        """
+        Ensure subsets are views with a shifted origin.
+        """
+        subset = self.datamap.subset(100, 200, 300, 400)
+        self.assertTrue(numpy.shares_memory(subset.numpy_array,
+                                            self.datamap.numpy_array))
+        self.assertEqual((subset.max_x, subset.max_y), (299, 399))
+        self.assertEqual(subset.upper_left, self.datamap.xy_to_latlon(100, 200))
+        self.assertEqual(subset.get(0, 0), self.datamap.get(100, 200))
+        self.assertEqual(subset.latlong_to_xy(*self.datamap.xy_to_latlon(150, 250)),
+                         (50, 50))
+        with self.assertRaises(ValueError):
+            self.datamap.subset(3500, 0, 200, 10)
+
+    def testDataMapNativeDtype(self):
+        """
+        Ensure native integer storage halves memory for SRTM data
+        and reports the same elevations.
+        """
+        datamap = self.datafile.to_datamap(native_dtype=True)
+        self.assertEqual(datamap.numpy_array.dtype, numpy.int16)
+        self.assertEqual(datamap.numpy_array.nbytes * 2,
+                         self.datamap.numpy_array.nbytes)
+        for x in range(0, 3601, 450):
+            for y in range(0, 3601, 450):
+                self.assertEqual(datamap.get(x, y), self.datamap.get(x, y))
+        self.assertEqual(list(datamap.iterateFull(0, 0)),
+                         list(self.datamap.iterateFull(0, 0)))
+
+    def testDataMapVerticalResolution(self):
+        """
+        Ensure quantized storage rounds to the vertical resolution.
+        """
+        datamap = self.datafile.to_datamap(vertical_resolution=10)
+        self.assertEqual(datamap.elevation_scale, 10)
+        self.assertEqual(datamap.get(0, 0), 420.0)
+        self.assertEqual(datamap.numpy_array.dtype.kind, 'i')
+
+    def testDataMapNodataMask(self):
+        """
+        Ensure the nodata mask flags nodata values only.
+        """
+        mask = self.datamap.nodata_mask(
+            numpy.array([self.datamap.nodata, 0, 415]))
+        self.assertEqual(list(mask), [True, False, False])
+
+    def testDataMapFingerprint(self):
+        """
+        Ensure the fingerprint is stable for the same raster
+        and changes when the raster does.
+        """
+        md5 = self.datamap.md5
+        self.assertEqual(md5, self.datafile.to_datamap().md5)
+        numpy_map = self.datamap.numpy_array.copy()
+        numpy_map[1800, 1800] += 1
+        self.datamap.numpy_array_override(numpy_map)
+        self.assertNotEqual(self.datamap.md5, md5)
+
 
 class DataMapSteepestNeighborTests(unittest.TestCase):
     """Test DataMap.steepestNeighbor()"""
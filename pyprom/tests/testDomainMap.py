@@ -5,9 +5,12 @@ This software is distributed under a license that is described in
 the LICENSE file that accompanies it.
 """
 
+import os
+import tempfile
 import unittest
 from pyprom.tests.getData import gettestzip
 from pyprom.lib.loaders.gdal_loader import GDALLoader
+from pyprom.lib.discovery_cache import DiscoveryCache, DISCOVERY
 from pyprom.domain_map import DomainMap
 
 
@@ -204,4 +207,70 @@ class DomainMapTests(unittest.TestCase):
         self.assertEqual(len(self.domain.saddles.disqualified), 5)
         # 1 with BSA
         self.assertEqual(len([x for x in self.domain.saddles.disqualified if x.basinSaddleAlternatives]), 1)
-        self.assertEqual(len(self.domain.saddles), 16)
\ No newline at end of file
+        self.assertEqual(len(self.domain.saddles), 16)
+
+    def testDomainRunCache(self):
+        """
+        Ensure a cached run loads the features and linkers
+        the first run found.
+        """
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = DiscoveryCache(cache_dir, walks=True)
+            first = DomainMap(self.someslice)
+            first.run(cache=cache)
+            self.assertEqual(len(cache.entries()), 2)
+            second = DomainMap(self.someslice)
+            second.run(cache=cache_dir)
+            self.assertEqual(second.saddles, first.saddles)
+            self.assertEqual(second.summits, first.summits)
+            self.assertEqual(second.runoffs, first.runoffs)
+            self.assertEqual(second.linkers, first.linkers)
+            self.assertEqual(second.summits, self.domain.summits)
+            # Plateau labels can resolve ties differently, so miss.
+            third = DomainMap(self.someslice)
+            third.run(cache=cache, plateaus=True)
+            self.assertEqual(len(cache.entries()), 4)
+
+    def testDiscoveryCacheEviction(self):
+        """
+        Ensure the least recently used entries are evicted
+        once the cache is over its limits.
+        """
+        domainDict = self.domain.to_dict()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = DiscoveryCache(cache_dir)
+            cache.store(DISCOVERY, 'old', domainDict)
+            cache.store(DISCOVERY, 'new', domainDict)
+            old = cache.path(DISCOVERY, 'old')
+            os.utime(old, (0, 0))
+            self.assertIsNotNone(cache.load(DISCOVERY, 'old'))
+            self.assertIsNone(cache.load(DISCOVERY, 'missing'))
+            # Loading marks old used, so new is evicted first.
+            cache.max_bytes = old.stat().st_size
+            cache.evict()
+            self.assertEqual(cache.entries(), [old])
+            cache.max_age = 60
+            os.utime(old, (0, 0))
+            cache.evict()
+            self.assertEqual(cache.entries(), [])
+
+    def testDiscoveryCacheTemporaryFiles(self):
+        """
+        Ensure failed writes don't leave temporary files behind,
+        and stale ones are evicted.
+        """
+        domainDict = self.domain.to_dict()
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = DiscoveryCache(cache_dir)
+            # A directory can't be replaced by the written entry.
+            cache.path(DISCOVERY, 'blocked').mkdir()
+            cache.store(DISCOVERY, 'blocked', domainDict)
+            self.assertEqual(list(cache.cache_dir.glob('*.tmp')), [])
+            stale = cache.cache_dir / 'walk-crashed.dom.1.tmp'
+            live = cache.cache_dir / 'walk-writing.dom.2.tmp'
+            stale.write_bytes(b'crashed')
+            live.write_bytes(b'writing')
+            os.utime(stale, (0, 0))
+            cache.evict()
+            self.assertFalse(stale.exists())
+            self.assertTrue(live.exists())
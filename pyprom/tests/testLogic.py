@@ -9,6 +9,10 @@ import unittest
 from pyprom.tests.getData import gettestzip
 from pyprom.lib.loaders.gdal_loader import GDALLoader
 from pyprom.feature_discovery import AnalyzeData
+from pyprom.lib.locations.runoff import Runoff
+from pyprom.lib.locations.saddle import Saddle
+from pyprom.lib.locations.summit import Summit
+from pyprom.lib.containers.summits import SummitsContainer
 
 
 class LogicTests(unittest.TestCase):
@@ -61,3 +65,91 @@ class LogicTests(unittest.TestCase):
         mpSummit = self.summits[0]
         # make sure we find 2 points
         self.assertEqual(len(mpSummit.multipoint), 2)
+
+    def testParallelMatchesSerial(self):
+        """
+        Ensure discovery split over worker processes finds the same
+        features, in the same order, as a single process.
+        """
+        someslice = self.datamap.subset(1000, 1000, 100, 100)
+        serial = AnalyzeData(someslice).run()
+        parallel = AnalyzeData(someslice).run(workers=3)
+        for expected, found in zip(serial, parallel):
+            self.assertEqual(len(found), len(expected))
+            for a, b in zip(expected, found):
+                self.assertEqual(type(a), type(b))
+                self.assertEqual((a.latitude, a.longitude, a.elevation),
+                                 (b.latitude, b.longitude, b.elevation))
+                self.assertEqual(bool(a.multipoint), bool(b.multipoint))
+                if b.multipoint:
+                    self.assertEqual(b.multipoint.points, a.multipoint.points)
+                    self.assertIs(b.multipoint.datamap, someslice)
+
+    def testIterFeatures(self):
+        """
+        Ensure iter_features yields what analyze finds, in the same order,
+        and picks up where it left off from its cursor.
+        """
+        someslice = self.datamap.subset(1000, 1000, 100, 100)
+        summits, saddles, runoffs = AnalyzeData(someslice).analyze()
+        streaming = AnalyzeData(someslice)
+        features = list(streaming.iter_features())
+        self.assertEqual(streaming.cursor, someslice.max_x + 1)
+        for container, kind in ((summits, Summit), (saddles, Saddle),
+                                (runoffs, Runoff)):
+            self.assertEqual(
+                [(f.latitude, f.longitude) for f in container],
+                [(f.latitude, f.longitude) for f in features
+                 if type(f) is kind])
+
+        # Stop partway, then resume from the cursor.
+        partial = AnalyzeData(someslice)
+        stream = partial.iter_features()
+        head = [next(stream) for _ in range(len(features) // 2)]
+        stream.close()
+        resumed = AnalyzeData(someslice)
+        tail = list(resumed.iter_features(start_row=partial.cursor))
+        seen = {(f.latitude, f.longitude) for f in head}
+        tail = [f for f in tail if (f.latitude, f.longitude) not in seen]
+        self.assertEqual([(f.latitude, f.longitude) for f in head + tail],
+                         [(f.latitude, f.longitude) for f in features])
+
+    def testIterFeaturesReused(self):
+        """
+        Ensure one AnalyzeData can scan again after find_summits, analyze
+        or a partly consumed iter_features, and finds the same features.
+        """
+        someslice = self.datamap.subset(1000, 1000, 100, 100)
+        expected = [(f.latitude, f.longitude)
+                    for f in AnalyzeData(someslice).iter_features()]
+        analysis = AnalyzeData(someslice)
+        analysis.find_summits()
+        self.assertEqual([(f.latitude, f.longitude)
+                          for f in analysis.iter_features()], expected)
+        stream = analysis.iter_features()
+        next(stream)
+        stream.close()
+        summits, saddles, runoffs = analysis.analyze()
+        self.assertEqual(len(summits) + len(saddles) + len(runoffs),
+                         len(expected))
+        self.assertEqual([(f.latitude, f.longitude)
+                          for f in analysis.iter_features()], expected)
+
+    def testFindSummitsOnly(self):
+        """
+        Ensure find_summits finds the same summits analyze does,
+        in the same order.
+        """
+        someslice = self.datamap.subset(1000, 1000, 100, 100)
+        summits = AnalyzeData(someslice).analyze()[0]
+        found = AnalyzeData(someslice).find_summits()
+        self.assertIsInstance(found, SummitsContainer)
+        self.assertEqual(len(found), len(summits))
+        for a, b in zip(summits, found):
+            self.assertEqual((a.latitude, a.longitude, a.elevation),
+                             (b.latitude, b.longitude, b.elevation))
+            self.assertEqual(a.edgeEffect, b.edgeEffect)
+            self.assertEqual(a.edgePoints, b.edgePoints)
+            self.assertEqual(bool(a.multipoint), bool(b.multipoint))
+            if b.multipoint:
+                self.assertEqual(b.multipoint.points, a.multipoint.points)
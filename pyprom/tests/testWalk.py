@@ -7,10 +7,23 @@ the LICENSE file that accompanies it.
 
 from __future__ import division
 import unittest
+
+import numpy
 from pyprom.tests.getData import gettestzip
 from pyprom.lib.loaders.gdal_loader import GDALLoader
 from pyprom.feature_discovery import AnalyzeData
 from pyprom.domain_map import DomainMap
+from pyprom.lib.containers.summits import SummitsContainer
+from pyprom.lib.locations.summit import Summit
+from pyprom.lib.logic.plateaus import PlateauLabels
+from pyprom.lib.logic.summit_domain_walk import Walk
+
+
+def links(domain):
+    """Summit and saddle locations of each linker of domain, in order."""
+    return [(linker.summit.latitude, linker.summit.longitude,
+             linker.saddle.latitude, linker.saddle.longitude)
+            for linker in domain.linkers]
 
 
 class WalkTests(unittest.TestCase):
@@ -62,6 +75,37 @@ class WalkTests(unittest.TestCase):
         self.domain.walk()
         self.assertEqual(len(self.domain.linkers), 1120)  # 1119?
 
+    def testWalkIslandPondWorkers(self):
+        """
+        Ensure walking with workers links the same summits and saddles,
+        in the same order, as walking without.
+        """
+        self.domain.run(superSparse=True)
+        self.domain.walk()
+        serial = links(self.domain)
+        self.domain.run(superSparse=True)
+        self.domain.walk(workers=2)
+        self.assertEqual(links(self.domain), serial)
+
+    def testWalkIslandPondPacked(self):
+        """
+        Ensure walking packed discovery output links the same summits and
+        saddles as walking unpacked, and links the DomainMap's own features.
+        """
+        self.domain.walk()
+        summits, saddles, runoffs = \
+            AnalyzeData(self.islandpondVT).run(packed=True)
+        self.assertTrue(summits.packed)
+        domain = DomainMap(self.islandpondVT, summits=summits,
+                           saddles=saddles, runoffs=runoffs, linkers=[])
+        domain.walk()
+        self.assertEqual(links(domain), links(self.domain))
+        self.assertFalse(domain.summits.packed)
+        for linker in domain.linkers:
+            self.assertIn(linker.summit.id, domain.summits.fast_lookup)
+            self.assertIs(domain.summits.fast_lookup[linker.summit.id],
+                          linker.summit)
+
 
 class WalkRealTests(unittest.TestCase):
     """
@@ -93,3 +137,34 @@ class WalkRealTests(unittest.TestCase):
         # But the linkers are different.
         self.assertNotEqual(sut.summits[0].id,
                             sut.summits[1].id)
+
+    def testWalkPlateauRevisited(self):
+        """
+        Ensure climbing onto a plateau again, onto a member left
+        unassigned because its closest high perimeter point went nowhere,
+        only revisits what's left of the plateau, with or without
+        plateau labels.
+        """
+        datamap = self.datamap.subset(0, 0, 3, 5)
+        datamap.numpy_array_override(numpy.array([[9, 5, 5, 5, 8],
+                                                  [4, 5, 5, 5, 4],
+                                                  [1, 2, 2, 2, 1]]))
+        for plateaus in (None, PlateauLabels(datamap)):
+            # Only the 9 is a summit, so climbing from the 8 goes nowhere.
+            summit = Summit(*datamap.xy_to_latlon(0, 0), 9.0)
+            domain = DomainMap(datamap, summits=SummitsContainer([summit]),
+                               linkers=[])
+            domain.plateaus = plateaus
+            walk = Walk(domain)
+            self.assertIs(walk.climb_points([], (1, 1, 5.0)), summit.domain)
+            left = walk._unresolved_plateaus
+            self.assertIn((0, 3), left)
+            self.assertIn((1, 3), left)
+            self.assertNotIn((1, 1), left)
+            remainder = left[(1, 3)]
+            self.assertIs(left[(0, 3)], remainder)
+            self.assertEqual([point[:2] for point in remainder[0]], [(0, 4)])
+            self.assertEqual(remainder[2].tolist(),
+                             [[0, 4]] * len(remainder[1]))
+            self.assertIsNone(walk.climb_points([], (1, 3, 5.0)))
+            self.assertIs(walk._unresolved_plateaus[(1, 3)], remainder)
@@ -0,0 +1,105 @@
+"""
+pyProm: Copyright 2025.
+
+This software is distributed under a license that is described in
+the LICENSE file that accompanies it.
+"""
+import unittest
+
+import numpy
+from osgeo import gdal
+from pyprom.tests.getData import gettestzip
+from pyprom.lib.loaders.gdal_loader import GDALLoader
+from pyprom.lib.datamaps.datamap import DataMap
+from pyprom.lib.datamaps.windowed_datamap import WindowedDataMap
+
+
+class WindowedDataMapTests(unittest.TestCase):
+    """Test WindowedDataMaps."""
+
+    def setUp(self):
+        """Set Up Tests."""
+        gettestzip()
+        self.datafile = GDALLoader('/tmp/N44W072.hgt')
+        self.datamap = self.datafile.to_datamap()
+        self.windowed = self.datafile.to_windowed_datamap()
+
+    def testWindowedDataMapGeneral(self):
+        """Ensure a WindowedDataMap describes the same raster."""
+        self.assertIsInstance(self.windowed, WindowedDataMap)
+        self.assertEqual(self.windowed.max_x, self.datamap.max_x)
+        self.assertEqual(self.windowed.max_y, self.datamap.max_y)
+        self.assertEqual(self.windowed.upper_left, self.datamap.upper_left)
+        self.assertEqual(self.windowed.lower_right, self.datamap.lower_right)
+
+    def testWindowedDataMapGet(self):
+        """Ensure single point lookups match a DataMap."""
+        for x in range(0, 3601, 257):
+            for y in range(0, 3601, 263):
+                self.assertEqual(self.windowed.get(x, y),
+                                 self.datamap.get(x, y))
+                self.assertEqual(self.windowed.steepestNeighbor(x, y),
+                                 self.datamap.steepestNeighbor(x, y))
+
+    def testWindowedDataMapWindows(self):
+        """Ensure windows spanning blocks match a DataMap."""
+        numpy.testing.assert_array_equal(
+            self.windowed.numpy_array[250:520, 1000:1300],
+            self.datamap.numpy_array[250:520, 1000:1300])
+        self.assertEqual(list(self.windowed.iterateFull(256, 256)),
+                         list(self.datamap.iterateFull(256, 256)))
+
+    def testWindowedDataMapRowBands(self):
+        """Ensure row bands reassemble the raster."""
+        rows = 0
+        for x_offset, band in self.windowed.iter_row_bands(1000):
+            self.assertEqual(x_offset, rows)
+            numpy.testing.assert_array_equal(
+                band, self.datamap.numpy_array[x_offset:x_offset + 1000])
+            rows += band.shape[0]
+        self.assertEqual(rows, self.datamap.max_x + 1)
+
+    def testWindowedDataMapMemoryBudget(self):
+        """Ensure the block cache stays within its memory budget."""
+        budget = 4 * 256 * 256 * 4
+        windowed = self.datafile.to_windowed_datamap(memory_budget=budget)
+        for x_offset, band in windowed.iter_row_bands():
+            self.assertLessEqual(windowed.numpy_array.nbytes,
+                                 budget + band.nbytes)
+        self.assertLessEqual(windowed.numpy_array.nbytes,
+                             budget + band.nbytes)
+
+    def testWindowedDataMapSubset(self):
+        """Ensure subsets match a DataMap subset."""
+        windowed = self.windowed.subset(100, 200, 300, 400)
+        subset = self.datamap.subset(100, 200, 300, 400)
+        self.assertIsInstance(windowed, WindowedDataMap)
+        self.assertEqual(windowed.upper_left, subset.upper_left)
+        numpy.testing.assert_array_equal(windowed.numpy_array[:, :],
+                                         subset.numpy_array)
+
+    def testWindowedDataMapQuantizedNodata(self):
+        """
+        Ensure quantized blocks mask the source nodata, even one far
+        outside what fits in int32, the same as a DataMap does.
+        """
+        nodata = float(numpy.finfo(numpy.float32).min)
+        elevations = self.datamap.numpy_array[:300, :400].astype(numpy.float32)
+        elevations[10:20, 30:40] = nodata
+        dataset = gdal.GetDriverByName('MEM').Create(
+            '', 400, 300, 1, gdal.GDT_Float32)
+        dataset.SetGeoTransform(self.datafile.gdal_dataset.GetGeoTransform())
+        dataset.SetProjection(self.datafile.gdal_dataset.GetProjection())
+        band = dataset.GetRasterBand(1)
+        band.WriteArray(elevations)
+        band.SetNoDataValue(nodata)
+        windowed = WindowedDataMap(self.datafile, dataset,
+                                   vertical_resolution=0.01)
+        datamap = DataMap(self.datafile, dataset, vertical_resolution=0.01)
+        self.assertEqual(windowed.nodata, datamap.nodata)
+        numpy.testing.assert_array_equal(windowed.numpy_array[:, :],
+                                         datamap.numpy_array)
+        self.assertTrue(windowed.nodata_mask(
+            windowed.numpy_array[10:20, 30:40]).all())
+        self.assertFalse(windowed.nodata_mask(
+            windowed.numpy_array[20:300, 40:400]).any())